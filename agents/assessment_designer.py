@@ -1,85 +1,230 @@
 from __future__ import annotations
-import random
+import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
-from utils.report_generator import ensure_dir, save_json, save_markdown
+from typing import Dict, Iterable, Iterator, List, Tuple
+from utils.manifest import DEFAULT_MANIFEST, Manifest, record_hash
+from utils.report_generator import ReportWriter, ensure_dir
+from utils.report_store import expand_assessment, open_store
+
+# ---- challenge rules (data, not code): a package depends only on the signature ----
+ROLE_CHALLENGES: Dict[str, Tuple[str, ...]] = {
+    "AI Engineer": (
+        "Build a simple neural network from scratch (no deep learning libraries).",
+        "Implement a sentiment analysis model using Python and scikit-learn.",
+    ),
+    "Data Scientist": (
+        "Clean and analyze a dataset; produce key insights with visualizations.",
+        "Develop a machine learning model and evaluate accuracy.",
+    ),
+    "Backend Developer": (
+        "Design a REST API for user management with authentication.",
+        "Optimize a database query for high-traffic scenarios.",
+    ),
+    "Full Stack Developer": (
+        "Create a small web app with both frontend (React) and backend (Flask/FastAPI).",
+        "Integrate a third-party API and display results in a dashboard.",
+    ),
+}
+# (detected skill, challenge), in package order
+SKILL_CHALLENGES: Tuple[Tuple[str, str], ...] = (
+    ("Python", "Solve 3 coding challenges in Python (algorithms & data structures)."),
+    ("SQL", "Write SQL queries to analyze sales data and generate reports."),
+)
+# experience bracket → (max challenges or None, extra challenges)
+BRACKETS: Dict[str, Tuple[int | None, Tuple[str, ...]]] = {
+    "junior": (2, ()),
+    "mid": (None, ()),
+    "senior": (None, ("System design: Architect a scalable AI-based recruitment pipeline.",)),
+}
+EVALUATION_FRAMEWORK: Dict[str, str] = {
+    "Problem-Solving Approach": "40%",
+    "Code Quality & Efficiency": "30%",
+    "Communication & Documentation": "30%",
+}
+BIAS_MITIGATION: List[str] = [
+    "Focus only on skills and technical output; ignore demographics.",
+    "Avoid assumptions based on candidate's background or university.",
+    "Ensure equal scoring rubrics for all candidates.",
+]
+
+# (role, skill flags aligned with SKILL_CHALLENGES, experience bracket)
+Signature = Tuple[str, Tuple[bool, ...], str]
+
+def experience_bracket(years) -> str:
+    years = years or 0
+    if years < 2:
+        return "junior"
+    return "senior" if years > 5 else "mid"
+
+def signature(report: Dict) -> Signature:
+    """
+    Everything a package depends on. Skills come from the profiler's detected
+    skills ((skill, confidence) pairs), else from a raw candidate skills list.
+    """
+    c = report["candidate"]
+    raw = report.get("skills") or c.get("skills") or []
+    skills = {s if isinstance(s, str) else s[0] for s in raw}
+    return (c.get("role", "Unknown"), tuple(skill in skills for skill, _ in SKILL_CHALLENGES),
+            experience_bracket(c.get("experience_years")))
+
+@lru_cache(maxsize=4096)
+def challenges_for(sig: Signature) -> Tuple[str, ...]:
+    role, flags, bracket = sig
+    challenges = list(ROLE_CHALLENGES.get(role, ()))
+    challenges += [ch for (_, ch), has in zip(SKILL_CHALLENGES, flags) if has]
+    limit, extra = BRACKETS[bracket]
+    return tuple(challenges[:limit] if limit is not None else challenges) + extra
+
+def package_id(sig: Signature) -> str:
+    """
+    Filename-safe id, e.g. Data_Scientist-senior-python-sql-3f2a9c1e: readable
+    parts plus a short signature hash, since the readable part alone is not
+    unique ("Data Scientist" and "Data_Scientist" map to the same text).
+    """
+    role, flags, bracket = sig
+    parts = [role.replace(" ", "_").replace("/", "_"), bracket]
+    parts += [skill.lower() for (skill, _), has in zip(SKILL_CHALLENGES, flags) if has]
+    return "-".join(parts + [record_hash(list(sig))[:8]])
 
 class AssessmentDesigner:
-    def __init__(self, reports_dir: str | Path = "outputs/reports", out_dir: str | Path = "outputs/assessments"):
+    VERSION = "3"  # bump when challenge rules change so incremental runs redo everything
+
+    def __init__(self, reports_dir: str | Path = "outputs/reports", out_dir: str | Path = "outputs/assessments",
+                 manifest_path: str | Path = DEFAULT_MANIFEST,
+                 store_path: str | Path | None = None):
         self.reports_dir = Path(reports_dir)
         self.out_dir = ensure_dir(out_dir)
+        self.packages_dir = self.out_dir / "packages"
+        self.manifest_path = Path(manifest_path)
+        self.store_path = store_path  # optional consolidated SQLite store (utils.report_store)
+        self._packages: Dict[str, Dict] = {}  # package_id → shared package
 
     def _generate_challenges(self, candidate: Dict) -> List[str]:
-        role = candidate["role"]
-        skills = [s for s, _ in candidate.get("skills", [])]
-        exp = candidate.get("experience_years", 0)
-
-        challenges = []
-        if role == "AI Engineer":
-            challenges.append("Build a simple neural network from scratch (no deep learning libraries).")
-            challenges.append("Implement a sentiment analysis model using Python and scikit-learn.")
-        elif role == "Data Scientist":
-            challenges.append("Clean and analyze a dataset; produce key insights with visualizations.")
-            challenges.append("Develop a machine learning model and evaluate accuracy.")
-        elif role == "Backend Developer":
-            challenges.append("Design a REST API for user management with authentication.")
-            challenges.append("Optimize a database query for high-traffic scenarios.")
-        elif role == "Full Stack Developer":
-            challenges.append("Create a small web app with both frontend (React) and backend (Flask/FastAPI).")
-            challenges.append("Integrate a third-party API and display results in a dashboard.")
-
-        
-        if "Python" in skills:
-            challenges.append("Solve 3 coding challenges in Python (algorithms & data structures).")
-        if "SQL" in skills:
-            challenges.append("Write SQL queries to analyze sales data and generate reports.")
-
-        if exp < 2:
-            challenges = challenges[:2]  
-        elif exp > 5:
-            challenges.append("System design: Architect a scalable AI-based recruitment pipeline.")
-
-        return challenges
-
-    def _evaluation_framework(self) -> Dict:
-        return {
-            "Problem-Solving Approach": "40%",
-            "Code Quality & Efficiency": "30%",
-            "Communication & Documentation": "30%",
-        }
-
-    def _bias_mitigation_protocol(self) -> List[str]:
-        return [
-            "Focus only on skills and technical output; ignore demographics.",
-            "Avoid assumptions based on candidate's background or university.",
-            "Ensure equal scoring rubrics for all candidates.",
-        ]
+        return list(challenges_for(signature({"candidate": candidate})))
+
+    def package(self, sig: Signature) -> Dict:
+        """The shared package for a signature, built once per designer."""
+        pid = package_id(sig)
+        pkg = self._packages.get(pid)
+        if pkg is None:
+            role, flags, bracket = sig
+            pkg = self._packages[pid] = {
+                "package_id": pid,
+                "signature": {"role": role, "experience": bracket,
+                              "skills": [skill for (skill, _), has in zip(SKILL_CHALLENGES, flags) if has]},
+                "challenges": list(challenges_for(sig)),
+                "evaluation_framework": dict(EVALUATION_FRAMEWORK),
+                "bias_mitigation": list(BIAS_MITIGATION),
+                "notes": f"Auto-generated by AssessmentDesigner v{self.VERSION}.",
+            }
+        return pkg
 
     def build_assessment(self, report: Dict) -> Dict:
-        assessment = {
-            "candidate": report["candidate"],
-            "challenges": self._generate_challenges(report["candidate"]),
-            "evaluation_framework": self._evaluation_framework(),
-            "bias_mitigation": self._bias_mitigation_protocol(),
-            "notes": "Auto-generated by AssessmentDesigner v1."
-        }
-        return assessment
-
-    def run(self, reports: List[Dict]):
-        results = []
+        """Self-contained package for one report (e.g. the API), with its own copy of the shared parts."""
+        return expand_assessment(self.assign(report), self._packages)
+
+    def assign(self, report: Dict) -> Dict:
+        """Per-candidate output: the candidate plus a reference to its shared package."""
+        return {"candidate": report["candidate"], "package_id": self.package(signature(report))["package_id"]}
+
+    def build_bulk(self, reports: Iterable[Dict]) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+        """
+        In-memory bulk mode, nothing written: ({package_id: package},
+        {candidate stem: package_id}) for reports already loaded (e.g. from the
+        profiler or the store).
+        """
+        assignments = {}
         for rep in reports:
-            ass = self.build_assessment(rep)
-            fname_safe = rep["candidate"]["name"].replace(" ", "_")
-            save_json(ass, self.out_dir, f"{fname_safe}_assessment.json")
-            save_markdown(ass, self.out_dir, f"{fname_safe}_assessment.md")
-            results.append(ass)
-        return results
+            assignments[rep["candidate"]["name"].replace(" ", "_")] = self.assign(rep)["package_id"]
+        return {pid: self._packages[pid] for pid in set(assignments.values())}, assignments
+
+    def prune_packages(self, store=None) -> List[str]:
+        """
+        Delete shared package files (and store rows) that no per-candidate
+        assessment in out_dir references any more; returns their ids.
+        """
+        referenced = set()
+        for f in self.out_dir.glob("*_assessment.json"):
+            try:
+                referenced.add(json.loads(f.read_text(encoding="utf-8")).get("package_id"))
+            except (OSError, ValueError):
+                continue
+        orphans = sorted({f.stem for f in self.packages_dir.glob("*.json")} - referenced)
+        for pid in orphans:
+            for ext in (".json", ".md"):
+                (self.packages_dir / f"{pid}{ext}").unlink(missing_ok=True)
+        if store is not None and orphans:
+            store.delete("assessment_packages", orphans)
+        return orphans
+
+    def iter_run(self, reports: Iterable[Dict], incremental: bool = False) -> Iterator[Dict]:
+        """
+        Assign, write and yield a package reference per report; `reports` may be
+        any iterable, e.g. CandidateProfiler.iter_run(), so packages follow
+        profiles as they arrive. Each distinct package is written once, to
+        out_dir/packages/<package_id>.json|md; per-candidate files only hold the
+        candidate and its package_id (readers expand them with
+        utils.report_store.expand_assessment).
+        incremental: skip candidates whose signature is unchanged and prune
+        assessments whose profiler report no longer exists in reports_dir.
+        `reports` may then be just the reports the profiler rebuilt.
+        Once anything was written or pruned, packages left unreferenced are
+        deleted (prune_packages).
+        """
+        seen = set()
+        changed = False
+        written = set()  # package ids written by this run
+        with Manifest(self.manifest_path) as manifest, ReportWriter() as writer, \
+                open_store(self.store_path) as store:
+            for rep in reports:
+                fname_safe = rep["candidate"]["name"].replace(" ", "_")
+                seen.add(fname_safe)
+                sig = signature(rep)
+                # output depends on the candidate block and the signature only
+                h = record_hash({"candidate": rep["candidate"], "signature": sig})
+                if incremental and manifest.is_fresh("AssessmentDesigner", fname_safe, h, self.VERSION):
+                    continue
+                pkg = self.package(sig)
+                if pkg["package_id"] not in written:
+                    writer.save_json(pkg, self.packages_dir, f"{pkg['package_id']}.json")
+                    writer.save_markdown(pkg, self.packages_dir, f"{pkg['package_id']}.md")
+                    if store is not None:
+                        store.put_assessment_package(pkg)
+                    written.add(pkg["package_id"])
+                ass = {"candidate": rep["candidate"], "package_id": pkg["package_id"]}
+                files = [writer.save_json(ass, self.out_dir, f"{fname_safe}_assessment.json"),
+                         writer.save_markdown(ass, self.out_dir, f"{fname_safe}_assessment.md")]
+                manifest.record("AssessmentDesigner", fname_safe, h, self.VERSION, files)
+                changed = True
+                if store is not None:
+                    store.put_assessment(ass)
+                    store.commit()  # never yield inside a write transaction (see ReportStore)
+                yield ass
+            if incremental:
+                keep = {f.stem for f in self.reports_dir.glob("*.json")} | seen
+                removed = manifest.prune("AssessmentDesigner", keep)
+                if store is not None:
+                    store.delete("assessments", [k + "_assessment" for k in removed])
+                changed = changed or bool(removed)
+            if changed:
+                writer.flush()  # references written this run must be on disk before the scan
+                self.prune_packages(store)
+
+    def run(self, reports: Iterable[Dict], incremental: bool = False) -> List[Dict]:
+        return list(self.iter_run(reports, incremental=incremental))
 
 if __name__ == "__main__":
-    
-    import json
-    reports_dir = Path("outputs/reports")
-    reports = [json.loads(f.read_text()) for f in reports_dir.glob("*.json")]
-    designer = AssessmentDesigner()
-    out = designer.run(reports)
-    print(f"Generated {len(out)} assessment packages in outputs/assessments/")
+    import sys
+    from utils.report_store import ReportStore
+    # --store PATH: read profiles from the consolidated store (one query) instead of every JSON file
+    store_path = sys.argv[sys.argv.index("--store") + 1] if "--store" in sys.argv else None
+    if store_path:
+        with ReportStore(store_path) as src:
+            reports = list(src.load("candidates").values())
+    else:
+        reports = (json.loads(f.read_text()) for f in Path("outputs/reports").glob("*.json"))
+    designer = AssessmentDesigner(store_path=store_path)
+    out = designer.run(reports, incremental="--incremental" in sys.argv)
+    n_packages = len({a["package_id"] for a in out})
+    print(f"Assigned {len(out)} candidates to {n_packages} shared assessment packages in outputs/assessments/")
@@ -1,28 +1,60 @@
 
 from __future__ import annotations
-import json
 from pathlib import Path
-from typing import Dict, List
-import re
-from utils.report_generator import ensure_dir, save_json, save_markdown
+from typing import Dict, Iterator, List, Tuple
+from utils.manifest import DEFAULT_MANIFEST, Manifest, record_hash
+from utils.report_generator import ReportWriter, ensure_dir
+from utils.report_store import open_store
+from utils.streaming import iter_records
+from utils.themes import EmbeddingThemeClassifier, ThemeScorer
 
 POSITIVE_KEYWORDS = ["team", "collaborate", "help", "together", "support"]
 PROBLEM_SOLVING_KEYWORDS = ["solve", "problem", "fix", "analyze", "improve"]
 COMMUNICATION_KEYWORDS = ["communicate", "explain", "share", "talk", "present"]
 
+THEME_KEYWORDS = {
+    "Collaboration": POSITIVE_KEYWORDS,
+    "Problem-Solving": PROBLEM_SOLVING_KEYWORDS,
+    "Communication": COMMUNICATION_KEYWORDS,
+}
+_SCORER = ThemeScorer(THEME_KEYWORDS)
+
 class BehavioralAnalyzer:
+    VERSION = "3"  # bump when theme logic changes so incremental runs redo everything
+
     def __init__(self, conv_path: str | Path = "data/conversations.json",
-                 out_dir: str | Path = "outputs/reports/behavioral"):
+                 out_dir: str | Path = "outputs/reports/behavioral",
+                 manifest_path: str | Path = DEFAULT_MANIFEST,
+                 store_path: str | Path | None = None,
+                 embedding: bool = False, threshold: float = 0.35, batch_size: int = 256):
         self.conv_path = Path(conv_path)
         self.out_dir = ensure_dir(out_dir)
+        self.manifest_path = Path(manifest_path)
+        self.store_path = store_path  # optional consolidated SQLite store (utils.report_store)
+        # embedding: count utterances close to a theme prototype instead of keywords,
+        # scoring batch_size conversations per encode
+        self.classifier = EmbeddingThemeClassifier(threshold=threshold) if embedding else None
+        self.batch_size = batch_size
+
+    def _version(self) -> str:
+        if self.classifier is None:
+            return self.VERSION
+        return f"{self.VERSION}:emb-{self.classifier.version()}"
 
     def _extract_themes(self, conversation: List[str]) -> Dict[str, int]:
-        text = " ".join(conversation).lower()
-        return {
-            "Collaboration": sum(1 for k in POSITIVE_KEYWORDS if k in text),
-            "Problem-Solving": sum(1 for k in PROBLEM_SOLVING_KEYWORDS if k in text),
-            "Communication": sum(1 for k in COMMUNICATION_KEYWORDS if k in text),
-        }
+        """
+        Whole-word keyword occurrences per theme, or in embedding mode the
+        number of matching utterances.
+        """
+        if self.classifier is not None:
+            return self.classifier.score_many([conversation])[0]
+        return _SCORER.score(conversation)
+
+    def extract_themes_batch(self, conversations: List[List[str]]) -> List[Dict[str, int]]:
+        """Themes for many conversations; in embedding mode a single encode + matmul."""
+        if self.classifier is not None:
+            return self.classifier.score_many(conversations)
+        return [_SCORER.score(c) for c in conversations]
 
     def _soft_skill_summary(self, themes: Dict[str, int]) -> str:
         strengths = [k for k, v in themes.items() if v > 0]
@@ -30,8 +62,9 @@ class BehavioralAnalyzer:
             return "No strong soft skills detected in limited conversation sample."
         return f"Candidate demonstrates strengths in: {', '.join(strengths)}."
 
-    def build_report(self, conv: Dict) -> Dict:
-        themes = self._extract_themes(conv["conversation"])
+    def build_report(self, conv: Dict, themes: Dict[str, int] | None = None) -> Dict:
+        if themes is None:
+            themes = self._extract_themes(conv["conversation"])
         report = {
             "candidate": conv["candidate"],
             "themes": themes,
@@ -40,18 +73,54 @@ class BehavioralAnalyzer:
         }
         return report
 
-    def run(self) -> List[Dict]:
-        data = json.loads(Path(self.conv_path).read_text(encoding="utf-8"))
-        reports = []
-        for conv in data:
-            rep = self.build_report(conv)
-            fname_safe = conv["candidate"].replace(" ", "_")
-            save_json(rep, self.out_dir, f"{fname_safe}_behavior.json")
-            save_markdown(rep, self.out_dir, f"{fname_safe}_behavior.md")
-            reports.append(rep)
-        return reports
+    def iter_run(self, incremental: bool = False) -> Iterator[Dict]:
+        """
+        Stream conversations from conv_path (JSON array or .jsonl), writing and
+        yielding each report as it is built.
+        incremental: only re-analyze changed conversations and prune removed ones.
+        """
+        seen = set()
+        version = self._version()
+        # keyword mode scores one conversation at a time; embedding mode batches
+        batch_size = self.batch_size if self.classifier is not None else 1
+        with Manifest(self.manifest_path) as manifest, ReportWriter() as writer, \
+                open_store(self.store_path) as store:
+
+            def flush(batch: List[Tuple[str, str, Dict]]) -> Iterator[Dict]:
+                themes = self.extract_themes_batch([conv["conversation"] for _, _, conv in batch])
+                for (fname_safe, h, conv), th in zip(batch, themes):
+                    rep = self.build_report(conv, th)
+                    files = [writer.save_json(rep, self.out_dir, f"{fname_safe}_behavior.json"),
+                             writer.save_markdown(rep, self.out_dir, f"{fname_safe}_behavior.md")]
+                    manifest.record("BehavioralAnalyzer", fname_safe, h, version, files)
+                    if store is not None:
+                        store.put_behavioral(rep)
+                        store.commit()  # never yield inside a write transaction (see ReportStore)
+                    yield rep
+
+            batch: List[Tuple[str, str, Dict]] = []
+            for conv in iter_records(self.conv_path):
+                fname_safe = conv["candidate"].replace(" ", "_")
+                seen.add(fname_safe)
+                h = record_hash(conv)
+                if incremental and manifest.is_fresh("BehavioralAnalyzer", fname_safe, h, version):
+                    continue
+                batch.append((fname_safe, h, conv))
+                if len(batch) >= batch_size:
+                    yield from flush(batch)
+                    batch = []
+            if batch:
+                yield from flush(batch)
+            if incremental:
+                removed = manifest.prune("BehavioralAnalyzer", seen)
+                if store is not None:
+                    store.delete("behavioral", [k + "_behavior" for k in removed])
+
+    def run(self, incremental: bool = False) -> List[Dict]:
+        return list(self.iter_run(incremental=incremental))
 
 if __name__ == "__main__":
-    analyzer = BehavioralAnalyzer()
-    out = analyzer.run()
+    import sys
+    analyzer = BehavioralAnalyzer(embedding="--embedding" in sys.argv)
+    out = analyzer.run(incremental="--incremental" in sys.argv)
     print(f"Generated {len(out)} behavioral reports in outputs/reports/behavioral/")
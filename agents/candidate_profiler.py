@@ -1,22 +1,51 @@
 from __future__ import annotations
-import json
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing.context import BaseContext
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple
 
-from utils.nlp_utils import clean_text, extract_skills, summarize_text
-from utils.report_generator import save_json, save_markdown, ensure_dir
+import numpy as np
+
+from utils.inverted_index import SkillInvertedIndex
+from utils.manifest import DEFAULT_MANIFEST, Manifest, record_hash
+from utils.nlp_utils import clean_text, embed, extract_skills, extract_skills_batch, ontology_version, warm_up
+from utils.report_generator import ReportWriter, ensure_dir
+from utils.report_store import open_store
+from utils.streaming import batched, iter_records
+from utils.summarizer import summarize, summarize_batch
+from utils.vector_index import CandidateVectorIndex
 
 class CandidateProfiler:
+    VERSION = "1"  # bump when report logic changes so incremental runs redo everything
+
     def __init__(self, candidates_path: str | Path = "data/candidates.json",
-                 out_dir: str | Path = "outputs/reports"):
+                 out_dir: str | Path = "outputs/reports", keyword_only: bool = False,
+                 manifest_path: str | Path = DEFAULT_MANIFEST,
+                 store_path: str | Path | None = None,
+                 skill_index_path: str | Path | None = None,
+                 vector_index_path: str | Path | None = None):
         self.candidates_path = Path(candidates_path)
         self.out_dir = ensure_dir(out_dir)
+        self.keyword_only = keyword_only  # skip the embedding back-off (no model load)
+        self.manifest_path = Path(manifest_path)
+        self.store_path = store_path  # optional consolidated SQLite store (utils.report_store)
+        self.skill_index_path = skill_index_path  # optional inverted skill index (utils.inverted_index)
+        # optional profile embeddings (utils.vector_index); needs the model even when keyword_only
+        self.vector_index_path = vector_index_path
+
+    def _version(self) -> str:
+        # Ontology/model and mode changes alter the skills, so they count as logic changes
+        return f"{self.VERSION}:{ontology_version()}:{'kw' if self.keyword_only else 'emb'}"
 
-    def _career_summary(self, c: Dict) -> str:
-        """Summarize based on LinkedIn text + heuristics on experience & role."""
+    def _career_summary(self, c: Dict, base: str | None = None) -> str:
+        """
+        Summarize based on LinkedIn text + heuristics on experience & role.
+        base: the LinkedIn summary when already computed (summarize_batch).
+        """
         summary_bits: List[str] = []
-        li = clean_text(c.get("linkedin_summary", ""))
-        base = summarize_text(li, max_sentences=2)
+        if base is None:
+            base = summarize(c.get("linkedin_summary", ""), max_sentences=2)  # cleans the text itself
         summary_bits.append(base)
 
         yrs = c.get("experience_years", None)
@@ -34,15 +63,17 @@ class CandidateProfiler:
 
         return " ".join([s for s in summary_bits if s]).strip()
 
-    def _skill_scores(self, c: Dict) -> List[Tuple[str, float]]:
+    def _skill_text(self, c: Dict) -> str:
         text_blobs = [
             c.get("linkedin_summary", ""),
             " ".join(c.get("skills", [])),
             " ".join(c.get("github_projects", [])),
             c.get("role", ""),
         ]
-        big_text = " ".join(map(clean_text, text_blobs))
-        return extract_skills(big_text)
+        return " ".join(map(clean_text, text_blobs))
+
+    def _skill_scores(self, c: Dict) -> List[Tuple[str, float]]:
+        return extract_skills(self._skill_text(c), keyword_only=self.keyword_only)
 
     def _highlights(self, c: Dict, skills_scored: List[Tuple[str, float]]) -> List[str]:
         yrs = c.get("experience_years", 0)
@@ -54,8 +85,10 @@ class CandidateProfiler:
         ]
         return hl
 
-    def build_report(self, c: Dict) -> Dict:
-        skills_scored = self._skill_scores(c)
+    def build_report(self, c: Dict, skills_scored: List[Tuple[str, float]] | None = None,
+                     linkedin_summary: str | None = None) -> Dict:
+        if skills_scored is None:
+            skills_scored = self._skill_scores(c)
         report = {
             "candidate": {
                 "name": c.get("name", "Unknown"),
@@ -63,24 +96,173 @@ class CandidateProfiler:
                 "experience_years": c.get("experience_years", None),
             },
             "skills": skills_scored,      # list of (skill, confidence)
-            "career_summary": self._career_summary(c),
+            "career_summary": self._career_summary(c, linkedin_summary),
             "highlights": self._highlights(c, skills_scored),
             "notes": "Auto-generated by CandidateProfiler v1 (free/local models)."
         }
         return report
 
-    def run(self) -> List[Dict]:
-        data = json.loads(Path(self.candidates_path).read_text(encoding="utf-8"))
-        reports = []
-        for c in data:
-            rep = self.build_report(c)
-            fname_safe = rep["candidate"]["name"].replace(" ", "_")
-            save_json(rep, self.out_dir, f"{fname_safe}.json")
-            save_markdown(rep, self.out_dir, f"{fname_safe}.md")
-            reports.append(rep)
-        return reports
+    def build_reports(self, candidates: List[Dict]) -> List[Dict]:
+        """Profile a batch of candidates with a single embedding call."""
+        scored = extract_skills_batch([self._skill_text(c) for c in candidates],
+                                      keyword_only=self.keyword_only)
+        summaries = summarize_batch([c.get("linkedin_summary", "") for c in candidates], max_sentences=2)
+        return [self.build_report(c, sk, summ) for c, sk, summ in zip(candidates, scored, summaries)]
+
+    def _iter_reports(self, candidates: Iterable[Dict], batch_size: int | None) -> Iterator[Dict]:
+        if not batch_size:
+            for c in candidates:
+                yield self.build_report(c)
+            return
+        for chunk in batched(candidates, batch_size):
+            yield from self.build_reports(chunk)
+
+    def _profile_chunk(self, candidates: List[Dict], batch_size: int | None,
+                       with_vectors: bool) -> List[Tuple[Dict, np.ndarray | None]]:
+        """
+        (report, profile vector or None) per candidate. The vectors are embedded
+        in the process that built the reports, where the skill-extraction
+        back-off has usually just encoded the same texts, so embed() mostly
+        hits that process's embedding cache.
+        """
+        reports = list(self._iter_reports(candidates, batch_size))
+        if not with_vectors:
+            return [(rep, None) for rep in reports]
+        return list(zip(reports, embed([self._skill_text(c) for c in candidates])))
+
+    def _iter_profiles(self, candidates: Iterable[Dict], batch_size: int | None,
+                       with_vectors: bool) -> Iterator[Tuple[Dict, np.ndarray | None]]:
+        for chunk in batched(candidates, batch_size or 1):
+            yield from self._profile_chunk(chunk, batch_size, with_vectors)
+
+    def _iter_profiles_sharded(self, candidates: Iterable[Dict], batch_size: int | None, with_vectors: bool,
+                               workers: int, chunk_size: int, ordered: bool,
+                               mp_context: BaseContext | None = None) -> Iterator[Tuple[Dict, np.ndarray | None]]:
+        """
+        Fan chunks of candidates out to `workers` processes (each loads the model
+        once) and yield (report, vector) pairs back. At most 2 chunks per worker
+        are in flight, so memory stays bounded however long the input stream is.
+        """
+        max_in_flight = 2 * workers
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context, initializer=_init_worker,
+                                 initargs=(self.keyword_only,)) as pool:
+            in_flight = deque()
+
+            def drain_one():
+                if ordered:
+                    return in_flight.popleft().result()
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                fut = next(iter(done))
+                in_flight.remove(fut)
+                return fut.result()
+
+            for chunk in batched(candidates, chunk_size):
+                in_flight.append(pool.submit(_profile_chunk, chunk, batch_size, with_vectors))
+                if len(in_flight) >= max_in_flight:
+                    yield from drain_one()
+            while in_flight:
+                yield from drain_one()
+
+    def iter_run(self, batch_size: int | None = None, incremental: bool = False,
+                 workers: int = 0, chunk_size: int = 256, ordered: bool = True,
+                 mp_context: BaseContext | None = None) -> Iterator[Dict]:
+        """
+        Stream candidates from candidates_path (JSON array or .jsonl), write each
+        report as soon as it is built and yield it.
+        batch_size: profile N candidates per embedding call (None = one by one).
+        incremental: only re-profile candidates whose input or agent version changed
+        since the last run, prune reports of removed candidates, and yield just
+        the rebuilt reports.
+        workers: > 1 shards candidates across that many processes, chunk_size
+        candidates per task; ordered=False yields chunks as soon as they finish;
+        mp_context overrides the pool's start method.
+        """
+        version = self._version()
+        index = None
+        if self.skill_index_path:
+            # bring the persisted index up to date with reports written outside this run
+            index = SkillInvertedIndex.load_or_build(self.out_dir, self.skill_index_path, save=False)
+        # Profile vectors come back with the reports (see _profile_chunk)
+        vectors = CandidateVectorIndex.load_or_create(self.vector_index_path) if self.vector_index_path else None
+
+        with Manifest(self.manifest_path) as manifest, ReportWriter() as writer, \
+                open_store(self.store_path) as store:
+            hashes = {}
+            written, vec_keys, vec_rows = [], [], []
+
+            def pending():
+                for c in iter_records(self.candidates_path):
+                    key = c.get("name", "Unknown").replace(" ", "_")
+                    hashes[key] = record_hash(c)
+                    if incremental and manifest.is_fresh("CandidateProfiler", key, hashes[key], version) \
+                            and (vectors is None or key in vectors):
+                        continue
+                    yield c
+
+            with_vectors = vectors is not None
+            if workers > 1:
+                profiles = self._iter_profiles_sharded(pending(), batch_size, with_vectors,
+                                                       workers, chunk_size, ordered, mp_context)
+            else:
+                profiles = self._iter_profiles(pending(), batch_size, with_vectors)
+            for rep, vec in profiles:
+                fname_safe = rep["candidate"]["name"].replace(" ", "_")
+                files = [writer.save_json(rep, self.out_dir, f"{fname_safe}.json"),
+                         writer.save_markdown(rep, self.out_dir, f"{fname_safe}.md")]
+                manifest.record("CandidateProfiler", fname_safe, hashes[fname_safe], version, files)
+                if store is not None:
+                    store.put_candidate(rep)
+                    store.commit()  # never yield inside a write transaction (see ReportStore)
+                if index is not None:
+                    index.add_report(rep)
+                    written.append((fname_safe, files[0]))
+                if vectors is not None:
+                    vec_keys.append(fname_safe)
+                    vec_rows.append(vec)
+                    if len(vec_keys) >= 256:
+                        # duplicate names share one key (and report file): upsert keeps the last
+                        vectors.upsert(vec_keys, np.vstack(vec_rows))
+                        vec_keys, vec_rows = [], []
+                yield rep
+            removed = manifest.prune("CandidateProfiler", hashes) if incremental else []
+            if store is not None and removed:
+                store.delete("candidates", removed)
+            if index is not None:
+                writer.flush()
+                for key, path in written:
+                    index.track(key, path)
+                for key in removed:
+                    index.remove(key)
+                index.save(self.skill_index_path)
+            if vectors is not None:
+                if vec_keys:
+                    vectors.upsert(vec_keys, np.vstack(vec_rows))
+                vectors.remove(removed)
+                vectors.save(self.vector_index_path)
+
+    def run(self, batch_size: int | None = None, incremental: bool = False,
+            workers: int = 0, chunk_size: int = 256, ordered: bool = True) -> List[Dict]:
+        """Collect iter_run() into a list (see iter_run for the options)."""
+        return list(self.iter_run(batch_size=batch_size, incremental=incremental,
+                                  workers=workers, chunk_size=chunk_size, ordered=ordered))
+
+# ---- process-pool workers (one profiler + model per process) ----
+_WORKER: CandidateProfiler | None = None
+
+def _init_worker(keyword_only: bool):
+    global _WORKER
+    _WORKER = CandidateProfiler(keyword_only=keyword_only)
+    if not keyword_only:
+        warm_up()
+
+def _profile_chunk(candidates: List[Dict], batch_size: int | None,
+                   with_vectors: bool) -> List[Tuple[Dict, np.ndarray | None]]:
+    return _WORKER._profile_chunk(candidates, batch_size, with_vectors)
 
 if __name__ == "__main__":
+    import os
+    import sys
     profiler = CandidateProfiler()
-    out = profiler.run()
+    out = profiler.run(batch_size=64, incremental="--incremental" in sys.argv,
+                       workers=int(os.environ.get("PROFILER_WORKERS", "0")))
     print(f"Generated {len(out)} Talent Intelligence Reports in outputs/reports/")
@@ -1,14 +1,26 @@
 from __future__ import annotations
-import json
 from pathlib import Path
-from typing import Dict, List
-from utils.report_generator import ensure_dir, save_json, save_markdown
+from typing import Dict, Iterator, List
+from utils.manifest import DEFAULT_MANIFEST, Manifest, record_hash
+from utils.report_generator import ReportWriter, ensure_dir
+from utils.report_store import open_store
+from utils.running_stats import aggregate_market
+from utils.streaming import iter_records
+
+# carried from a consolidated entry (utils.running_stats) into the report
+_DISTRIBUTION_KEYS = ("postings", "salary_std", "salary_min", "salary_max", "salary_percentiles")
 
 class MarketIntelligence:
+    VERSION = "2"  # bump when recommendation logic changes
+
     def __init__(self, data_path: str | Path = "data/market_data.json",
-                 out_dir: str | Path = "outputs/reports/market"):
+                 out_dir: str | Path = "outputs/reports/market",
+                 manifest_path: str | Path = DEFAULT_MANIFEST,
+                 store_path: str | Path | None = None):
         self.data_path = Path(data_path)
         self.out_dir = ensure_dir(out_dir)
+        self.manifest_path = Path(manifest_path)
+        self.store_path = store_path  # optional consolidated SQLite store (utils.report_store)
 
     def analyze_market(self, entry: Dict) -> Dict:
         role = entry["role"]
@@ -29,28 +41,59 @@ class MarketIntelligence:
         elif salary < 70000:
             recs.append(f"💡 Salaries for {role} are relatively low; good cost-effective hiring opportunity.")
 
+        pct = entry.get("salary_percentiles")
+        if pct:
+            recs.append(f"🎯 Offer band for {role}: {pct['p25']:,}–{pct['p75']:,} "
+                        f"(median {pct['p50']:,}, {entry.get('postings', '?')} postings).")
+
         recs.append(f"Recommended sourcing channels: {', '.join(sources)}")
 
-        return {
+        report = {
             "role": role,
             "avg_salary": salary,
             "demand_index": demand,
-            "recommendations": recs,
-            "notes": "Market analysis performed on synthetic data."
         }
+        report.update((k, entry[k]) for k in _DISTRIBUTION_KEYS if k in entry)
+        report["recommendations"] = recs
+        report["notes"] = "Market analysis performed on synthetic data."
+        return report
+
+    def iter_run(self, incremental: bool = False) -> Iterator[Dict]:
+        """
+        Stream entries from data_path (JSON array or .jsonl) into per-role
+        running statistics, then write and yield one consolidated report per
+        role (mean, spread and salary percentiles over all of its postings).
+        Memory grows with the number of roles, not postings.
+        incremental: only rewrite roles whose statistics changed and prune removed roles.
+        """
+        data = [stats.summary() for stats in aggregate_market(iter_records(self.data_path)).values()]
+        seen = set()
+        with Manifest(self.manifest_path) as manifest, ReportWriter() as writer, \
+                open_store(self.store_path) as store:
+            for entry in data:
+                fname_safe = entry["role"].replace(" ", "_")
+                seen.add(fname_safe)
+                h = record_hash(entry)
+                if incremental and manifest.is_fresh("MarketIntelligence", fname_safe, h, self.VERSION):
+                    continue
+                rep = self.analyze_market(entry)
+                files = [writer.save_json(rep, self.out_dir, f"{fname_safe}_market.json"),
+                         writer.save_markdown(rep, self.out_dir, f"{fname_safe}_market.md")]
+                manifest.record("MarketIntelligence", fname_safe, h, self.VERSION, files)
+                if store is not None:
+                    store.put_market(rep)
+                    store.commit()  # never yield inside a write transaction (see ReportStore)
+                yield rep
+            if incremental:
+                removed = manifest.prune("MarketIntelligence", seen)
+                if store is not None:
+                    store.delete("market", [k + "_market" for k in removed])
 
-    def run(self) -> List[Dict]:
-        data = json.loads(self.data_path.read_text(encoding="utf-8"))
-        reports = []
-        for entry in data:
-            rep = self.analyze_market(entry)
-            fname_safe = entry["role"].replace(" ", "_")
-            save_json(rep, self.out_dir, f"{fname_safe}_market.json")
-            save_markdown(rep, self.out_dir, f"{fname_safe}_market.md")
-            reports.append(rep)
-        return reports
+    def run(self, incremental: bool = False) -> List[Dict]:
+        return list(self.iter_run(incremental=incremental))
 
 if __name__ == "__main__":
+    import sys
     analyzer = MarketIntelligence()
-    out = analyzer.run()
+    out = analyzer.run(incremental="--incremental" in sys.argv)
     print(f"Generated {len(out)} market intelligence reports in outputs/reports/market/")
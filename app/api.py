@@ -0,0 +1,159 @@
+# app/api.py
+"""
+HTTP service over the agents, with the embedding model kept warm.
+
+    uvicorn app.api:app --port 8000          # or: python -m app.api --port 8000
+
+    POST /profile      candidate → Talent Intelligence Report
+    POST /assessment   profile report → assessment package
+    POST /behavioral   {candidate, conversation} → behavioral report
+    POST /market       market entry → market analysis
+    GET  /market/{role} latest market report written by the pipeline
+    POST /jobs         queue a background job (utils.jobs); GET /jobs[/{id}], DELETE /jobs/{id}
+    GET  /health       model state + batching stats
+
+Concurrent /profile calls are micro-batched (API_MAX_BATCH, API_MAX_WAIT_MS)
+into one extract_skills_batch() call, i.e. a single encode per batch.
+Set API_KEYWORD_ONLY=1 to serve keyword-only profiles without the model.
+"""
+from __future__ import annotations
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from typing import Dict, List
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+
+from agents.assessment_designer import AssessmentDesigner
+from agents.behavioral_analyzer import BehavioralAnalyzer
+from agents.candidate_profiler import CandidateProfiler
+from agents.market_intelligence import MarketIntelligence
+from app.data import JOBS_PATH, REPORTS_DIR, STORE_PATH
+from utils.batching import MicroBatcher
+from utils.jobs import JobQueue, ensure_worker
+from utils.nlp_utils import warm_up
+from utils.report_store import ReportStore
+
+MAX_BATCH = int(os.environ.get("API_MAX_BATCH", "32"))
+MAX_WAIT_MS = float(os.environ.get("API_MAX_WAIT_MS", "5"))
+KEYWORD_ONLY = os.environ.get("API_KEYWORD_ONLY", "0") == "1"
+
+# ---- request bodies ----
+class Candidate(BaseModel):
+    name: str = "Unknown"
+    role: str = "Unknown"
+    experience_years: float = 0
+    skills: List[str] = Field(default_factory=list)
+    linkedin_summary: str = ""
+    github_projects: List[str] = Field(default_factory=list)
+
+class ProfileReport(BaseModel):
+    candidate: Dict
+    skills: List = Field(default_factory=list)
+
+    model_config = {"extra": "allow"}
+
+class Conversation(BaseModel):
+    candidate: str
+    conversation: List[str]
+
+class MarketEntry(BaseModel):
+    role: str
+    avg_salary: float
+    demand_index: float
+    top_sources: List[str] = Field(default_factory=list)
+
+class JobRequest(BaseModel):
+    kind: str
+    params: Dict = Field(default_factory=dict)
+
+# ---- app ----
+_agents: Dict = {}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    profiler = CandidateProfiler(keyword_only=KEYWORD_ONLY)
+    if not KEYWORD_ONLY:
+        await asyncio.to_thread(warm_up)  # load model + skill index before the first request
+    batcher = MicroBatcher(profiler.build_reports, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS)
+    await batcher.start()
+    _agents.update(profiler=profiler, batcher=batcher, designer=AssessmentDesigner(),
+                   behavioral=BehavioralAnalyzer(), market=MarketIntelligence())
+    yield
+    await batcher.stop()
+    _agents.clear()
+
+app = FastAPI(title="Multi-Agent Recruitment API", lifespan=lifespan)
+
+@app.get("/health")
+async def health() -> Dict:
+    return {"status": "ok", "keyword_only": KEYWORD_ONLY, "batching": _agents["batcher"].stats()}
+
+@app.post("/profile")
+async def profile(candidate: Candidate) -> Dict:
+    return await _agents["batcher"].submit(candidate.model_dump())
+
+@app.post("/assessment")
+async def assessment(report: ProfileReport) -> Dict:
+    return _agents["designer"].build_assessment(report.model_dump())
+
+@app.post("/behavioral")
+async def behavioral(conv: Conversation) -> Dict:
+    return _agents["behavioral"].build_report(conv.model_dump())
+
+@app.post("/market")
+async def market(entry: MarketEntry) -> Dict:
+    return _agents["market"].analyze_market(entry.model_dump())
+
+@app.get("/market/{role}")
+async def market_report(role: str) -> Dict:
+    key = f"{role.replace(' ', '_')}_market"
+    if STORE_PATH.exists():
+        with ReportStore(STORE_PATH) as store:
+            rep = store.get("market", key)
+    else:
+        path = REPORTS_DIR / "market" / f"{key}.json"
+        rep = json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+    if rep is None:
+        raise HTTPException(status_code=404, detail=f"No market report for role {role!r}")
+    return rep
+
+@app.post("/jobs", status_code=202)
+async def submit_job(req: JobRequest) -> Dict:
+    with JobQueue(JOBS_PATH) as queue:
+        try:
+            job_id = queue.submit(req.kind, req.params)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        ensure_worker(queue)
+        return queue.get(job_id)
+
+@app.get("/jobs")
+async def list_jobs(limit: int = 20) -> List[Dict]:
+    with JobQueue(JOBS_PATH) as queue:
+        return queue.list(limit=limit)
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: int) -> Dict:
+    with JobQueue(JOBS_PATH) as queue:
+        job = queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No job #{job_id}")
+    return job
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: int) -> Dict:
+    with JobQueue(JOBS_PATH) as queue:
+        return {"cancelled": queue.cancel(job_id), "job": queue.get(job_id)}
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+    ap = argparse.ArgumentParser(description="Serve the recruitment agents over HTTP.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    args = ap.parse_args()
+    # one process: the model and the batch queue live in memory
+    uvicorn.run(app, host=args.host, port=args.port)
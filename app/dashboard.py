@@ -1,55 +1,30 @@
 import streamlit as st
 import json
+import sys
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 
-# Paths
-ROOT = Path(".")
-REPORTS_DIR = ROOT / "outputs" / "reports"
-ASSESSMENTS_DIR = ROOT / "outputs" / "assessments"
-
-# Utility loaders
-def load_json_files(directory: Path) -> Dict[str, Dict]:
-    out = {}
-    if not directory.exists():
-        return out
-    for f in sorted(directory.glob("*.json")):
-        try:
-            out[f.stem] = json.loads(f.read_text(encoding="utf-8"))
-        except Exception as e:
-            # ignore bad files
-            continue
-    return out
+# `streamlit run app/dashboard.py` only puts app/ on the path; shared modules live at the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app.data import (candidate_index, clear_file_cache, data_as_of, load_outputs, outputs_signature,
+                      release_index, release_outputs, skill_index, skill_table, vector_index)
+from app.explorer import candidate_explorer, role_match_panel, skill_query_panel
+from app.jobs_panel import jobs_panel
+from utils.aggregation import salary_frame, skill_frequency
+from utils.pdf_generator import candidate_report_pdf_bytes
 
 def safe_get(d: Dict, key: str, default=None):
     return d.get(key, default)
 
-# Data aggregation helpers
+# Data aggregation helpers (vectorized, see utils/aggregation.py)
 def aggregate_skill_frequency(candidate_reports: Dict[str, Dict]) -> pd.DataFrame:
-    rows = []
-    for key, rep in candidate_reports.items():
-        for skill, conf in rep.get("skills", []):
-            rows.append({"candidate": key, "skill": skill, "confidence": conf})
-    if not rows:
-        return pd.DataFrame(columns=["skill", "count", "avg_confidence"])
-    df = pd.DataFrame(rows)
-    agg = df.groupby("skill").agg(count=("candidate", "nunique"), avg_confidence=("confidence", "mean")).reset_index()
-    agg = agg.sort_values("count", ascending=False)
-    return agg
+    agg = skill_frequency(skill_table(candidate_reports))
+    return agg.rename(columns={"avg_conf": "avg_confidence"})
 
 def salary_distribution_df(market_reports: Dict[str, Dict]) -> pd.DataFrame:
-    rows = []
-    for k, rep in market_reports.items():
-        try:
-            rows.append({"role": rep.get("role", k), "avg_salary": float(rep.get("avg_salary", 0)), "demand_index": rep.get("demand_index", 0)})
-        except:
-            continue
-    if not rows:
-        return pd.DataFrame(columns=["role", "avg_salary", "demand_index"])
-    return pd.DataFrame(rows)
+    return salary_frame(market_reports)
 
 # Visual helpers (matplotlib only)
 def plot_skill_bar(df: pd.DataFrame):
@@ -72,6 +47,16 @@ def plot_salary_box(df: pd.DataFrame):
         ax.text(0.5, 0.5, "No market data available", ha="center", va="center")
         ax.axis("off")
         return fig
+    bands = df.dropna(subset=["p10", "p25", "p50", "p75", "p90"]) if "p50" in df else df.iloc[0:0]
+    if not bands.empty:
+        # one box per role from its streamed percentiles: whiskers P10/P90, box P25–P75
+        stats = [{"label": r.role, "whislo": r.p10, "q1": r.p25, "med": r.p50, "q3": r.p75,
+                  "whishi": r.p90, "mean": r.avg_salary, "fliers": []} for r in bands.itertuples()]
+        fig, ax = plt.subplots(figsize=(6, max(3, 0.5 * len(stats) + 1)))
+        ax.bxp(stats, vert=False, showmeans=True)
+        ax.set_title("Salary bands per role (P10 / P25 / median / P75 / P90)")
+        plt.tight_layout()
+        return fig
     fig, ax = plt.subplots(figsize=(6, 4))
     ax.boxplot(df["avg_salary"].dropna().values, vert=False)
     ax.set_yticks([1])
@@ -95,6 +80,44 @@ def plot_demand_bar(df: pd.DataFrame):
     plt.tight_layout()
     return fig
 
+# Cached data
+# Keyed on outputs_signature(): widget clicks reuse the parsed outputs until
+# the pipeline writes something new (or the user hits Refresh). Evicted stores
+# are closed through on_release.
+@st.cache_resource(show_spinner="Loading pipeline outputs…", max_entries=1,
+                   on_release=release_outputs)
+def cached_outputs(signature):
+    return load_outputs()
+
+@st.cache_resource(show_spinner="Indexing candidates…", max_entries=1, on_release=release_index)
+def cached_index(signature):
+    return candidate_index(cached_outputs(signature)[0])
+
+@st.cache_resource(show_spinner="Indexing skills…", max_entries=1)
+def cached_skill_index(signature):
+    return skill_index()
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def cached_vector_index(signature):
+    return vector_index()
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def cached_skill_df(signature) -> pd.DataFrame:
+    return aggregate_skill_frequency(cached_outputs(signature)[0])
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def cached_market_df(signature) -> pd.DataFrame:
+    return salary_distribution_df(cached_outputs(signature)[3])
+
+def refresh_data():
+    cached_outputs.clear()
+    cached_index.clear()
+    cached_skill_index.clear()
+    cached_vector_index.clear()
+    cached_skill_df.clear()
+    cached_market_df.clear()
+    clear_file_cache()
+
 # Render functions
 def show_candidate_overview(report: Dict):
     c = report["candidate"]
@@ -145,6 +168,10 @@ def show_market(rep: Dict):
     st.subheader(f"📊 Market Intelligence — {rep.get('role','-')}")
     st.write(f"- **Average Salary**: {rep.get('avg_salary','-')}")
     st.write(f"- **Demand Index**: {rep.get('demand_index','-')}")
+    pct = rep.get("salary_percentiles")
+    if pct:
+        st.write(f"- **Postings**: {rep.get('postings','-')} (salary std dev {rep.get('salary_std','-')})")
+        st.dataframe(pd.DataFrame([pct]), hide_index=True)
     st.write("**Recommendations**")
     for r in rep.get("recommendations", []):
         st.write(f"- {r}")
@@ -154,25 +181,27 @@ def main():
     st.set_page_config(page_title="Multi-Agent Recruitment Dashboard", layout="wide")
     st.title("🤖 Multi-Agent Recruitment System — Dashboard")
 
-    # Load data
-    candidate_reports = load_json_files(REPORTS_DIR)
-    assessment_reports = load_json_files(ASSESSMENTS_DIR)
-    behavioral_reports = load_json_files(REPORTS_DIR / "behavioral")
-    market_reports = load_json_files(REPORTS_DIR / "market")
+    # Load data (consolidated store if present, else per-file JSON)
+    signature = outputs_signature()
+    candidate_reports, assessment_reports, behavioral_reports, market_reports = cached_outputs(signature)
 
     # Sidebar
     st.sidebar.header("Navigation")
     section = st.sidebar.radio("Choose Section:", ["Overview", "Candidates", "Market Trends", "Exports / Utilities"])
+    st.sidebar.caption(f"Data as of {data_as_of(signature)}")
+    if st.sidebar.button("🔄 Refresh data"):
+        refresh_data()
+        st.rerun()
 
     if section == "Overview":
         st.header("Platform Overview")
         st.markdown("This dashboard visualizes outputs from the multi-agent recruitment pipeline.")
         # aggregated visuals
-        skill_df = aggregate_skill_frequency(candidate_reports)
+        skill_df = cached_skill_df(signature)
         st.subheader("Top Skills")
         st.pyplot(plot_skill_bar(skill_df))
 
-        market_df = salary_distribution_df(market_reports)
+        market_df = cached_market_df(signature)
         st.subheader("Salary distribution")
         st.pyplot(plot_salary_box(market_df))
 
@@ -194,8 +223,9 @@ def main():
             st.warning("No candidate reports found. Run the pipeline (app.main) first.")
             return
 
-        candidates = sorted(candidate_reports.keys())
-        choice = st.selectbox("Select Candidate:", candidates)
+        skill_query_panel(cached_skill_index(signature), candidate_reports)
+        role_match_panel(cached_vector_index(signature), cached_index(signature).roles())
+        choice = candidate_explorer(cached_index(signature))
 
         if choice:
             rep = candidate_reports[choice]
@@ -217,8 +247,10 @@ def main():
                 st.info("No behavioral report found for this candidate.")
 
             st.divider()
-            # Download candidate report as JSON
-            st.download_button("Download candidate JSON", json.dumps(rep, indent=2), file_name=f"{choice}.json", mime="application/json")
+            # Download candidate report as JSON or PDF (PDF rendered in memory, cached per report)
+            c1, c2 = st.columns(2)
+            c1.download_button("Download candidate JSON", json.dumps(rep, indent=2), file_name=f"{choice}.json", mime="application/json")
+            c2.download_button("📄 Export as PDF", candidate_report_pdf_bytes(rep), file_name=f"{choice}.pdf", mime="application/pdf")
 
     elif section == "Market Trends":
         st.header("Market Intelligence")
@@ -234,7 +266,7 @@ def main():
             rep = market_reports[sel_role]
             show_market(rep)
             # show demand and salary visuals for all roles
-            market_df = salary_distribution_df(market_reports)
+            market_df = cached_market_df(signature)
             st.subheader("All roles: demand vs salary")
             fig, ax = plt.subplots(figsize=(8, 4))
             ax.scatter(market_df["avg_salary"], market_df["demand_index"])
@@ -247,26 +279,26 @@ def main():
 
     else:  # Exports / Utilities
         st.header("Exports & Utilities")
-        st.markdown("Download aggregated data or regenerate pipeline outputs from the server (run `python -m app.main`).")
+        st.markdown("Download aggregated data, or regenerate pipeline outputs as a background job below.")
 
         # aggregated CSVs
-        skill_df = aggregate_skill_frequency(candidate_reports)
+        skill_df = cached_skill_df(signature)
         if not skill_df.empty:
             st.download_button("Download skill-frequency CSV", skill_df.to_csv(index=False), file_name="skill_frequency.csv", mime="text/csv")
             st.write(skill_df.head(20))
         else:
             st.write("No aggregated skill data available.")
 
-        market_df = salary_distribution_df(market_reports)
+        market_df = cached_market_df(signature)
         if not market_df.empty:
             st.download_button("Download market CSV", market_df.to_csv(index=False), file_name="market_data.csv", mime="text/csv")
             st.write(market_df)
         else:
             st.write("No market data available.")
 
-        #quick action: run pipeline (ui hint)
-        st.markdown("If you update `data/` and want to recreate outputs, run pipeline in terminal:")
-        st.code("python -m app.main", language="bash")
+        # regenerate outputs / export PDFs without a terminal
+        st.divider()
+        jobs_panel()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,240 @@
+# app/data.py
+"""Data access shared by the Streamlit dashboards (main.py and app/dashboard.py)."""
+from __future__ import annotations
+import json
+import threading
+from collections.abc import Mapping
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Sequence, Tuple
+
+from utils.aggregation import SkillTable
+from utils.inverted_index import SkillInvertedIndex
+from utils.report_store import ReportStore, expand_assessment
+from utils.vector_index import CandidateVectorIndex
+
+# Paths
+ROOT = Path(".")
+REPORTS_DIR = ROOT / "outputs" / "reports"
+ASSESSMENTS_DIR = ROOT / "outputs" / "assessments"
+STORE_PATH = ROOT / "outputs" / "reports.db"
+MANIFEST_PATH = ROOT / "outputs" / "manifest.db"
+SKILL_INDEX_PATH = ROOT / "outputs" / "skill_index.json"
+VECTOR_INDEX_PATH = ROOT / "outputs" / "cache" / "candidate_vectors.npy"
+JOBS_PATH = ROOT / "outputs" / "jobs.db"
+
+# path → (mtime_ns, size, parsed report): unchanged files are never re-parsed
+_FILE_CACHE: Dict[Path, Tuple[int, int, Dict]] = {}
+
+def _read_json(f: Path) -> Dict:
+    fs = f.stat()
+    hit = _FILE_CACHE.get(f)
+    if hit is None or hit[:2] != (fs.st_mtime_ns, fs.st_size):
+        hit = (fs.st_mtime_ns, fs.st_size, json.loads(f.read_text(encoding="utf-8")))
+        _FILE_CACHE[f] = hit
+    return hit[2]
+
+def load_json_files(directory: Path) -> Dict[str, Dict]:
+    out = {}
+    if not directory.exists():
+        return out
+    for f in sorted(directory.glob("*.json")):
+        try:
+            out[f.stem] = _read_json(f)
+        except Exception:
+            # ignore bad files
+            continue
+    return out
+
+def clear_file_cache():
+    _FILE_CACHE.clear()
+
+def _mtime_ns(p: Path) -> int:
+    try:
+        return p.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+def outputs_signature() -> Tuple[int, ...]:
+    """
+    Cheap change detector for cache keys: a handful of stat() calls.
+    Agents write files via rename, which bumps the directory mtime, and every
+    run touches the manifest, so in-place rewrites are caught as well.
+    """
+    paths = [REPORTS_DIR, ASSESSMENTS_DIR, ASSESSMENTS_DIR / "packages", REPORTS_DIR / "behavioral",
+             REPORTS_DIR / "market",
+             STORE_PATH, MANIFEST_PATH, VECTOR_INDEX_PATH]
+    return tuple(_mtime_ns(p) for p in paths)
+
+def data_as_of(signature: Tuple[int, ...]) -> str:
+    latest = max(signature, default=0)
+    if not latest:
+        return "no pipeline outputs yet"
+    return datetime.fromtimestamp(latest / 1e9).strftime("%Y-%m-%d %H:%M:%S")
+
+def has_store() -> bool:
+    return STORE_PATH.exists()
+
+class StoreReports(Mapping):
+    """
+    Read-only {key: report} view over one kind in the report store. len() and
+    `in` are SQL queries and reports are fetched one at a time, so pages that
+    only show a single candidate never load the rest.
+    """
+    def __init__(self, store: ReportStore, kind: str, lock: threading.Lock):
+        self._store, self._kind, self._lock = store, kind, lock
+
+    def __getitem__(self, key: str) -> Dict:
+        with self._lock:
+            rep = self._store.get(self._kind, key)
+        if rep is None:
+            raise KeyError(key)
+        return rep
+
+    def __contains__(self, key) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(self._store.keys(self._kind))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._store.count(self._kind)
+
+    def close(self):
+        with self._lock:
+            self._store.close()
+
+class SharedStore:
+    """
+    ReportStore shared by every Streamlit session (st.cache_resource): the
+    connection is opened with check_same_thread=False, so each method call
+    holds one lock for its whole query.
+    """
+    def __init__(self, store: ReportStore):
+        self._store, self._lock = store, threading.Lock()
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._store, name)
+        if not callable(attr):
+            return attr
+
+        def locked(*args, **kwargs):
+            with self._lock:
+                return attr(*args, **kwargs)
+        return locked
+
+class JsonReports(Mapping):
+    """
+    Read-only {key: report} view over the sorted *.json listing of one output
+    directory: a file is parsed when its report is first looked up, so without
+    a store the dashboards still only read what they show.
+    """
+    def __init__(self, directory: Path):
+        self._dir = directory
+        self._keys = [f.stem for f in sorted(directory.glob("*.json"))] if directory.exists() else []
+
+    def __getitem__(self, key: str) -> Dict:
+        try:
+            return _read_json(self._dir / f"{key}.json")
+        except Exception:  # missing or bad file
+            raise KeyError(key) from None
+
+    def __contains__(self, key) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def items(self) -> Iterator[Tuple[str, Dict]]:
+        # full scans (charts, in-memory index) skip bad files, like load_json_files
+        return ((k, rep) for k in self._keys if (rep := self.get(k)) is not None)
+
+    def values(self) -> Iterator[Dict]:
+        return (rep for _, rep in self.items())
+
+class JsonAssessments(JsonReports):
+    """Per-candidate assessment files with their shared package merged in on lookup."""
+    def __init__(self, directory: Path):
+        super().__init__(directory)
+        self._packages: Dict[str, Dict] | None = None
+
+    def __getitem__(self, key: str) -> Dict:
+        if self._packages is None:
+            self._packages = load_json_files(self._dir / "packages")  # a few dozen files
+        return expand_assessment(super().__getitem__(key), self._packages)
+
+def load_outputs() -> Tuple[Mapping, Mapping, Mapping, Dict[str, Dict]]:
+    """
+    (candidate, assessment, behavioral, market) reports keyed by file stem.
+    Per-candidate kinds are lazy views, StoreReports over the consolidated
+    store or JsonReports over the per-file outputs; market is small and loaded.
+    """
+    if has_store():
+        store, lock = ReportStore(STORE_PATH), threading.Lock()
+        return (StoreReports(store, "candidates", lock), StoreReports(store, "assessments", lock),
+                StoreReports(store, "behavioral", lock), store.load("market"))
+    return (JsonReports(REPORTS_DIR), JsonAssessments(ASSESSMENTS_DIR),
+            JsonReports(REPORTS_DIR / "behavioral"), load_json_files(REPORTS_DIR / "market"))
+
+def release_outputs(outputs: Sequence):
+    """on_release hook for cached load_outputs(): close the store behind the views."""
+    views = [v for v in outputs if isinstance(v, StoreReports)]
+    if views:
+        views[0].close()  # all views share one store
+
+def candidate_index(candidate_reports: Mapping) -> SharedStore:
+    """
+    Searchable candidate index for the explorer: the on-disk store when present,
+    else an in-memory SQLite index built once per outputs signature from the
+    JSON reports (`python -m utils.report_store` imports them into a store).
+    Close it (release_index) when the cache entry is evicted.
+    """
+    if has_store():
+        return SharedStore(ReportStore(STORE_PATH))
+    index = ReportStore(":memory:")
+    for rep in candidate_reports.values():
+        index.put_candidate(rep)
+    index.commit()
+    return SharedStore(index)
+
+def release_index(index: SharedStore):
+    """on_release hook for cached candidate_index()."""
+    index.close()
+
+def skill_table(candidate_reports: Dict[str, Dict]) -> SkillTable:
+    """Columnar skills: straight from the store's skills table when present."""
+    if has_store():
+        with ReportStore(STORE_PATH) as store:
+            return SkillTable.from_rows(store.skill_rows())
+    return SkillTable.from_reports(candidate_reports)
+
+def skill_index() -> SkillInvertedIndex:
+    """
+    Inverted skill index for boolean skill queries: built from the store's
+    skills table when present, else the persisted index refreshed against
+    outputs/reports (only changed report files are re-read).
+    """
+    if has_store():
+        with ReportStore(STORE_PATH) as store:
+            return SkillInvertedIndex.from_rows(store.skill_rows())
+    return SkillInvertedIndex.load_or_build(REPORTS_DIR, SKILL_INDEX_PATH)
+
+def vector_index() -> CandidateVectorIndex | None:
+    """Profile embeddings written by `python -m app.main --vector-index ...`, if any."""
+    try:
+        return CandidateVectorIndex.load(VECTOR_INDEX_PATH)
+    except (OSError, ValueError, KeyError):
+        return None
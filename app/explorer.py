@@ -0,0 +1,125 @@
+# app/explorer.py
+"""Paginated, searchable candidate table shared by both dashboards."""
+from __future__ import annotations
+import io
+from collections.abc import Mapping
+from typing import List, Optional
+
+import pandas as pd
+import streamlit as st
+
+from app.data import SharedStore
+from utils.inverted_index import SkillInvertedIndex, parse_query
+from utils.vector_index import CandidateVectorIndex
+
+PAGE_SIZES = [25, 50, 100]
+
+def candidate_explorer(index: SharedStore) -> Optional[str]:
+    """
+    Render filters + one page of matching candidates; return the selected
+    candidate key (report file stem) or None. Only the visible page is queried.
+    """
+    with st.expander("🔎 Search & filters", expanded=True):
+        c1, c2 = st.columns(2)
+        text = c1.text_input("Name contains", key="explorer_text")
+        role = c2.selectbox("Role", ["Any"] + index.roles(), key="explorer_role")
+        lo, hi = index.experience_range()
+        experience = None
+        if hi > lo:
+            full = (float(lo), float(hi))
+            chosen = st.slider("Experience (years)", *full, full, key="explorer_exp")
+            if tuple(chosen) != full:  # the full range keeps candidates without experience_years
+                experience = chosen
+        c3, c4 = st.columns(2)
+        skills = c3.multiselect("Has skills", index.skill_names(), key="explorer_skills")
+        min_conf = c4.slider("Minimum confidence (for selected skills)", 0.0, 1.0, 0.0, 0.05,
+                             key="explorer_conf")
+
+    c5, c6 = st.columns([1, 3])
+    page_size = c5.selectbox("Rows per page", PAGE_SIZES, key="explorer_page_size")
+    filters = dict(text=text.strip(), role=None if role == "Any" else role,
+                   experience=experience, skills=skills, min_confidence=min_conf)
+    total, _ = index.search_candidates(**filters, limit=0)
+    n_pages = max(1, -(-total // page_size))
+    page = c6.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, step=1,
+                           key="explorer_page")
+    _, rows = index.search_candidates(**filters, limit=page_size, offset=(int(page) - 1) * page_size)
+
+    st.caption(f"{total} matching candidate(s)")
+    if not rows:
+        st.info("No candidates match these filters.")
+        return None
+    table = pd.DataFrame(rows).set_index("key")
+    st.dataframe(table, use_container_width=True)
+    return st.selectbox("Open candidate", table.index.tolist(),
+                        format_func=lambda k: table.at[k, "name"] or k, key="explorer_choice")
+
+def _shortlist_export(hits: List[str], reports: Mapping):
+    """Combined PDF (with contents page) or zip of per-candidate PDFs for the current shortlist."""
+    from utils.pdf_generator import combined_report_pdf, zip_report_pdfs
+
+    c1, c2 = st.columns(2)
+    fmt = c1.radio("Shortlist export", ["Combined PDF", "Zip of PDFs"], horizontal=True, key="shortlist_fmt")
+    if c2.button(f"📄 Build export ({len(hits)} candidates)", key="shortlist_build"):
+        buf = io.BytesIO()
+        with st.spinner("Rendering PDFs…"):
+            selected = (reports[k] for k in hits if k in reports)
+            if fmt == "Combined PDF":
+                combined_report_pdf(selected, buf)
+            else:
+                zip_report_pdfs(selected, buf)
+        st.session_state["shortlist_export"] = (tuple(hits), fmt, buf.getvalue())
+    built = st.session_state.get("shortlist_export")
+    if built is not None and built[0] == tuple(hits):  # stale once the query changes
+        _, fmt_built, data = built
+        name, mime = (("shortlist.pdf", "application/pdf") if fmt_built == "Combined PDF"
+                      else ("shortlist.zip", "application/zip"))
+        st.download_button(f"Download {name}", data, file_name=name, mime=mime, key="shortlist_download")
+
+def skill_query_panel(index: SkillInvertedIndex, reports: Optional[Mapping] = None):
+    """
+    Boolean skill query over the inverted index, e.g. `PyTorch>=0.7 AND Docker OR
+    Kubernetes AND NOT Java`; with `reports`, the hits can be exported as PDFs.
+    """
+    with st.expander("⚡ Skill query", expanded=False):
+        c1, c2 = st.columns([4, 1])
+        expr = c1.text_input("Skills (AND / OR / NOT, optional >=confidence)", key="skill_query")
+        k = c2.number_input("Top", min_value=5, max_value=500, value=20, step=5, key="skill_query_k")
+        if not expr.strip():
+            st.caption(f"{len(index)} candidates · {len(index.postings)} skills indexed")
+            return
+        try:
+            clauses, _ = parse_query(expr)
+            hits = index.search(expr, k=int(k))
+        except ValueError as e:
+            st.error(str(e))
+            return
+        if not hits:
+            st.info("No candidates match this query.")
+            return
+        skills = [s for clause in clauses for s, _ in clause]
+        rows = [{"candidate": cand, "score": score,
+                 **{s: index.forward[cand].get(s) for s in skills}} for cand, score in hits]
+        st.dataframe(pd.DataFrame(rows).set_index("candidate"), use_container_width=True)
+        if reports is not None:
+            _shortlist_export([cand for cand, _ in hits], reports)
+
+def role_match_panel(index: Optional[CandidateVectorIndex], roles: List[str]):
+    """Semantic top-k candidates for a role or a pasted job description."""
+    with st.expander("🎯 Match candidates to a role", expanded=False):
+        if index is None or not len(index):
+            st.caption("No profile embeddings yet: run `python -m app.main --vector-index "
+                       "outputs/cache/candidate_vectors.npy`.")
+            return
+        c1, c2 = st.columns([4, 1])
+        role = c1.selectbox("Role", [""] + roles, key="match_role")
+        k = c2.number_input("Top", min_value=5, max_value=200, value=10, step=5, key="match_k")
+        jd = st.text_area("…or paste a job description", key="match_jd")
+        query = jd.strip() or role
+        if not query:
+            return
+        from utils.nlp_utils import embed  # loads the embedding model on first query
+        with st.spinner("Matching…"):
+            hits = index.search(embed([query])[0], k=int(k))
+        st.dataframe(pd.DataFrame(hits, columns=["candidate", "similarity"]).set_index("candidate"),
+                     use_container_width=True)
@@ -0,0 +1,58 @@
+# app/jobs_panel.py
+"""Submit background jobs (utils.jobs) from the dashboards and poll their progress."""
+from __future__ import annotations
+from typing import Dict
+
+import streamlit as st
+
+from app.data import JOBS_PATH, SKILL_INDEX_PATH, STORE_PATH, VECTOR_INDEX_PATH
+from utils.jobs import FINISHED, JobQueue, ensure_worker
+
+def _pipeline_params(incremental: bool) -> Dict:
+    """Keep whatever the dashboards read from (store, indexes) in step with the rerun."""
+    params = {"incremental": incremental}
+    for key, path in [("store_path", STORE_PATH), ("skill_index_path", SKILL_INDEX_PATH),
+                      ("vector_index_path", VECTOR_INDEX_PATH)]:
+        if path.exists():
+            params[key] = str(path)
+    return params
+
+def _submit(kind: str, params: Dict):
+    with JobQueue(JOBS_PATH) as queue:
+        job_id = queue.submit(kind, params)
+        ensure_worker(queue)  # no worker running: start one that exits when idle
+    st.toast(f"Queued job #{job_id}")
+
+def _job_rows():
+    with JobQueue(JOBS_PATH) as queue:
+        jobs = queue.list(limit=10)
+        for job in jobs:
+            c1, c2, c3 = st.columns([3, 5, 1])
+            c1.write(f"**#{job['id']}** {job['kind']} — {job['status']}")
+            if job["status"] == "failed":
+                c2.caption((job["error"] or "failed").strip().splitlines()[-1])
+            elif job["total"]:
+                c2.progress(min(job["done"] / job["total"], 1.0), text=job["message"] or "")
+            else:
+                c2.caption(job["message"] or "")
+            if job["status"] not in FINISHED and c3.button("Cancel", key=f"job_cancel_{job['id']}"):
+                queue.cancel(job["id"])
+        if not jobs:
+            st.caption("No jobs yet.")
+
+def jobs_panel():
+    """Buttons for the bulk jobs plus a self-refreshing status list."""
+    st.subheader("Background jobs")
+    c1, c2, c3 = st.columns([2, 2, 2])
+    incremental = c1.checkbox("Only changed inputs", value=True, key="jobs_incremental")
+    if c2.button("🔄 Regenerate outputs", key="jobs_regenerate"):
+        _submit("regenerate_outputs", _pipeline_params(incremental))
+    if c3.button("📄 Export all PDFs", key="jobs_export_pdfs"):
+        _submit("export_pdfs", {})
+
+    fragment = getattr(st, "fragment", None)
+    if fragment is not None:
+        fragment(run_every=2)(_job_rows)()  # polls the queue without rerunning the page
+    else:
+        st.button("Refresh job status", key="jobs_refresh")
+        _job_rows()
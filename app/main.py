@@ -0,0 +1,139 @@
+# app/main.py
+"""
+Pipeline entry point: runs all four agents in one go.
+
+    python -m app.main [--workers 2] [--profiler-workers 8] [--batch-size 64] [--incremental]
+                       [--store outputs/reports.db] [--skill-index outputs/skill_index.json]
+                       [--vector-index outputs/cache/candidate_vectors.npy] [--behavioral-embedding]
+                       [--embedding-cache outputs/cache/embeddings.sqlite]
+
+BehavioralAnalyzer and MarketIntelligence run in a process pool while
+CandidateProfiler streams its reports straight into AssessmentDesigner in
+this process, so wall-clock time tracks the slowest stage, not the sum.
+"""
+from __future__ import annotations
+import argparse
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.context import BaseContext
+from typing import Callable, Dict, Iterable, Iterator, Tuple
+
+from agents.assessment_designer import AssessmentDesigner
+from agents.behavioral_analyzer import BehavioralAnalyzer
+from agents.candidate_profiler import CandidateProfiler
+from agents.market_intelligence import MarketIntelligence
+from utils.nlp_utils import configure_embedding_cache
+
+def _run_behavioral(incremental: bool, store_path: str | None, embedding: bool = False) -> Tuple[int, float]:
+    t0 = time.perf_counter()
+    analyzer = BehavioralAnalyzer(store_path=store_path, embedding=embedding)
+    n = sum(1 for _ in analyzer.iter_run(incremental=incremental))
+    return n, time.perf_counter() - t0
+
+def _run_market(incremental: bool, store_path: str | None) -> Tuple[int, float]:
+    t0 = time.perf_counter()
+    n = sum(1 for _ in MarketIntelligence(store_path=store_path).iter_run(incremental=incremental))
+    return n, time.perf_counter() - t0
+
+def _timed(it: Iterable, stats: Dict[str, float]) -> Iterator:
+    """Pass items through, adding the time spent producing them to stats["seconds"]."""
+    it = iter(it)
+    while True:
+        t0 = time.perf_counter()
+        try:
+            item = next(it)
+        except StopIteration:
+            stats["seconds"] += time.perf_counter() - t0
+            return
+        stats["seconds"] += time.perf_counter() - t0
+        stats["count"] += 1
+        yield item
+
+def run_pipeline(workers: int = 2, batch_size: int | None = 64, incremental: bool = False,
+                 profiler_workers: int = 0, chunk_size: int = 256,
+                 store_path: str | None = None,
+                 skill_index_path: str | None = None,
+                 vector_index_path: str | None = None,
+                 behavioral_embedding: bool = False,
+                 on_progress: Callable[[int], None] | None = None,
+                 mp_context: BaseContext | None = None) -> Dict[str, Dict[str, float]]:
+    """
+    Run every agent and return {stage: {"count": n, "seconds": s}} plus a
+    "total" wall-clock entry. workers=0 uses threads instead of processes;
+    profiler_workers > 1 shards CandidateProfiler across its own process pool.
+    store_path additionally writes every report into a consolidated ReportStore;
+    skill_index_path / vector_index_path keep the inverted skill index and the
+    profile-embedding index in step with the profiles. behavioral_embedding
+    scores behavioral themes by utterance embeddings instead of keywords.
+    on_progress(n) is called after each candidate makes it through profiling
+    and assessment. mp_context (e.g. forkserver) starts both process pools
+    instead of the default start method.
+    """
+    started = time.perf_counter()
+    pool: Executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) if workers > 0 else ThreadPoolExecutor(max_workers=2)
+    with pool:
+        side = {
+            "BehavioralAnalyzer": pool.submit(_run_behavioral, incremental, store_path, behavioral_embedding),
+            "MarketIntelligence": pool.submit(_run_market, incremental, store_path),
+        }
+
+        # Profiler → designer, in memory: no re-reading outputs/reports/*.json
+        prof = {"count": 0, "seconds": 0.0}
+        t0 = time.perf_counter()
+        profiler = CandidateProfiler(store_path=store_path, skill_index_path=skill_index_path,
+                                     vector_index_path=vector_index_path)
+        profiles = _timed(profiler.iter_run(batch_size=batch_size, incremental=incremental,
+                                            workers=profiler_workers, chunk_size=chunk_size,
+                                            mp_context=mp_context), prof)
+        designer = AssessmentDesigner(store_path=store_path)
+        n_assess = 0
+        for _ in designer.iter_run(profiles, incremental=incremental):
+            n_assess += 1
+            if on_progress is not None:
+                on_progress(n_assess)
+        timings = {
+            "CandidateProfiler": prof,
+            "AssessmentDesigner": {"count": n_assess, "seconds": time.perf_counter() - t0 - prof["seconds"]},
+        }
+        for name, fut in side.items():
+            n, secs = fut.result()
+            timings[name] = {"count": n, "seconds": secs}
+    timings["total"] = {"count": sum(t["count"] for t in timings.values()),
+                        "seconds": time.perf_counter() - started}
+    return timings
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Run the multi-agent recruitment pipeline.")
+    ap.add_argument("--workers", type=int, default=2,
+                    help="process pool size for the side agents (0 = threads)")
+    ap.add_argument("--profiler-workers", type=int, default=0,
+                    help="shard CandidateProfiler across N processes (0/1 = in-process)")
+    ap.add_argument("--chunk-size", type=int, default=256,
+                    help="candidates per profiler worker task")
+    ap.add_argument("--batch-size", type=int, default=64,
+                    help="candidates per embedding call in CandidateProfiler")
+    ap.add_argument("--incremental", action="store_true",
+                    help="only reprocess records whose input or agent version changed")
+    ap.add_argument("--store", default=None, metavar="PATH",
+                    help="also write a consolidated SQLite store, e.g. outputs/reports.db"
+                         " (python -m utils.report_store imports existing outputs)")
+    ap.add_argument("--skill-index", default=None, metavar="PATH",
+                    help="maintain an inverted skill index, e.g. outputs/skill_index.json")
+    ap.add_argument("--vector-index", default=None, metavar="PATH",
+                    help="persist profile embeddings for semantic matching, e.g. outputs/cache/candidate_vectors.npy")
+    ap.add_argument("--behavioral-embedding", action="store_true",
+                    help="classify behavioral themes with utterance embeddings instead of keywords")
+    ap.add_argument("--embedding-cache", default=None, metavar="PATH",
+                    help="keep embeddings in a SQLite cache across runs, e.g. outputs/cache/embeddings.sqlite")
+    args = ap.parse_args()
+
+    if args.embedding_cache:
+        configure_embedding_cache(path=args.embedding_cache)
+
+    timings = run_pipeline(workers=args.workers, batch_size=args.batch_size, incremental=args.incremental,
+                           profiler_workers=args.profiler_workers, chunk_size=args.chunk_size,
+                           store_path=args.store, skill_index_path=args.skill_index,
+                           vector_index_path=args.vector_index,
+                           behavioral_embedding=args.behavioral_embedding)
+    for stage, t in timings.items():
+        print(f"{stage:20s} {int(t['count']):6d} reports  {t['seconds']:8.2f}s")
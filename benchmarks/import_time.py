@@ -0,0 +1,40 @@
+# benchmarks/import_time.py
+"""
+Startup cost of utils.nlp_utils.
+
+"lazy import" is what every entry point pays now; "import + model load" is what
+the eager module-level SentenceTransformer/spaCy load used to cost on import.
+Each case runs in a fresh interpreter.
+
+    python -m benchmarks.import_time --repeat 3
+"""
+from __future__ import annotations
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+CASES = {
+    "lazy import": "import utils.nlp_utils",
+    "import + model load (old eager cost)": "import utils.nlp_utils as n; n.get_model(); n.get_nlp()",
+    "import + warm_up()": "import utils.nlp_utils as n; n.warm_up(with_spacy=True)",
+}
+
+def time_case(code: str, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        runs.append(time.perf_counter() - t0)
+    return statistics.median(runs)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    baseline = time_case("pass", args.repeat)
+    print(f"{'interpreter start':40s} {baseline:7.3f}s")
+    for name, code in CASES.items():
+        t = time_case(code, args.repeat)
+        print(f"{name:40s} {t:7.3f}s  (+{t - baseline:.3f}s)")
@@ -0,0 +1,58 @@
+# benchmarks/theme_throughput.py
+"""
+Behavioral theme scoring throughput, in utterances per second.
+
+"keyword" is ThemeScorer (one tokenized pass per transcript); "embedding
+(per conversation)" encodes each conversation on its own, the way a naive
+per-utterance classifier would; "embedding (batched)" is what
+BehavioralAnalyzer(embedding=True) does: one length-sorted encode and one
+matmul per batch of conversations. The embedding cache is off unless --cache.
+
+    python -m benchmarks.theme_throughput --conversations 2000 --batch-size 256
+"""
+from __future__ import annotations
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from agents.behavioral_analyzer import _SCORER
+from utils.nlp_utils import configure_embedding_cache, warm_up
+from utils.themes import THEME_PROTOTYPES, EmbeddingThemeClassifier
+
+FILLER = ["Last year", "At my previous job", "In that project", "Usually", "When deadlines were tight"]
+
+def synthetic_conversations(n: int, turns: int, seed: int = 0) -> List[List[str]]:
+    rng = random.Random(seed)
+    examples = [e.rstrip(".") for ex in THEME_PROTOTYPES.values() for e in ex]
+    return [[f"{rng.choice(FILLER)}, {rng.choice(examples).lower()}." for _ in range(turns)]
+            for _ in range(n)]
+
+def throughput(fn: Callable[[List[List[str]]], object], convs: List[List[str]], batch_size: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(0, len(convs), batch_size):
+        fn(convs[i:i + batch_size])
+    return sum(len(c) for c in convs) / (time.perf_counter() - t0)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--conversations", type=int, default=2000)
+    ap.add_argument("--turns", type=int, default=6)
+    ap.add_argument("--batch-size", type=int, default=256)
+    ap.add_argument("--cache", action="store_true", help="keep the embedding cache on")
+    args = ap.parse_args()
+
+    if not args.cache:
+        configure_embedding_cache(enabled=False)
+    convs = synthetic_conversations(args.conversations, args.turns)
+    clf = EmbeddingThemeClassifier()
+    warm_up()
+    clf.prototype_vectors()
+
+    cases = {
+        "keyword": (lambda b: [_SCORER.score(c) for c in b], args.batch_size),
+        "embedding (per conversation)": (lambda b: [clf.score_many([c]) for c in b], args.batch_size),
+        "embedding (batched)": (clf.score_many, args.batch_size),
+    }
+    for name, (fn, bs) in cases.items():
+        print(f"{name:30s} {throughput(fn, convs, bs):12,.0f} utterances/s")
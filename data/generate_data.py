@@ -1,3 +1,4 @@
+import argparse
 import json
 from faker import Faker
 import random
@@ -35,16 +36,36 @@ def generate_conversation():
         ]
     }
 
+def write_jsonl(path, make, n):
+    # One record per line, generated on the fly so huge files stay cheap to produce
+    with open(path, "w") as f:
+        for _ in range(n):
+            f.write(json.dumps(make()) + "\n")
+
 if __name__ == "__main__":
-    candidates = [generate_candidate() for _ in range(10)]
-    market_data = [generate_market_data() for _ in range(5)]
-    conversations = [generate_conversation() for _ in range(10)]
+    ap = argparse.ArgumentParser(description="Generate synthetic recruitment data.")
+    ap.add_argument("--candidates", type=int, default=10)
+    ap.add_argument("--market", type=int, default=5)
+    ap.add_argument("--conversations", type=int, default=10)
+    ap.add_argument("--format", choices=["json", "jsonl"], default="json",
+                    help="jsonl streams records line by line (use for large volumes)")
+    ap.add_argument("--out-dir", default="data")
+    args = ap.parse_args()
+
+    if args.format == "jsonl":
+        write_jsonl(f"{args.out_dir}/candidates.jsonl", generate_candidate, args.candidates)
+        write_jsonl(f"{args.out_dir}/market_data.jsonl", generate_market_data, args.market)
+        write_jsonl(f"{args.out_dir}/conversations.jsonl", generate_conversation, args.conversations)
+    else:
+        candidates = [generate_candidate() for _ in range(args.candidates)]
+        market_data = [generate_market_data() for _ in range(args.market)]
+        conversations = [generate_conversation() for _ in range(args.conversations)]
 
-    with open("data/candidates.json", "w") as f:
-        json.dump(candidates, f, indent=2)
+        with open(f"{args.out_dir}/candidates.json", "w") as f:
+            json.dump(candidates, f, indent=2)
 
-    with open("data/market_data.json", "w") as f:
-        json.dump(market_data, f, indent=2)
+        with open(f"{args.out_dir}/market_data.json", "w") as f:
+            json.dump(market_data, f, indent=2)
 
-    with open("data/conversations.json", "w") as f:
-        json.dump(conversations, f, indent=2)
+        with open(f"{args.out_dir}/conversations.json", "w") as f:
+            json.dump(conversations, f, indent=2)
@@ -1,54 +1,68 @@
 # main.py
 import streamlit as st
-import json
 from pathlib import Path
 from typing import Dict
 import pandas as pd
 import plotly.express as px
 
-# ---------------- PATHS ----------------
-ROOT = Path(".")
-REPORTS_DIR = ROOT / "outputs" / "reports"
-ASSESSMENTS_DIR = ROOT / "outputs" / "assessments"
+from app.data import (REPORTS_DIR, candidate_index, clear_file_cache, data_as_of, load_outputs,
+                      outputs_signature, release_index, release_outputs, skill_index, skill_table,
+                      vector_index)
+from app.explorer import candidate_explorer, role_match_panel, skill_query_panel
+from app.jobs_panel import jobs_panel
+from utils.aggregation import cooccurrence, salary_frame, skill_frequency
+from utils.pdf_generator import candidate_report_pdf_bytes, pdf_filename
 
 # ---------------- HELPERS ----------------
-def load_json_files(directory: Path) -> Dict[str, Dict]:
-    out = {}
-    if not directory.exists():
-        return out
-    for f in sorted(directory.glob("*.json")):
-        try:
-            out[f.stem] = json.loads(f.read_text(encoding="utf-8"))
-        except Exception:
-            continue
-    return out
-
 def aggregate_skills(candidate_reports: Dict[str, Dict]) -> pd.DataFrame:
-    rows = []
-    for key, rep in candidate_reports.items():
-        for skill, conf in rep.get("skills", []):
-            rows.append({"candidate": key, "skill": skill, "confidence": float(conf)})
-    if not rows:
-        return pd.DataFrame(columns=["skill", "count", "avg_conf"])
-    df = pd.DataFrame(rows)
-    agg = df.groupby("skill").agg(
-        count=("candidate", "nunique"),
-        avg_conf=("confidence", "mean")
-    ).reset_index().sort_values("count", ascending=False)
-    return agg
+    return skill_frequency(skill_table(candidate_reports))
 
 def salary_distribution_df(market_reports: Dict[str, Dict]) -> pd.DataFrame:
-    rows = []
-    for k, rep in market_reports.items():
-        try:
-            rows.append({
-                "role": rep.get("role", k),
-                "avg_salary": float(rep.get("avg_salary", 0)),
-                "demand_index": rep.get("demand_index", 0)
-            })
-        except:
-            continue
-    return pd.DataFrame(rows)
+    return salary_frame(market_reports)
+
+# ---------------- CACHED DATA ----------------
+# Keyed on outputs_signature(): widget clicks reuse the parsed outputs until
+# the pipeline writes something new (or the user hits Refresh). Evicted stores
+# are closed through on_release.
+@st.cache_resource(show_spinner="Loading pipeline outputs…", max_entries=1,
+                   on_release=release_outputs)
+def cached_outputs(signature):
+    return load_outputs()
+
+@st.cache_resource(show_spinner="Indexing candidates…", max_entries=1, on_release=release_index)
+def cached_index(signature):
+    return candidate_index(cached_outputs(signature)[0])
+
+@st.cache_resource(show_spinner="Indexing skills…", max_entries=1)
+def cached_skill_index(signature):
+    return skill_index()
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def cached_vector_index(signature):
+    return vector_index()
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def cached_skill_df(signature) -> pd.DataFrame:
+    return aggregate_skills(cached_outputs(signature)[0])
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def cached_cooccurrence(signature, top_n: int = 12) -> pd.DataFrame:
+    top = cached_skill_df(signature)["skill"].head(top_n).tolist()
+    return cooccurrence(skill_table(cached_outputs(signature)[0]), skills=top)
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def cached_market_df(signature) -> pd.DataFrame:
+    return salary_distribution_df(cached_outputs(signature)[3])
+
+def refresh_data():
+    cached_outputs.clear()
+    cached_index.clear()
+    cached_skill_index.clear()
+    cached_vector_index.clear()
+    cached_skill_df.clear()
+    cached_cooccurrence.clear()
+    cached_market_df.clear()
+    clear_file_cache()
 
 # ---------------- UI RENDERERS ----------------
 def show_candidate(rep: Dict, assessment_reports: Dict, behavioral_reports: Dict):
@@ -73,6 +87,10 @@ def show_candidate(rep: Dict, assessment_reports: Dict, behavioral_reports: Dict
     for h in rep.get("highlights", []):
         st.write(f"- {h}")
 
+    # rendered in memory; repeat clicks on the same report hit the PDF cache
+    st.download_button("📄 Export as PDF", candidate_report_pdf_bytes(rep),
+                       file_name=pdf_filename(rep), mime="application/pdf")
+
     # linked assessment
     ass_key = Path(rep.get("_source_file", "")).stem + "_assessment"
     if ass_key in assessment_reports:
@@ -101,6 +119,12 @@ def show_market(rep: Dict, market_df: pd.DataFrame):
     st.subheader(f"📊 Market Intelligence — {rep.get('role','-')}")
     st.write(f"- **Average Salary**: {rep.get('avg_salary','-')}")
     st.write(f"- **Demand Index**: {rep.get('demand_index','-')}")
+    pct = rep.get("salary_percentiles")
+    if pct:
+        st.write(f"- **Postings**: {rep.get('postings','-')} (salary std dev {rep.get('salary_std','-')})")
+        cols = st.columns(len(pct))
+        for col, (name, value) in zip(cols, pct.items()):
+            col.metric(name.upper(), f"{value:,}")
     st.markdown("**Recommendations**")
     for r in rep.get("recommendations", []):
         st.write(f"- {r}")
@@ -120,11 +144,9 @@ def main():
     st.set_page_config(page_title="Multi-Agent Recruitment Dashboard", layout="wide")
     st.title("🤖 Multi-Agent Recruitment System — Dashboard")
 
-    # load all outputs
-    candidate_reports = load_json_files(REPORTS_DIR)
-    assessment_reports = load_json_files(ASSESSMENTS_DIR)
-    behavioral_reports = load_json_files(REPORTS_DIR / "behavioral")
-    market_reports = load_json_files(REPORTS_DIR / "market")
+    # load all outputs (consolidated store if present, else per-file JSON)
+    signature = outputs_signature()
+    candidate_reports, assessment_reports, behavioral_reports, market_reports = cached_outputs(signature)
 
     # sidebar navigation
     st.sidebar.header("Navigation")
@@ -132,6 +154,10 @@ def main():
         "Choose Section:",
         ["📌 Overview", "👤 Candidates", "📊 Market Trends", "📂 Exports / Utilities"]
     )
+    st.sidebar.caption(f"Data as of {data_as_of(signature)}")
+    if st.sidebar.button("🔄 Refresh data"):
+        refresh_data()
+        st.rerun()
 
     if section == "📌 Overview":
         st.header("System Overview")
@@ -144,26 +170,42 @@ def main():
         col4.metric("Market Reports", len(market_reports))
 
         # skill distribution
-        skill_df = aggregate_skills(candidate_reports)
+        skill_df = cached_skill_df(signature)
         if not skill_df.empty:
             fig = px.bar(skill_df.head(12), x="count", y="skill", orientation="h",
                          title="Top 12 Skills (by candidates)")
             st.plotly_chart(fig, use_container_width=True)
 
+            co = cached_cooccurrence(signature)
+            if not co.empty:
+                fig_co = px.imshow(co, text_auto=True, title="Skill co-occurrence (candidates with both)")
+                st.plotly_chart(fig_co, use_container_width=True)
+
         # salary vs demand
-        market_df = salary_distribution_df(market_reports)
+        market_df = cached_market_df(signature)
         if not market_df.empty:
-            fig2 = px.bar(market_df, x="role", y="avg_salary", color="demand_index",
-                          title="Salary vs Demand Index")
+            bands = market_df.dropna(subset=["p25", "p75"])
+            if len(bands) == len(market_df):
+                # median with the P25–P75 band as error bars
+                fig2 = px.bar(market_df, x="role", y="p50", color="demand_index",
+                              error_y=market_df["p75"] - market_df["p50"],
+                              error_y_minus=market_df["p50"] - market_df["p25"],
+                              labels={"p50": "median salary"},
+                              title="Salary band (P25–P75) vs Demand Index")
+            else:
+                fig2 = px.bar(market_df, x="role", y="avg_salary", color="demand_index",
+                              title="Salary vs Demand Index")
             st.plotly_chart(fig2, use_container_width=True)
 
     elif section == "👤 Candidates":
         if not candidate_reports:
             st.warning("No candidate reports found. Run pipeline first.")
             return
-        choice = st.selectbox("Select Candidate", sorted(candidate_reports.keys()))
+        skill_query_panel(cached_skill_index(signature), candidate_reports)
+        role_match_panel(cached_vector_index(signature), cached_index(signature).roles())
+        choice = candidate_explorer(cached_index(signature))
         if choice:
-            rep = candidate_reports[choice]
+            rep = dict(candidate_reports[choice])  # cached object: don't mutate
             rep["_source_file"] = str(REPORTS_DIR / f"{choice}.json")
             show_candidate(rep, assessment_reports, behavioral_reports)
 
@@ -175,12 +217,12 @@ def main():
         choice = st.selectbox("Select Role", roles)
         if choice:
             rep = market_reports[choice]
-            market_df = salary_distribution_df(market_reports)
+            market_df = cached_market_df(signature)
             show_market(rep, market_df)
 
     else:  # 📂 Exports
         st.header("Exports & Utilities")
-        skill_df = aggregate_skills(candidate_reports)
+        skill_df = cached_skill_df(signature)
         if not skill_df.empty:
             st.download_button(
                 "Download skill-frequency CSV",
@@ -189,7 +231,7 @@ def main():
                 "text/csv"
             )
             st.dataframe(skill_df.head(20))
-        market_df = salary_distribution_df(market_reports)
+        market_df = cached_market_df(signature)
         if not market_df.empty:
             st.download_button(
                 "Download market CSV",
@@ -199,8 +241,8 @@ def main():
             )
             st.dataframe(market_df)
 
-        st.markdown("ℹ️ To regenerate outputs after updating `data/`, run locally:")
-        st.code("python -m app.main", language="bash")
+        st.divider()
+        jobs_panel()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,43 @@
+# tests/conftest.py
+"""
+Shared fixtures. Tests never load the real SentenceTransformer: `fake_model`
+swaps in a deterministic bag-of-words encoder, and `workdir` runs a test in a
+temp directory holding a copy of data/ (agents use cwd-relative paths).
+"""
+from __future__ import annotations
+import hashlib
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import utils.nlp_utils as nlp_utils
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+class FakeModel:
+    """Hashes words into 32 buckets; similar texts get similar unit vectors."""
+    dim = 32
+
+    def encode(self, texts, normalize_embeddings=True, **kw):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                out[i, int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim] += 1
+        out /= np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-9)
+        return out
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    model = FakeModel()
+    monkeypatch.setattr(nlp_utils, "get_model", lambda: model)
+    monkeypatch.setattr(nlp_utils, "_SKILL_INDEX", {})
+    return model
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    shutil.copytree(REPO_ROOT / "data", tmp_path / "data",
+                    ignore=shutil.ignore_patterns("__pycache__", "*.py"))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,62 @@
+# tests/test_aggregation.py
+from __future__ import annotations
+import random
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils.aggregation as aggregation
+from utils.aggregation import SkillTable, cooccurrence, salary_frame, skill_frequency
+
+SKILLS = ["Python", "SQL", "Docker", "Java", "React"]
+
+def _rows(n: int = 60, seed: int = 0):
+    rng = random.Random(seed)
+    rows = [(f"c{i}", s, round(rng.random(), 2)) for i in range(n) for s in rng.sample(SKILLS, rng.randint(0, 4))]
+    return rows + [("c0", "Python", 0.1), ("c0", "Python", 0.9)]  # duplicate (candidate, skill) rows
+
+@pytest.mark.parametrize("bitmap_cells", [64_000_000, 0])  # bitmap and np.unique paths
+def test_skill_frequency_matches_pandas(monkeypatch, bitmap_cells):
+    monkeypatch.setattr(aggregation, "_BITMAP_MAX_CELLS", bitmap_cells)
+    rows = _rows()
+    df = pd.DataFrame(rows, columns=["cand", "skill", "conf"])
+    g = df.groupby("skill")["conf"]
+    expected = pd.DataFrame({"count": df.groupby("skill")["cand"].nunique(), "avg_conf": g.mean(),
+                             "p50": g.quantile(0.5), "p90": g.quantile(0.9)})
+    got = skill_frequency(SkillTable.from_rows(rows)).set_index("skill")
+    assert list(got.index) == sorted(expected.index, key=lambda s: (-expected.loc[s, "count"], s))
+    pd.testing.assert_frame_equal(got[expected.columns], expected.loc[got.index], check_dtype=False,
+                                  check_names=False, atol=1e-6)
+    assert skill_frequency(SkillTable.from_rows([])).empty
+
+def test_from_reports():
+    table = SkillTable.from_reports({"a": {"skills": [["Python", 0.8], ["SQL", 0.5]]}, "b": {}})
+    assert table.candidates == ["a"] and len(table) == 2 and table.skill_names == ["Python", "SQL"]
+
+@pytest.mark.parametrize("scipy", [True, False])
+def test_cooccurrence_matches_sets(monkeypatch, scipy):
+    if not scipy:
+        monkeypatch.setitem(sys.modules, "scipy", None)
+    rows = _rows(seed=1)
+    has = {}
+    for cand, skill, _ in rows:
+        has.setdefault(skill, set()).add(cand)
+    co = cooccurrence(SkillTable.from_rows(rows))
+    for a in co.index:
+        for b in co.columns:
+            assert co.loc[a, b] == len(has[a] & has[b])
+    assert list(cooccurrence(SkillTable.from_rows(rows), ["SQL", "Rust", "Python"]).index) == ["SQL", "Python"]
+
+def test_salary_frame():
+    reports = {
+        "Data_Scientist_market": {"role": "Data Scientist", "avg_salary": 120000, "demand_index": 8, "postings": 3,
+                                  "salary_percentiles": {"p10": 1, "p25": 2, "p50": 3, "p75": 4, "p90": 5}},
+        "Legacy_market": {"avg_salary": 90000},
+        "Broken_market": {"role": "Broken", "avg_salary": "n/a", "demand_index": 2},
+    }
+    df = salary_frame(reports)
+    assert list(df["role"]) == ["Data Scientist", "Legacy_market"]
+    assert df.loc[0, "p50"] == 3 and np.isnan(df.loc[1, "p50"]) and df.loc[1, "demand_index"] == 0
+    assert salary_frame({}).empty
@@ -0,0 +1,70 @@
+# tests/test_api.py
+from __future__ import annotations
+import asyncio
+
+import pytest
+
+from utils.batching import MicroBatcher
+
+def test_micro_batcher_groups_concurrent_submits():
+    calls = []
+
+    def double(items):
+        calls.append(list(items))
+        return [2 * x for x in items]
+
+    async def main():
+        batcher = MicroBatcher(double, max_batch=4, max_wait_ms=50)
+        with pytest.raises(RuntimeError):
+            await batcher.submit(1)
+        await batcher.start()
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+        stats = batcher.stats()
+        await batcher.stop()
+        return results, stats
+
+    results, stats = asyncio.run(main())
+    assert results == [2 * i for i in range(10)]
+    assert [len(c) for c in calls] == [4, 4, 2]
+    assert stats == {"batches": 3, "items": 10, "avg_batch": 3.33, "queued": 0}
+
+def test_micro_batcher_propagates_errors():
+    def fail(items):
+        raise ValueError("boom")
+
+    async def main():
+        batcher = MicroBatcher(fail, max_batch=8, max_wait_ms=5)
+        await batcher.start()
+        out = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+        await batcher.stop()
+        return out
+
+    assert [type(e) for e in asyncio.run(main())] == [ValueError, ValueError]
+
+@pytest.fixture
+def client(workdir, monkeypatch):
+    from fastapi.testclient import TestClient
+    import app.api as api
+    monkeypatch.setattr(api, "KEYWORD_ONLY", True)
+    with TestClient(api.app) as c:
+        yield c
+
+def test_endpoints(client):
+    assert client.get("/health").json()["keyword_only"] is True
+    cand = {"name": "Ada Lovelace", "role": "Data Scientist", "experience_years": 7,
+            "skills": ["Python", "SQL"], "linkedin_summary": "Builds pandas pipelines and sql reports."}
+    report = client.post("/profile", json=cand).json()
+    assert report["candidate"]["name"] == "Ada Lovelace"
+    assert {"Python", "SQL"} <= {s for s, _ in report["skills"]}
+
+    first = client.post("/assessment", json=report).json()
+    assert first["package_id"].startswith("Data_Scientist-senior-python-sql-")
+    assert first["challenges"][-1].startswith("System design")
+    assert client.post("/assessment", json=report).json() == first
+
+    themes = client.post("/behavioral", json={"candidate": "Ada", "conversation": ["I help my team."]}).json()
+    assert themes["themes"]["Collaboration"] == 2
+    market = client.post("/market", json={"role": "QA", "avg_salary": 50000, "demand_index": 9}).json()
+    assert "very high demand" in market["recommendations"][0]
+    assert client.get("/market/Nobody").status_code == 404
+    assert client.post("/jobs", json={"kind": "no_such_job"}).status_code == 400
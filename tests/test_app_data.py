@@ -0,0 +1,103 @@
+# tests/test_app_data.py
+from __future__ import annotations
+import json
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from app.data import candidate_index, load_outputs, release_index, release_outputs
+from app.main import run_pipeline
+
+def test_shared_index_serializes_threads_and_closes(workdir, fake_model):
+    run_pipeline(workers=0, store_path="outputs/reports.db")
+    index = candidate_index({})
+    total, _ = index.search_candidates(limit=0)
+    errors, results = [], []
+
+    def search():
+        try:
+            for offset in range(0, total, 5):
+                results.append(index.search_candidates(limit=5, offset=offset)[0])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=search) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert set(results) == {total}
+
+    release_index(index)
+    with pytest.raises(sqlite3.ProgrammingError):
+        index.roles()
+
+def test_release_outputs_closes_store(workdir, fake_model):
+    run_pipeline(workers=0, store_path="outputs/reports.db")
+    outputs = load_outputs()
+    assert len(outputs[0]) > 0
+    release_outputs(outputs)
+    with pytest.raises(sqlite3.ProgrammingError):
+        len(outputs[0])
+    release_outputs(({}, {}, {}, {}))  # JSON fallback has nothing to close
+
+def test_in_memory_index_from_json_reports(workdir, fake_model):
+    run_pipeline(workers=0)
+    reports = load_outputs()[0]
+    index = candidate_index(reports)
+    assert index.search_candidates(limit=0)[0] == len(reports)
+    release_index(index)
+
+def test_json_fallback_parses_on_lookup(workdir, fake_model):
+    import app.data as data
+
+    run_pipeline(workers=0)
+    (data.REPORTS_DIR / "Broken.json").write_text("{", encoding="utf-8")
+    data.clear_file_cache()
+    candidates, assessments, behavioral, _ = load_outputs()
+    parsed = lambda: [f for f in data._FILE_CACHE if f.parent == data.REPORTS_DIR]
+    assert not parsed()  # nothing parsed up front
+    key = next(iter(candidates))
+    assert candidates[key]["candidate"]["name"]
+    assert len(parsed()) == 1
+    assert assessments[f"{key}_assessment"]["challenges"]  # shared package merged in
+    assert "Broken" not in candidates
+    assert len(list(candidates.values())) == len(candidates) - 1
+
+def test_index_without_experience_filter_keeps_missing_years(workdir, fake_model):
+    index = candidate_index({"a": {"candidate": {"name": "Ada", "experience_years": 4}, "skills": []},
+                             "b": {"candidate": {"name": "Bob"}, "skills": []}})
+    assert index.search_candidates(limit=0)[0] == 2
+    assert index.search_candidates(experience=(0, 10), limit=0)[0] == 1
+    release_index(index)
+
+def test_signature_tracks_output_changes(workdir, fake_model):
+    import app.data as data
+
+    empty = data.outputs_signature()
+    assert data.data_as_of(empty) == "no pipeline outputs yet"
+    run_pipeline(workers=0)
+    first = data.outputs_signature()
+    assert first != empty
+    assert data.outputs_signature() == first  # nothing written: same cache key
+    time.sleep(0.05)  # coarse filesystem timestamps
+    run_pipeline(workers=0)  # rewrites every report via rename
+    assert data.outputs_signature() != first
+
+def test_unchanged_files_are_not_reparsed(workdir, fake_model):
+    import app.data as data
+
+    run_pipeline(workers=0)
+    data.clear_file_cache()
+    first = data.load_json_files(data.REPORTS_DIR)
+    again = data.load_json_files(data.REPORTS_DIR)
+    assert again.keys() == first.keys() and all(again[k] is first[k] for k in first)  # cache hits
+    key = next(iter(first))
+    path = data.REPORTS_DIR / f"{key}.json"
+    path.write_text(json.dumps(dict(first[key], career_summary="Edited.")), encoding="utf-8")
+    edited = data.load_json_files(data.REPORTS_DIR)
+    assert edited[key]["career_summary"] == "Edited."
+    assert all(edited[k] is first[k] for k in first if k != key)
@@ -0,0 +1,127 @@
+# tests/test_assessment_designer.py
+from __future__ import annotations
+import itertools
+import json
+
+from agents.assessment_designer import (BIAS_MITIGATION, EVALUATION_FRAMEWORK, AssessmentDesigner,
+                                        challenges_for, package_id, signature)
+from utils.report_store import ReportStore, expand_assessment
+
+ROLES = ["AI Engineer", "Data Scientist", "Backend Developer", "Full Stack Developer", "Product Manager"]
+SKILL_SETS = [[], ["Python"], ["SQL"], ["Python", "SQL"], ["Docker", "SQL"]]
+YEARS = [0, 1, 2, 3, 5, 6, 12]
+
+def baseline_challenges(candidate):
+    """The original if/elif rules of AssessmentDesigner._generate_challenges."""
+    role, exp = candidate["role"], candidate.get("experience_years", 0)
+    skills = [s for s, _ in candidate.get("skills", [])]
+    challenges = {
+        "AI Engineer": ["Build a simple neural network from scratch (no deep learning libraries).",
+                        "Implement a sentiment analysis model using Python and scikit-learn."],
+        "Data Scientist": ["Clean and analyze a dataset; produce key insights with visualizations.",
+                           "Develop a machine learning model and evaluate accuracy."],
+        "Backend Developer": ["Design a REST API for user management with authentication.",
+                              "Optimize a database query for high-traffic scenarios."],
+        "Full Stack Developer": ["Create a small web app with both frontend (React) and backend (Flask/FastAPI).",
+                                 "Integrate a third-party API and display results in a dashboard."],
+    }.get(role, [])
+    if "Python" in skills:
+        challenges.append("Solve 3 coding challenges in Python (algorithms & data structures).")
+    if "SQL" in skills:
+        challenges.append("Write SQL queries to analyze sales data and generate reports.")
+    if exp < 2:
+        challenges = challenges[:2]
+    elif exp > 5:
+        challenges.append("System design: Architect a scalable AI-based recruitment pipeline.")
+    return challenges
+
+def _report(name, role, skills, years):
+    return {"candidate": {"name": name, "role": role, "experience_years": years},
+            "skills": [[s, 0.8] for s in skills]}
+
+def _designer(tmp_path, store_path=None):
+    return AssessmentDesigner(reports_dir=tmp_path / "reports", out_dir=tmp_path / "assessments",
+                              manifest_path=tmp_path / "manifest.db", store_path=store_path)
+
+def test_challenges_match_original_rules(tmp_path):
+    designer = _designer(tmp_path)
+    for role, skills, years in itertools.product(ROLES, SKILL_SETS, YEARS):
+        candidate = {"role": role, "experience_years": years, "skills": [[s, 0.8] for s in skills]}
+        expected = baseline_challenges(candidate)
+        assert list(challenges_for(signature({"candidate": candidate}))) == expected
+        assert designer.build_assessment(_report("X", role, skills, years))["challenges"] == expected
+
+def test_package_ids_are_unique_and_filename_safe():
+    sigs = {signature(_report("X", role, skills, years))
+            for role, skills, years in itertools.product(
+                ROLES + ["Data_Scientist", "QA/Test", "QA_Test"], SKILL_SETS, YEARS)}
+    ids = {package_id(sig) for sig in sigs}
+    assert len(ids) == len(sigs)
+    assert not any(c in pid for pid in ids for c in " /\\")
+    assert package_id(signature(_report("X", "Data Scientist", [], 3))).startswith("Data_Scientist-mid-")
+
+def test_candidates_share_one_package(tmp_path):
+    designer = _designer(tmp_path)
+    reports = [_report("Ada Lovelace", "Data Scientist", ["Python"], 3),
+               _report("Alan Turing", "Data Scientist", ["Python", "Docker"], 4),
+               _report("Grace Hopper", "Data_Scientist", ["Python"], 3)]
+    out = designer.run(reports)
+    assert out[0]["package_id"] == out[1]["package_id"] != out[2]["package_id"]
+    packages = sorted(p.name for p in (tmp_path / "assessments" / "packages").glob("*.json"))
+    assert packages == sorted(f"{a['package_id']}.json" for a in (out[0], out[2]))
+    saved = json.loads((tmp_path / "assessments" / "Ada_Lovelace_assessment.json").read_text())
+    assert saved == {"candidate": reports[0]["candidate"], "package_id": out[0]["package_id"]}
+
+    packages, assignments = designer.build_bulk(reports)
+    assert assignments == {"Ada_Lovelace": out[0]["package_id"], "Alan_Turing": out[0]["package_id"],
+                           "Grace_Hopper": out[2]["package_id"]}
+    assert set(packages) == set(assignments.values())
+
+def test_responses_do_not_share_mutable_parts(tmp_path):
+    designer = _designer(tmp_path)
+    first = designer.build_assessment(_report("A", "AI Engineer", ["SQL"], 8))
+    first["challenges"].append("extra")
+    first["evaluation_framework"]["Problem-Solving Approach"] = "100%"
+    first["bias_mitigation"].clear()
+    second = designer.build_assessment(_report("B", "AI Engineer", ["SQL"], 8))
+    assert second["challenges"] == baseline_challenges(
+        {"role": "AI Engineer", "experience_years": 8, "skills": [["SQL", 0.8]]})
+    assert second["evaluation_framework"] == EVALUATION_FRAMEWORK
+    assert EVALUATION_FRAMEWORK["Problem-Solving Approach"] == "40%"
+    assert second["bias_mitigation"] == BIAS_MITIGATION and len(BIAS_MITIGATION) == 3
+    assert "signature" not in second and second["candidate"]["name"] == "B"
+
+def test_store_expands_package_references(tmp_path):
+    store_path = tmp_path / "reports.db"
+    designer = _designer(tmp_path, store_path)
+    out = designer.run([_report("Ada Lovelace", "Backend Developer", ["SQL"], 1),
+                        _report("Alan Turing", "Backend Developer", ["SQL"], 1)])
+    expected = designer.build_assessment(_report("Ada Lovelace", "Backend Developer", ["SQL"], 1))
+    with ReportStore(store_path) as store:
+        got = store.get("assessments", "Ada_Lovelace_assessment")
+        assert got == expected
+        got["challenges"].clear()
+        assert store.load("assessments")["Alan_Turing_assessment"]["challenges"] == expected["challenges"]
+    packages = {out[0]["package_id"]: designer.package(signature(_report("", "Backend Developer", ["SQL"], 1)))}
+    self_contained = {"candidate": {}, "challenges": ["own"]}
+    assert expand_assessment(self_contained, packages) is self_contained
+
+def test_unreferenced_packages_are_pruned(tmp_path):
+    store_path = tmp_path / "reports.db"
+    (tmp_path / "reports").mkdir()
+    for name in ("Ada_Lovelace", "Alan_Turing"):
+        (tmp_path / "reports" / f"{name}.json").write_text("{}")
+    first = _designer(tmp_path, store_path).run([_report("Ada Lovelace", "Data Scientist", ["SQL"], 3),
+                                                 _report("Alan Turing", "AI Engineer", [], 8)],
+                                                incremental=True)
+    packages_dir = tmp_path / "assessments" / "packages"
+    assert len(list(packages_dir.glob("*.json"))) == 2
+    # Ada changes role, Alan's report is gone: both old packages lose their last reference
+    (tmp_path / "reports" / "Alan_Turing.json").unlink()
+    again = _designer(tmp_path, store_path).run([_report("Ada Lovelace", "Backend Developer", ["SQL"], 3)],
+                                                incremental=True)
+    assert sorted(p.name for p in packages_dir.iterdir()) == [f"{again[0]['package_id']}.{ext}"
+                                                             for ext in ("json", "md")]
+    with ReportStore(store_path) as store:
+        assert store.keys("assessment_packages") == [again[0]["package_id"]]
+    assert {a["package_id"] for a in first}.isdisjoint({again[0]["package_id"]})
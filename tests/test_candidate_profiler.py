@@ -0,0 +1,25 @@
+# tests/test_candidate_profiler.py
+from __future__ import annotations
+import json
+
+import pytest
+
+from agents.candidate_profiler import CandidateProfiler
+
+def _profiler(workdir, name, **kw):
+    return CandidateProfiler(out_dir=workdir / name / "reports", manifest_path=workdir / name / "manifest.db", **kw)
+
+def _files(out_dir):
+    return {f.name: f.read_text(encoding="utf-8") for f in out_dir.iterdir() if f.is_file()}
+
+@pytest.mark.parametrize("keyword_only", [False, True])
+def test_sharded_run_matches_serial(workdir, fake_model, keyword_only):
+    serial = _profiler(workdir, "serial", keyword_only=keyword_only).run(batch_size=4)
+    sharded = _profiler(workdir, "sharded", keyword_only=keyword_only).run(batch_size=4, workers=2, chunk_size=3)
+    assert sharded == serial  # ordered: same reports in input order
+    assert _files(workdir / "sharded" / "reports") == _files(workdir / "serial" / "reports")
+
+    unordered = _profiler(workdir, "unordered", keyword_only=keyword_only).run(
+        batch_size=4, workers=3, chunk_size=2, ordered=False)
+    key = lambda rep: json.dumps(rep, sort_keys=True)
+    assert sorted(unordered, key=key) == sorted(serial, key=key)
@@ -0,0 +1,64 @@
+# tests/test_embedding_cache.py
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import utils.nlp_utils as nlp_utils
+from utils.embedding_cache import EmbeddingCache
+
+def _vecs(n: int, start: int = 0) -> np.ndarray:
+    return np.arange(start, start + n * 4, dtype=np.float32).reshape(-1, 4)[:n]
+
+@pytest.fixture
+def counting_model(fake_model, monkeypatch):
+    calls = []
+    encode = fake_model.encode
+    monkeypatch.setattr(fake_model, "encode", lambda texts, **kw: calls.append(list(texts)) or encode(texts, **kw))
+    return calls
+
+def test_default_cache_is_memory_only(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = nlp_utils.configure_embedding_cache()
+    try:
+        assert cache.path is None and cache.stats()["disk_path"] is None
+        cache.put_many(["k"], _vecs(1))
+        assert not (tmp_path / "outputs").exists()
+    finally:
+        nlp_utils.configure_embedding_cache()
+
+def test_memory_lru_evicts_least_recently_used():
+    cache = EmbeddingCache(max_items=2)
+    cache.put_many(["a", "b"], _vecs(2))
+    cache.get_many(["a"])
+    cache.put_many(["c"], _vecs(1))
+    hit = [v is not None for v in cache.get_many(["a", "b", "c"])]
+    assert hit == [True, False, True]
+
+def test_disk_store_survives_and_is_bounded(tmp_path):
+    path = tmp_path / "emb.sqlite"
+    cache = EmbeddingCache(max_items=1, path=path, max_disk_items=10)
+    keys = [f"k{i}" for i in range(12)]
+    cache.put_many(keys, _vecs(12))
+    cache.close()
+
+    reopened = EmbeddingCache(path=path, max_disk_items=10)
+    got = reopened.get_many(keys)
+    kept = [k for k, v in zip(keys, got) if v is not None]
+    assert kept == keys[-len(kept):] and len(kept) <= 10  # oldest-written pruned first
+    np.testing.assert_array_equal(got[-1], _vecs(12)[-1])
+    reopened.clear(disk=True)
+    assert reopened.get_many(keys[-1:]) == [None]
+    reopened.close()
+
+def test_embed_encodes_each_distinct_text_once(counting_model):
+    nlp_utils.configure_embedding_cache()
+    try:
+        first = nlp_utils.embed(["python and sql", "docker", "python  and sql"])
+        again = nlp_utils.embed(["docker", "kubernetes"])
+        assert counting_model == [["python and sql", "docker"], ["kubernetes"]]
+        np.testing.assert_array_equal(first[0], first[2])
+        np.testing.assert_array_equal(first[1], again[0])
+        assert nlp_utils.embedding_cache_stats()["hits"] == 1  # "docker" on the second call
+    finally:
+        nlp_utils.configure_embedding_cache()
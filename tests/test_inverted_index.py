@@ -0,0 +1,79 @@
+# tests/test_inverted_index.py
+from __future__ import annotations
+import json
+import random
+
+import pytest
+
+from utils.inverted_index import SkillInvertedIndex, parse_query
+
+SKILLS = ["Python", "SQL", "Docker", "Java", "PyTorch", "React"]
+
+def _random_forward(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    return {f"cand_{i}": {s: round(rng.random(), 2) for s in rng.sample(SKILLS, 3)} for i in range(n)}
+
+def _brute(forward, clauses, excluded):
+    out = set()
+    for cand, fwd in forward.items():
+        if all(any(fwd.get(s, -1) >= m for s, m in clause) for clause in clauses) \
+                and not any(s in fwd for s in excluded):
+            out.add(cand)
+    return out
+
+def test_parse_query():
+    assert parse_query("PyTorch>=0.7 AND Docker OR Kubernetes AND NOT Java") == (
+        [[("PyTorch", 0.7)], [("Docker", 0.0), ("Kubernetes", 0.0)]], ["Java"])
+    assert parse_query("python >= 0.5") == ([[("python", 0.5)]], [])
+
+@pytest.mark.parametrize("expr", ["Python", "Python>=0.5 AND SQL", "Docker OR Java AND NOT React",
+                                  "PyTorch>=0.9 OR SQL>=0.9 AND NOT Python"])
+def test_query_matches_brute_force(expr):
+    forward = _random_forward(300)
+    index = SkillInvertedIndex.from_rows((c, s, v) for c, fwd in forward.items() for s, v in fwd.items())
+    clauses, excluded = parse_query(expr)
+    assert index.query(clauses, excluded) == _brute(forward, clauses, excluded)
+
+def test_incremental_updates_match_bulk_build():
+    forward = _random_forward(200)
+    index = SkillInvertedIndex()
+    for cand, fwd in _random_forward(200, seed=1).items():  # stale values, then overwritten
+        index.add(cand, fwd.items())
+    for cand, fwd in forward.items():
+        index.add(cand, fwd.items())
+    index.add("gone", [("Python", 1.0)])
+    index.remove("gone")
+    bulk = SkillInvertedIndex.from_rows((c, s, v) for c, fwd in forward.items() for s, v in fwd.items())
+    assert index.postings == bulk.postings
+    assert index.forward == bulk.forward
+    assert all(plist == sorted(plist) for plist in index.postings.values())
+
+def test_top_k_and_threshold():
+    index = SkillInvertedIndex()
+    index.add("a", [("Python", 0.9)])
+    index.add("b", [("Python", 0.5)])
+    index.add("c", [("Python", 0.7), ("Python", 0.2)])  # duplicate skill keeps the best confidence
+    assert index.top_k("Python", 2) == [("a", 0.9), ("c", 0.7)]
+    assert index.candidates_with("Python", 0.7) == ["a", "c"]
+    assert index.search("Python>=0.6", k=5) == [("a", 0.9), ("c", 0.7)]
+
+def test_refresh_save_load(tmp_path):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    rep = {"candidate": {"name": "Ada Lovelace"}, "skills": [["Python", 0.8], ["SQL", 0.4]]}
+    (reports / "Ada_Lovelace.json").write_text(json.dumps(rep))
+    (reports / "list.json").write_text("[1, 2]")           # valid JSON, not a report
+    (reports / "broken.json").write_text("{")
+    (reports / "bad_skills.json").write_text(json.dumps({"skills": [3]}))
+    path = tmp_path / "skill_index.json"
+    index = SkillInvertedIndex.load_or_build(reports, path)
+    assert index.forward == {"Ada_Lovelace": {"Python": 0.8, "SQL": 0.4}}
+    assert SkillInvertedIndex.load(path).postings == index.postings
+
+    (reports / "Ada_Lovelace.json").unlink()
+    (reports / "Alan_Turing.json").write_text(json.dumps(
+        {"candidate": {"name": "Alan Turing"}, "skills": [["Java", 0.6]]}))
+    stats = index.refresh(reports)
+    assert stats == {"updated": 1, "removed": 1}
+    assert index.candidates_with("Java") == ["Alan_Turing"]
+    assert "Python" not in index.postings
@@ -0,0 +1,97 @@
+# tests/test_jobs.py
+from __future__ import annotations
+import json
+import zipfile
+
+import pytest
+
+import utils.jobs as jobs
+from utils.jobs import JobContext, JobQueue, run_worker
+from utils.report_store import ReportStore
+
+def _run_all(db) -> None:
+    run_worker(db, poll=0.01, idle_exit=0)  # in-process: returns once the queue is empty
+
+def test_regenerate_outputs_with_store(workdir, fake_model):
+    db = workdir / "outputs" / "jobs.db"
+    (workdir / "outputs").mkdir()
+    store = workdir / "outputs" / "reports.db"
+    with JobQueue(db) as queue:
+        # what the dashboard submits once a store exists (app.jobs_panel._pipeline_params)
+        first = queue.submit("regenerate_outputs", {"incremental": True, "store_path": str(store)})
+        second = queue.submit("regenerate_outputs", {"incremental": True, "store_path": str(store)})
+    _run_all(db)
+    with JobQueue(db) as queue:
+        job = queue.get(first)
+        assert job["status"] == "done", job["error"]
+        assert job["message"] == "Pipeline finished"
+        assert job["result"]["AssessmentDesigner"] == job["result"]["CandidateProfiler"] > 0
+        assert queue.get(second)["status"] == "done"
+        assert queue.get(second)["result"]["CandidateProfiler"] == 0  # nothing changed
+    with ReportStore(store) as s:
+        assert s.count("assessments") == job["result"]["CandidateProfiler"]
+
+def test_profile_import_final_message(workdir):
+    db = workdir / "jobs.db"
+    with JobQueue(db) as queue:
+        job_id = queue.submit("profile_import", {"keyword_only": True})
+    _run_all(db)
+    with JobQueue(db) as queue:
+        job = queue.get(job_id)
+    assert job["status"] == "done", job["error"]
+    n = job["result"]["profiled"]
+    assert (job["done"], job["total"]) == (n, n)
+    assert job["message"] == f"Profiled {n} candidates"
+
+def test_cancel_queued_job(tmp_path):
+    with JobQueue(tmp_path / "jobs.db") as queue:
+        job_id = queue.submit("export_pdfs", {})
+        assert queue.cancel(job_id)
+        assert queue.get(job_id)["status"] == "cancelled"
+        assert queue.claim(1) is None
+
+def _write_reports(reports_dir, n):
+    reports_dir.mkdir(parents=True)
+    for i in range(n):
+        report = {"candidate": {"name": f"Candidate {i}", "role": "Data Scientist", "experience_years": i},
+                  "skills": [["Python", 0.8]], "career_summary": f"Summary {i}."}
+        (reports_dir / f"Candidate_{i}.json").write_text(json.dumps(report), encoding="utf-8")
+
+def test_pool_context_never_forks():
+    assert jobs._pool_context().get_start_method() in ("forkserver", "spawn")
+
+def test_zip_export_from_worker_pool(tmp_path):
+    pytest.importorskip("reportlab")
+    _write_reports(tmp_path / "reports", 3)
+    target = tmp_path / "shortlist.zip"
+    with JobQueue(tmp_path / "jobs.db") as queue:
+        job_id = queue.submit("export_pdfs", {"reports_dir": str(tmp_path / "reports"), "format": "zip",
+                                              "target": str(target), "workers": 2})
+    _run_all(tmp_path / "jobs.db")
+    with JobQueue(tmp_path / "jobs.db") as queue:
+        job = queue.get(job_id)
+    assert job["status"] == "done", job["error"]
+    with zipfile.ZipFile(target) as zf:
+        assert len(zf.namelist()) == 3
+
+@pytest.mark.parametrize("fmt", ["zip", "combined"])
+def test_export_cancelled_mid_run(tmp_path, monkeypatch, fmt):
+    pytest.importorskip("reportlab")
+    import utils.pdf_generator as pdf_generator
+
+    rendered = []
+    render = pdf_generator._report_flowables
+    monkeypatch.setattr(pdf_generator, "_report_flowables", lambda r: rendered.append(r) or render(r))
+    monkeypatch.setattr(JobContext.__init__, "__defaults__", (0.0,))  # no progress throttling
+    progress = JobQueue.progress
+    monkeypatch.setattr(JobQueue, "progress", lambda self, job_id, done, *a: progress(self, job_id, done, *a)
+                        or done >= 2)  # cancel requested once two reports are through
+    _write_reports(tmp_path / "reports", 6)
+    with JobQueue(tmp_path / "jobs.db") as queue:
+        job_id = queue.submit("export_pdfs", {"reports_dir": str(tmp_path / "reports"), "format": fmt,
+                                              "target": str(tmp_path / f"out.{fmt}"), "workers": 1,
+                                              "chunk_size": 2})
+    _run_all(tmp_path / "jobs.db")
+    with JobQueue(tmp_path / "jobs.db") as queue:
+        assert queue.get(job_id)["status"] == "cancelled"
+    assert len(rendered) < 6
@@ -0,0 +1,79 @@
+# tests/test_manifest.py
+from __future__ import annotations
+import json
+
+from agents.candidate_profiler import CandidateProfiler
+from utils.manifest import Manifest, record_hash
+
+def test_record_hash_ignores_key_order():
+    assert record_hash({"a": 1, "b": [1, 2]}) == record_hash({"b": [1, 2], "a": 1})
+    assert record_hash({"a": 1}) != record_hash({"a": 2})
+
+def test_freshness(tmp_path):
+    out = tmp_path / "Ada.json"
+    out.write_text("{}")
+    with Manifest(tmp_path / "m.db") as m:
+        assert not m.is_fresh("Agent", "Ada", "h1", "1")
+        m.record("Agent", "Ada", "h1", "1", [out])
+        assert m.is_fresh("Agent", "Ada", "h1", "1")
+        assert not m.is_fresh("Agent", "Ada", "h2", "1")   # input changed
+        assert not m.is_fresh("Agent", "Ada", "h1", "2")   # agent version changed
+        assert not m.is_fresh("Other", "Ada", "h1", "1")   # entries are per agent
+    with Manifest(tmp_path / "m.db") as m:                 # recorded rows persist
+        assert m.is_fresh("Agent", "Ada", "h1", "1")
+        out.unlink()
+        assert not m.is_fresh("Agent", "Ada", "h1", "1")   # output file deleted
+
+def test_prune_deletes_outputs_and_rows(tmp_path):
+    files = {k: tmp_path / f"{k}.json" for k in ("a", "b", "c")}
+    for f in files.values():
+        f.write_text("{}")
+    with Manifest(tmp_path / "m.db") as m:
+        for k, f in files.items():
+            m.record("Agent", k, "h", "1", [f])
+        m.flush()
+        m.record("Other", "b", "h", "1", [])
+        m.record("Agent", "d", "h", "1", [])               # pending, pruned before flush
+        assert sorted(m.prune("Agent", ["a"])) == ["b", "c", "d"]
+    assert [f.exists() for f in files.values()] == [True, False, False]
+    with Manifest(tmp_path / "m.db") as m:
+        assert set(m.entries("Agent")) == {"a"}
+        assert set(m.entries("Other")) == {"b"}
+
+def test_incremental_profiler_run(workdir):
+    profiler = CandidateProfiler(keyword_only=True)
+    total = len(profiler.run(incremental=True))
+    assert total > 2 and profiler.run(incremental=True) == []
+
+    path = workdir / "data" / "candidates.json"
+    candidates = json.loads(path.read_text())
+    candidates[0]["experience_years"] = 99
+    removed = candidates.pop()["name"].replace(" ", "_")
+    path.write_text(json.dumps(candidates))
+    rebuilt = profiler.run(incremental=True)
+    assert [r["candidate"]["name"] for r in rebuilt] == [candidates[0]["name"]]
+    assert not (workdir / "outputs" / "reports" / f"{removed}.json").exists()
+    assert not (workdir / "outputs" / "reports" / f"{removed}.md").exists()
+    assert len(list((workdir / "outputs" / "reports").glob("*.json"))) == total - 1
+
+def test_exception_drops_pending_records(tmp_path):
+    out = tmp_path / "Ada.json"
+    out.write_text("{}")
+    with Manifest(tmp_path / "m.db") as m:
+        m.record("Agent", "Ada", "h1", "1", [out])
+    try:
+        with Manifest(tmp_path / "m.db") as m:
+            m.record("Agent", "Ada", "h2", "1", [out])
+            raise RuntimeError("agent failed")
+    except RuntimeError:
+        pass
+    with Manifest(tmp_path / "m.db") as m:
+        assert m.is_fresh("Agent", "Ada", "h1", "1")       # flushed rows survive
+        assert not m.is_fresh("Agent", "Ada", "h2", "1")   # pending ones were dropped
+
+def test_stopping_iteration_early_keeps_records(workdir):
+    profiler = CandidateProfiler(keyword_only=True)
+    for _ in profiler.iter_run(incremental=True):
+        break
+    with Manifest(profiler.manifest_path) as m:
+        assert len(m.entries("CandidateProfiler")) >= 1
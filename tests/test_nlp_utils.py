@@ -0,0 +1,78 @@
+# tests/test_nlp_utils.py
+from __future__ import annotations
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import utils.nlp_utils as nlp_utils
+from agents.candidate_profiler import CandidateProfiler
+from tests.conftest import REPO_ROOT
+from utils.nlp_utils import SkillIndex, extract_skills, extract_skills_batch, get_skill_index
+
+TEXTS = [
+    "Senior engineer: python, pandas and postgres; shipped docker images to k8s.",
+    "Kubernetes",
+    "Built Computer Vision pipelines with opencv.",
+    "Spark ETL jobs orchestrated in airflow.",
+    "Enjoys hiking.",
+    "",
+    "Data Engineering NLP React",
+]
+
+@pytest.fixture
+def skill_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(nlp_utils, "SKILL_INDEX_DIR", tmp_path / "cache")
+    return tmp_path / "cache"
+
+@pytest.mark.parametrize("keyword_only", [False, True])
+def test_batch_matches_per_text(fake_model, skill_cache, keyword_only):
+    batch = extract_skills_batch(TEXTS, keyword_only=keyword_only)
+    assert batch == [extract_skills(t, keyword_only=keyword_only) for t in TEXTS]
+    if not keyword_only:
+        # the back-off contributed something the keyword scan alone would not find
+        assert batch != extract_skills_batch(TEXTS, keyword_only=True)
+    assert extract_skills_batch([]) == []
+
+def test_skill_index_reloads_from_disk_and_rebuilds_on_ontology_change(fake_model, skill_cache, monkeypatch):
+    builds = []
+    build = SkillIndex.build.__func__
+    monkeypatch.setattr(SkillIndex, "build", classmethod(lambda cls, *a: builds.append(a) or build(cls, *a)))
+    built = get_skill_index()
+    assert len(builds) == 1
+    saved = list(skill_cache.glob("skill_index_*.npy"))
+    assert len(saved) == 1
+
+    nlp_utils._SKILL_INDEX.clear()  # as in a fresh process
+    loaded = get_skill_index()
+    assert len(builds) == 1  # read back, not rebuilt
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.skills == built.skills
+    np.testing.assert_array_equal(loaded.offsets, built.offsets)
+    np.testing.assert_array_equal(loaded.vectors, built.vectors)
+    text_vecs = nlp_utils.embed(["python and sql", "kubernetes"])
+    np.testing.assert_allclose(loaded.similarities(text_vecs), built.similarities(text_vecs))
+    assert get_skill_index() is loaded  # memoized per ontology
+
+    monkeypatch.setitem(nlp_utils.SKILL_ONTOLOGY, "Rust", ["rust", "cargo"])
+    extended = get_skill_index()
+    assert len(builds) == 2 and extended.skills[-1] == "Rust"
+    assert len(list(skill_cache.glob("skill_index_*.npy"))) == 2
+    assert SkillIndex.load(saved[0]).skills == built.skills  # the old index is left intact
+
+def test_importing_agents_does_not_load_the_model():
+    code = ("import sys; import agents.candidate_profiler, agents.assessment_designer, "
+            "agents.behavioral_analyzer, agents.market_intelligence, app.main, utils.nlp_utils as n; "
+            "assert n._EMB is None and n._NLP is None; "
+            "assert not {'sentence_transformers', 'torch', 'spacy'} & set(sys.modules), sorted(sys.modules)")
+    subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, check=True)
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_keyword_only_profiling_never_loads_the_model(workdir, monkeypatch, workers):
+    def no_model():
+        raise AssertionError("keyword_only loaded the embedding model")
+    monkeypatch.setattr(nlp_utils, "get_model", no_model)  # forked workers inherit the patch
+    reports = CandidateProfiler(keyword_only=True).run(batch_size=4, workers=workers, chunk_size=3)
+    assert reports and all(conf == 0.8 for rep in reports for _, conf in rep["skills"])
+    assert nlp_utils._EMB is None
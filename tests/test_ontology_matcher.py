@@ -0,0 +1,41 @@
+# tests/test_ontology_matcher.py
+from __future__ import annotations
+import random
+import re
+
+import pytest
+
+from utils.nlp_utils import SKILL_ONTOLOGY, _OntologyMatcher
+
+# Overlapping terms on top of the real ontology: shared prefixes, a term
+# nested in another and one term owned by two skills.
+OVERLAPPING = dict(SKILL_ONTOLOGY, **{
+    "Machine Learning": ["machine learning", "ml"],
+    "Hardware": ["machine", "gpu"],
+    "React Native": ["react native"],
+    "Deep Learning": ["deep learning", "learning"],
+    "Containers": ["container", "docker"],
+})
+
+def baseline_skills(ontology, text_l):
+    """The original per-term scan: one regex search per label/synonym."""
+    return [skill for skill, synonyms in ontology.items()
+            if any(re.search(rf"\b{re.escape(syn.lower())}\b", text_l) for syn in synonyms + [skill])]
+
+def test_overlapping_terms_all_match():
+    matcher = _OntologyMatcher(OVERLAPPING)
+    assert matcher.skills_in("applied machine learning at scale") == \
+        ["Machine Learning", "Hardware", "Deep Learning"]
+    assert matcher.skills_in("react native apps") == ["React", "React Native"]
+    assert matcher.skills_in("reactjs apps") == ["React"]
+    assert matcher.skills_in("ran docker containers") == ["Docker", "Containers"]
+
+@pytest.mark.parametrize("ontology", [SKILL_ONTOLOGY, OVERLAPPING])
+def test_matches_per_term_search(ontology):
+    matcher = _OntologyMatcher(ontology)
+    vocab = [t for syns in ontology.values() for t in syns] + list(ontology) + \
+        ["with", "and", "machinery", "c", "learning,", "(ml)", "react-native", "k8s."]
+    rng = random.Random(0)
+    for _ in range(300):
+        text_l = " ".join(rng.choice(vocab) for _ in range(rng.randint(1, 8))).lower()
+        assert matcher.skills_in(text_l) == baseline_skills(ontology, text_l), text_l
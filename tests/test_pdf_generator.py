@@ -0,0 +1,52 @@
+# tests/test_pdf_generator.py
+from __future__ import annotations
+import io
+import re
+import zipfile
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+import utils.pdf_generator as pdf_generator
+from utils.pdf_generator import (bulk_report_pdfs, candidate_report_pdf_bytes, combined_report_pdf,
+                                 pdf_filename, zip_report_pdfs)
+
+def _report(i: int):
+    return {"candidate": {"name": f"Candidate {i}", "role": "Data Scientist", "experience_years": i},
+            "skills": [["Python", 0.8], ["SQL", 0.5]], "career_summary": f"Summary {i}.",
+            "highlights": [f"Highlight {i}."]}
+
+def _pages(data: bytes) -> int:
+    return len(re.findall(rb"/Type /Page\b", data))
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_bulk_files_and_zip(tmp_path, workers):
+    reports = [_report(i) for i in range(5)]
+    paths = list(bulk_report_pdfs(reports, tmp_path / "pdfs", workers=workers, chunk_size=2))
+    assert [p.rsplit("/", 1)[-1] for p in paths] == [pdf_filename(r) for r in reports]
+    assert all(open(p, "rb").read(5) == b"%PDF-" for p in paths)
+
+    buf = io.BytesIO()
+    assert zip_report_pdfs(reports, buf, workers=workers, chunk_size=2) == 5
+    with zipfile.ZipFile(buf) as zf:
+        assert zf.namelist() == [pdf_filename(r) for r in reports]
+
+def test_combined_pdf_has_a_page_per_candidate(tmp_path):
+    reports = [_report(i) for i in range(3)]
+    path = combined_report_pdf(reports, tmp_path / "shortlist.pdf")
+    assert _pages(path.read_bytes()) == 1 + 3   # title/contents page, then one per candidate
+    buf = io.BytesIO()
+    combined_report_pdf(reports, buf, toc=False)
+    assert buf.getvalue().startswith(b"%PDF-")
+
+def test_pdf_bytes_are_memoized(monkeypatch):
+    monkeypatch.setattr(pdf_generator, "_PDF_CACHE_MAX", 2)
+    pdf_generator._PDF_CACHE.clear()
+    first = candidate_report_pdf_bytes(_report(1))
+    assert first.startswith(b"%PDF-")
+    assert candidate_report_pdf_bytes({**_report(1), "_source_file": "x.json"}) is first
+    candidate_report_pdf_bytes(_report(2))
+    candidate_report_pdf_bytes(_report(3))
+    assert len(pdf_generator._PDF_CACHE) == 2
+    assert candidate_report_pdf_bytes(_report(1)) is not first   # evicted, rendered again
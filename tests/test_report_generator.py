@@ -0,0 +1,24 @@
+# tests/test_report_generator.py
+from __future__ import annotations
+import json
+
+import pytest
+
+from utils.report_generator import ReportWriter
+
+def test_writer_recreates_relative_dirs_after_chdir(tmp_path, monkeypatch):
+    report = {"role": "AI Engineer", "avg_salary": 1, "demand_index": 2, "recommendations": []}
+    for sub in ("a", "b"):
+        (tmp_path / sub).mkdir()
+        monkeypatch.chdir(tmp_path / sub)
+        with ReportWriter() as writer:
+            writer.save_json(report, "outputs/market", "AI_Engineer_market.json")
+        assert json.loads((tmp_path / sub / "outputs/market/AI_Engineer_market.json").read_text()) == report
+
+def test_writer_reraises_write_errors(tmp_path):
+    (tmp_path / "x.json").mkdir()  # rename target is a directory: the background write fails
+    writer = ReportWriter()
+    writer.save_json({}, tmp_path, "x.json")
+    with pytest.raises(OSError):
+        writer.flush()
+    writer.close()
@@ -0,0 +1,39 @@
+# tests/test_report_store.py
+from __future__ import annotations
+import json
+
+from app.main import run_pipeline
+from utils.report_store import ReportStore
+
+def test_pipeline_with_store_does_not_deadlock(workdir, fake_model):
+    # profiler and designer write through separate connections in one thread
+    timings = run_pipeline(workers=0, store_path="outputs/reports.db")
+    n_candidates = len(json.loads((workdir / "data" / "candidates.json").read_text()))
+    assert timings["CandidateProfiler"]["count"] == n_candidates
+    assert timings["AssessmentDesigner"]["count"] == n_candidates
+    with ReportStore(workdir / "outputs" / "reports.db") as store:
+        assert store.count("candidates") == n_candidates
+        assert store.count("assessments") == n_candidates
+        key = store.keys("assessments")[0]
+        assert store.get("assessments", key)["challenges"]  # reference expanded from its package
+
+def test_incremental_pipeline_with_store(workdir, fake_model):
+    run_pipeline(workers=0, store_path="outputs/reports.db", incremental=True)
+    again = run_pipeline(workers=0, store_path="outputs/reports.db", incremental=True)
+    assert again["CandidateProfiler"]["count"] == 0
+    assert again["AssessmentDesigner"]["count"] == 0
+
+def test_reader_sees_rows_while_writer_streams(tmp_path):
+    path = tmp_path / "reports.db"
+    writer = ReportStore(path)
+    reader = ReportStore(path)
+    report = {"candidate": {"name": "Ada Lovelace", "role": "AI Engineer", "experience_years": 3},
+              "skills": [["Python", 0.9]], "career_summary": "x"}
+    writer.put_candidate(report)
+    assert reader.count("candidates") == 0  # batched, not committed yet
+    writer.commit()
+    assert reader.get("candidates", "Ada_Lovelace")["candidate"]["name"] == "Ada Lovelace"
+    reader.put_market({"role": "AI Engineer", "avg_salary": 1, "demand_index": 2})
+    reader.commit()  # the reader can write once the writer committed
+    writer.close()
+    reader.close()
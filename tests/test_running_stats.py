@@ -0,0 +1,111 @@
+# tests/test_running_stats.py
+from __future__ import annotations
+import json
+
+import numpy as np
+import pytest
+
+from agents.market_intelligence import MarketIntelligence
+from utils.running_stats import FixedHistogram, RoleMarketStats, RunningStats, aggregate_market
+
+def _stats(xs) -> RunningStats:
+    s = RunningStats()
+    for x in xs:
+        s.add(float(x))
+    return s
+
+def test_running_stats_match_numpy():
+    xs = np.random.default_rng(0).normal(1e6, 5.0, 1000)   # large offset: naive sum of squares loses precision
+    s = _stats(xs)
+    assert s.count == 1000
+    assert s.mean == pytest.approx(xs.mean(), rel=1e-12)
+    assert s.variance == pytest.approx(xs.var(ddof=1), rel=1e-9)
+    assert (s.min, s.max) == (xs.min(), xs.max())
+    assert RunningStats().variance == 0.0 and _stats([3.0]).std == 0.0
+
+def test_merge_equals_single_pass():
+    xs = np.random.default_rng(1).exponential(100.0, 999)
+    shards = [xs[:1], xs[1:400], xs[400:400], xs[400:]]
+    merged = RunningStats()
+    for shard in shards:
+        merged.merge(_stats(shard))
+    whole = _stats(xs)
+    assert merged.count == whole.count
+    assert merged.mean == pytest.approx(whole.mean, rel=1e-12)
+    assert merged.variance == pytest.approx(whole.variance, rel=1e-9)
+    assert (merged.min, merged.max) == (whole.min, whole.max)
+
+def test_histogram_quantiles():
+    small = FixedHistogram(0, 100, bins=10, exact=64)
+    for x in [5, 1, 9, 3, 7]:
+        small.add(x)
+    assert small.quantiles([0, 0.25, 0.5, 0.9, 1]) == list(np.percentile([5, 1, 9, 3, 7], [0, 25, 50, 90, 100]))
+    assert FixedHistogram(0, 1).quantile(0.5) is None
+
+    xs = np.random.default_rng(2).uniform(20_000, 180_000, 5000)
+    hist = FixedHistogram(0, 200_000, bins=200)
+    for x in xs:
+        hist.add(x)
+    for q in (0.1, 0.5, 0.9):
+        assert abs(hist.quantile(q) - np.quantile(xs, q)) <= hist.width
+    assert hist.quantile(0) >= xs.min() and hist.quantile(1) <= xs.max()
+
+def test_histogram_merge():
+    xs = np.random.default_rng(3).uniform(0, 10, 300)
+    a, b, whole = FixedHistogram(0, 10, 50), FixedHistogram(0, 10, 50), FixedHistogram(0, 10, 50)
+    for x in xs[:100]:
+        a.add(x)
+    for x in xs[100:]:
+        b.add(x)
+    for x in xs:
+        whole.add(x)
+    a.merge(b)
+    assert a.counts == whole.counts and a.quantiles([0.25, 0.75]) == whole.quantiles([0.25, 0.75])
+
+    few = FixedHistogram(0, 10, 50)
+    few.add(1.0)
+    other = FixedHistogram(0, 10, 50)
+    other.add(3.0)
+    assert few.merge(other).quantile(0.5) == 2.0          # still exact after merging small samples
+    with pytest.raises(ValueError):
+        few.merge(FixedHistogram(0, 10, 25))
+    with pytest.raises(ValueError):
+        FixedHistogram(5, 5)
+
+ENTRIES = [
+    {"role": "Data Scientist", "avg_salary": 100_000, "demand_index": 8, "top_sources": ["LinkedIn", "Kaggle"]},
+    {"role": "Backend Developer", "avg_salary": 60_000, "demand_index": 3, "top_sources": ["GitHub"]},
+    {"role": "Data Scientist", "avg_salary": 140_000, "demand_index": 6, "top_sources": ["LinkedIn"]},
+    {"role": "Data Scientist", "avg_salary": 120_000, "demand_index": 7, "top_sources": ["Referrals"]},
+]
+
+def test_aggregate_market_and_merge():
+    roles = aggregate_market(ENTRIES)
+    assert list(roles) == ["Data Scientist", "Backend Developer"]
+    ds = roles["Data Scientist"].summary()
+    assert ds["postings"] == 3 and ds["avg_salary"] == 120_000 and ds["demand_index"] == 7.0
+    assert ds["salary_percentiles"]["p50"] == 120_000
+    assert (ds["salary_min"], ds["salary_max"]) == (100_000, 140_000)
+    assert ds["top_sources"][0] == "LinkedIn"
+
+    left, right = RoleMarketStats("Data Scientist"), RoleMarketStats("Data Scientist")
+    left.add(ENTRIES[0])
+    for e in ENTRIES[2:]:
+        right.add(e)
+    assert left.merge(right).summary() == ds
+
+def test_market_intelligence_one_report_per_role(tmp_path):
+    feed = tmp_path / "market.jsonl"
+    feed.write_text("\n".join(json.dumps(e) for e in ENTRIES), encoding="utf-8")
+    agent = MarketIntelligence(data_path=feed, out_dir=tmp_path / "market",
+                               manifest_path=tmp_path / "manifest.db")
+    reports = {r["role"]: r for r in agent.run(incremental=True)}
+    assert set(reports) == {"Data Scientist", "Backend Developer"}
+    assert reports["Data Scientist"]["postings"] == 3
+    assert any("Offer band" in r for r in reports["Data Scientist"]["recommendations"])
+    assert sorted(p.name for p in (tmp_path / "market").glob("*.json")) == \
+        ["Backend_Developer_market.json", "Data_Scientist_market.json"]
+    assert agent.run(incremental=True) == []
+
+    feed.write_text("\n".join(json.dumps(e) for e in ENTRIES[:2]), encoding="utf-8")
+    assert [r["role"] for r in agent.run(incremental=True)] == ["Data Scientist"]
@@ -0,0 +1,76 @@
+# tests/test_streaming.py
+from __future__ import annotations
+import json
+
+import pytest
+
+import utils.streaming as streaming
+from utils.streaming import batched, iter_records
+
+VALUES = [1.5, -2e+3, 12345678, 0.25e-2, True, None, 'a, "quoted" ]', {"name": "Ada", "skills": ["x"]},
+          [1, [2.75]], {}, [], 1e10, -0.0]
+
+@pytest.mark.parametrize("chunk", [1, 2, 3, 5, 7, 64])
+def test_json_array_with_tiny_chunks(tmp_path, monkeypatch, chunk):
+    monkeypatch.setattr(streaming, "_CHUNK", chunk)
+    path = tmp_path / "records.json"
+    for text in (json.dumps(VALUES), json.dumps(VALUES, indent=2), json.dumps(VALUES, separators=(",", ":"))):
+        path.write_text(text, encoding="utf-8")
+        assert list(iter_records(path)) == VALUES
+
+@pytest.mark.parametrize("chunk", [1, 2, 3])
+def test_number_split_at_every_offset(tmp_path, monkeypatch, chunk):
+    # every split position of every number, with and without surrounding spaces
+    monkeypatch.setattr(streaming, "_CHUNK", chunk)
+    path = tmp_path / "numbers.json"
+    for text in ("[1.5,2e+3,-7.25E-1,10]", "[ 1.5 , 2e+3 , -7.25E-1 , 10 ]", "[123.456]"):
+        path.write_text(text, encoding="utf-8")
+        assert list(iter_records(path)) == json.loads(text)
+
+@pytest.mark.parametrize("chunk", [1, 4, 64])
+def test_jsonl(tmp_path, monkeypatch, chunk):
+    monkeypatch.setattr(streaming, "_CHUNK", chunk)
+    path = tmp_path / "records.jsonl"
+    path.write_text("\n".join(json.dumps(v) for v in VALUES) + "\n\n" + json.dumps(2.5), encoding="utf-8")
+    assert list(iter_records(path)) == VALUES + [2.5]
+
+@pytest.mark.parametrize("text, message", [
+    ('{"a": 1}', "expected a top-level JSON array"),
+    ("[1, 2", "unterminated JSON array"),
+    ('[1, {"a": }]', "invalid JSON"),
+    ("[1.]", "invalid JSON"),
+])
+def test_invalid_array(tmp_path, monkeypatch, text, message):
+    monkeypatch.setattr(streaming, "_CHUNK", 2)
+    path = tmp_path / "bad.json"
+    path.write_text(text, encoding="utf-8")
+    with pytest.raises(ValueError, match=message):
+        list(iter_records(path))
+
+@pytest.mark.parametrize("chunk", [1, 2, 64])
+@pytest.mark.parametrize("text, message, char", [
+    ("[1 2]", "expected ',' or ']'", 3),
+    ("[1,,2]", "expected a value", 3),
+    ("[,1]", "expected a value", 1),
+    ("[1,]", "expected a value", 3),
+    ("[1,\n  2,\n  ]", "expected a value", 11),
+    ('[{"a": 1} {"b": 2}]', "expected ',' or ']'", 10),
+])
+def test_separators_are_strict(tmp_path, monkeypatch, chunk, text, message, char):
+    monkeypatch.setattr(streaming, "_CHUNK", chunk)
+    path = tmp_path / "bad.json"
+    path.write_text(text, encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError, match=message) as e:
+        list(iter_records(path))
+    assert e.value.pos == char
+    assert (e.value.lineno, e.value.colno) == (text.count("\n", 0, char) + 1, char - text.rfind("\n", 0, char))
+
+def test_invalid_jsonl_reports_line(tmp_path):
+    path = tmp_path / "bad.jsonl"
+    path.write_text('{"a": 1}\n{"a": \n', encoding="utf-8")
+    with pytest.raises(ValueError, match=r"bad.jsonl:2: invalid JSON line"):
+        list(iter_records(path))
+
+def test_batched():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched([], 3)) == []
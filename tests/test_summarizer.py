@@ -0,0 +1,65 @@
+# tests/test_summarizer.py
+from __future__ import annotations
+import random
+import re
+
+import numpy as np
+import pytest
+
+from utils.nlp_utils import clean_text, embed, summarize_text
+from utils.summarizer import centrality_scores, split_sentences, summarize, summarize_batch
+
+WORDS = "data model python team pipeline deploy analysis results users scale the a of and".split()
+
+def baseline_summarize(text, max_sentences=3):
+    """The original nlp_utils.summarize_text."""
+    text = clean_text(text)
+    sents = re.split(r"(?<=[.!?])\s+", text)
+    sents = [s.strip() for s in sents if 20 <= len(s) <= 220]
+    if not sents:
+        return text[:240]
+    scores = []
+    for s in sents:
+        tokens = set(re.findall(r"\b\w+\b", s.lower()))
+        scores.append((len(tokens) + len(s) * 0.01, s))
+    scores.sort(reverse=True)
+    return " ".join(s for _, s in scores[:max_sentences])
+
+def _texts(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    texts = ["", "Too short.", "x" * 300, "No terminal punctuation but long enough to count as one"]
+    for _ in range(n):
+        sents = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 40))).capitalize() + rng.choice(".!?")
+                 for _ in range(rng.randint(1, 8))]
+        sents += rng.sample(sents, min(2, len(sents)))  # duplicates: ties broken like the sort
+        texts.append(rng.choice([" ", "\n", "  \n "]).join(sents))
+    return texts
+
+@pytest.mark.parametrize("k", [1, 2, 3, 5])
+def test_lexical_matches_original(k):
+    texts = _texts(200)
+    expected = [baseline_summarize(t, k) for t in texts]
+    assert [summarize(t, k) for t in texts] == expected
+    assert summarize_batch(texts, k) == expected
+    assert [summarize_text(t, k) for t in texts[:20]] == expected[:20]
+    assert summarize_batch([clean_text(t) for t in texts], k, clean=False) == expected
+
+def test_centrality_scores():
+    assert centrality_scores(np.zeros((2, 4), dtype=np.float32)).tolist() == [1.0, 1.0]
+    v = np.eye(4, dtype=np.float32)[[0, 0, 0, 1]] + np.eye(4, dtype=np.float32)[[1, 2, 3, 3]] * 0.1
+    v /= np.linalg.norm(v, axis=1, keepdims=True)
+    rank = centrality_scores(v)
+    assert rank.sum() == pytest.approx(1.0, abs=1e-5)
+    assert rank.argmin() == 3  # the outlier sentence is least central
+
+def test_centrality_batch_equals_single(fake_model):
+    texts = _texts(30, seed=1)
+    single = [summarize(t, 2, method="centrality") for t in texts]
+    assert summarize_batch(texts, 2, method="centrality") == single
+    text = texts[-1]
+    vectors = embed(split_sentences(clean_text(text)))
+    assert summarize(text, 2, method="centrality", vectors=vectors) == single[-1]
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        summarize("A sentence that is long enough to be kept.", method="abstractive")
@@ -0,0 +1,92 @@
+# tests/test_themes.py
+from __future__ import annotations
+import sys
+
+import numpy as np
+import pytest
+
+from agents.behavioral_analyzer import THEME_KEYWORDS, BehavioralAnalyzer
+from utils.nlp_utils import embed
+from utils.themes import THEME_PROTOTYPES, EmbeddingThemeClassifier, ThemeScorer, tokenize
+
+CONVERSATIONS = [
+    ["I love working with my team and teams of teams.", "We collaborated to fix the problem."],
+    ["I felt helpless, but the helpers helped.", "Talking and presenting: I explained it."],
+    [],
+    ["Nothing relevant here.", "Communication and communicating are key; communicate!"],
+]
+
+def baseline_themes(conversation):
+    """The original substring scan of BehavioralAnalyzer._extract_themes: 1 per keyword found."""
+    text = " ".join(conversation).lower()
+    return {theme: sum(1 for k in kws if k in text) for theme, kws in THEME_KEYWORDS.items()}
+
+def test_scorer_counts_whole_words():
+    scorer = ThemeScorer(THEME_KEYWORDS)
+    assert scorer.score(CONVERSATIONS[0]) == {"Collaboration": 1, "Problem-Solving": 2, "Communication": 0}
+    # "helpless", "helpers", "helped", "presenting" are other words than the keywords
+    assert scorer.score(CONVERSATIONS[1]) == dict.fromkeys(THEME_KEYWORDS, 0)
+    assert scorer.score(["Presentation skills: I present, then I present again."])["Communication"] == 2
+    assert scorer.score(CONVERSATIONS[3])["Communication"] == 1
+    assert scorer.score([]) == dict.fromkeys(THEME_KEYWORDS, 0)
+
+def test_scorer_matches_baseline_on_whole_words():
+    # every keyword as a whole word at most once: occurrences == the baseline's keyword hits
+    scorer = ThemeScorer(THEME_KEYWORDS)
+    keywords = [k for kws in THEME_KEYWORDS.values() for k in kws]
+    conversations = [[" ".join(keywords[i::n]) + "."] for n in (1, 2, 3, 5) for i in range(n)]
+    conversations += [["We solve a problem together, then talk and share."], ["Nothing here."], []]
+    for conv in conversations:
+        assert scorer.score(conv) == baseline_themes(conv)
+    # in general: the baseline's scan, per keyword, over whole tokens instead of substrings
+    for conv in CONVERSATIONS:
+        tokens = tokenize(" ".join(conv))
+        assert scorer.score(conv) == {theme: sum(tokens.count(k) for k in kws)
+                                      for theme, kws in THEME_KEYWORDS.items()}
+
+def test_keyword_in_two_themes():
+    scorer = ThemeScorer({"A": ["share", "team"], "B": ["Share"]})
+    assert scorer.score(["Share and share alike", "sharing"]) == {"A": 2, "B": 2}
+
+@pytest.mark.parametrize("scipy", [True, False])
+def test_score_batch_matches_score(monkeypatch, scipy):
+    if not scipy:
+        monkeypatch.setitem(sys.modules, "scipy", None)  # import fails → dense fallback
+    scorer = ThemeScorer(THEME_KEYWORDS)
+    matrix = scorer.score_batch(CONVERSATIONS)
+    dense = matrix.toarray() if hasattr(matrix, "toarray") else matrix
+    assert dense.shape == (4, 3) and hasattr(matrix, "toarray") == scipy
+    np.testing.assert_array_equal(dense, [scorer.counts(c) for c in CONVERSATIONS])
+
+def test_behavioral_analyzer_keyword_run(workdir):
+    analyzer = BehavioralAnalyzer()
+    reports = analyzer.run(incremental=True)
+    assert reports and all(set(r["themes"]) == set(THEME_KEYWORDS) for r in reports)
+    assert analyzer.run(incremental=True) == []
+
+def _reference_counts(clf, conversation):
+    """Per utterance: embed it alone and compare with each prototype."""
+    protos = clf.prototype_vectors()
+    return [sum(float(embed([u])[0] @ protos[t]) >= clf.threshold for u in conversation)
+            for t in range(len(clf.themes))]
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_embedding_classifier_matches_per_utterance(fake_model, chunk_size):
+    clf = EmbeddingThemeClassifier(threshold=0.3, chunk_size=chunk_size)
+    convs = CONVERSATIONS + [[e for ex in THEME_PROTOTYPES.values() for e in ex]]
+    counts = clf.score_batch(convs)
+    assert counts.shape == (len(convs), len(THEME_PROTOTYPES))
+    assert counts.tolist() == [_reference_counts(clf, c) for c in convs]
+    assert counts[-1].sum() > 0 and counts[2].sum() == 0
+    assert clf.score_many([[]]) == [dict.fromkeys(THEME_PROTOTYPES, 0)]
+
+def test_embedding_classifier_version(fake_model):
+    assert EmbeddingThemeClassifier().version() == EmbeddingThemeClassifier().version()
+    assert EmbeddingThemeClassifier(threshold=0.5).version() != EmbeddingThemeClassifier().version()
+
+def test_behavioral_analyzer_embedding_mode(workdir, fake_model):
+    keyword, embedding = BehavioralAnalyzer(), BehavioralAnalyzer(embedding=True, batch_size=2)
+    assert keyword._version() != embedding._version()
+    convs = [c for c in CONVERSATIONS if c]
+    assert embedding.extract_themes_batch(convs) == [embedding._extract_themes(c) for c in convs]
+    assert len(embedding.run(incremental=True)) == len(keyword.run()) > 0
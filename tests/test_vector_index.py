@@ -0,0 +1,91 @@
+# tests/test_vector_index.py
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import utils.vector_index as vector_index
+from agents.candidate_profiler import CandidateProfiler
+from utils.vector_index import CandidateVectorIndex, match_candidates
+
+def _unit(n: int, dim: int = 16, seed: int = 0) -> np.ndarray:
+    v = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+def _brute(index: CandidateVectorIndex, query: np.ndarray, k: int):
+    scores = index.vectors @ query
+    return [index.keys[i] for i in np.argsort(-scores, kind="stable")[:k]]
+
+@pytest.mark.parametrize("chunk", [7, 1 << 18])
+def test_exact_scan_matches_brute_force(monkeypatch, chunk):
+    monkeypatch.setattr(vector_index, "_SCAN_CHUNK", chunk)
+    index = CandidateVectorIndex()
+    index.upsert([f"c{i}" for i in range(200)], _unit(200))
+    queries = _unit(5, seed=1)
+    for query, hits in zip(queries, index.search_batch(queries, k=10)):
+        assert [k for k, _ in hits] == _brute(index, query, 10)
+        assert [s for _, s in hits] == sorted((s for _, s in hits), reverse=True)
+    assert len(index.search(queries[0], k=500)) == 200
+    assert CandidateVectorIndex().search(queries[0]) == []
+
+def test_upsert_remove_and_persistence(tmp_path):
+    vecs = _unit(6)
+    index = CandidateVectorIndex()
+    index.upsert(list("abcdef"), vecs)
+    index.upsert(["b"], vecs[5:6])                       # overwrite in place
+    index.remove(["a", "missing", "c"])                  # last rows move into the holes
+    assert sorted(index.keys) == list("bdef") and len(index) == 4 and "a" not in index
+    for key, vec in zip("bdef", vecs[[5, 3, 4, 5]]):
+        np.testing.assert_array_equal(index.vectors[index.keys.index(key)], vec)
+
+    path = tmp_path / "vectors.npy"
+    index.save(path)
+    loaded = CandidateVectorIndex.load(path)              # memory-mapped, read-only
+    assert loaded.keys == index.keys and loaded.next_label == index.next_label
+    loaded.upsert(["g"], vecs[:1])                       # first update copies into RAM
+    loaded.remove(["d"])
+    assert loaded.search(vecs[0], k=1) == [("g", 1.0)]
+    assert isinstance(CandidateVectorIndex.load_or_create(tmp_path / "none.npy"), CandidateVectorIndex)
+
+def test_hnsw_graph_tracks_updates(tmp_path, monkeypatch):
+    pytest.importorskip("hnswlib")
+    monkeypatch.setattr(vector_index, "HNSW_MIN_SIZE", 10)
+    vecs = _unit(400, seed=2)
+    keys = [f"c{i}" for i in range(400)]
+    index = CandidateVectorIndex()
+    index.upsert(keys, vecs)
+    queries = _unit(20, seed=3)
+    recall = np.mean([len({k for k, _ in hits} & set(_brute(index, q, 10))) / 10
+                      for q, hits in zip(queries, index.search_batch(queries, k=10))])
+    assert recall >= 0.9
+
+    path = tmp_path / "vectors.npy"
+    index.save(path)
+    loaded = CandidateVectorIndex.load(path)              # reuses the saved graph
+    loaded.remove(["c0"])
+    loaded.upsert(["new"], -vecs[:1])
+    assert "c0" not in {k for k, _ in loaded.search(vecs[0], k=20)}
+    assert loaded.search(-vecs[0], k=1)[0][0] == "new"
+
+def test_profiler_vectors_and_match(workdir, fake_model):
+    path = workdir / "outputs" / "cache" / "vectors.npy"
+    reports = CandidateProfiler(keyword_only=True, vector_index_path=path).run()
+    names = {r["candidate"]["name"].replace(" ", "_") for r in reports}
+    assert set(CandidateVectorIndex.load(path).keys) == names
+    hits = match_candidates("python sql docker", k=3, path=path)
+    assert len(hits) == 3 and {k for k, _ in hits} <= names
+
+def test_sharded_profiler_returns_vectors_from_workers(workdir, fake_model, monkeypatch):
+    serial_path, sharded_path = workdir / "serial.npy", workdir / "sharded.npy"
+    CandidateProfiler(vector_index_path=serial_path, manifest_path=workdir / "m1.db").run(batch_size=4)
+    parent_calls = []
+    encode = fake_model.encode
+    monkeypatch.setattr(fake_model, "encode", lambda texts, **kw: parent_calls.append(texts) or encode(texts, **kw))
+    CandidateProfiler(vector_index_path=sharded_path, manifest_path=workdir / "m2.db").run(
+        batch_size=4, workers=2, chunk_size=3)
+    assert parent_calls == []  # workers (forked with the patched model) did all the encoding
+    serial, sharded = CandidateVectorIndex.load(serial_path), CandidateVectorIndex.load(sharded_path)
+    assert sorted(serial.keys) == sorted(sharded.keys)
+    for key in serial.keys:
+        np.testing.assert_allclose(sharded.vectors[sharded.keys.index(key)],
+                                   serial.vectors[serial.keys.index(key)], atol=1e-6)
@@ -0,0 +1,151 @@
+# utils/aggregation.py
+"""
+Vectorized aggregation over profiler output, shared by both dashboards.
+
+Reports are flattened once into a columnar SkillTable (candidate index,
+categorical skill code, confidence); every statistic after that is a NumPy /
+pandas array operation, with no per-row Python.
+"""
+from __future__ import annotations
+from operator import itemgetter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Largest (candidate × skill) bitmap skill_frequency allocates (1 byte per cell)
+_BITMAP_MAX_CELLS = 64_000_000
+
+class SkillTable:
+    """One row per (candidate, skill) as parallel arrays."""
+    def __init__(self, candidates: List[str], cand_idx: np.ndarray,
+                 skill_names: List[str], skill_codes: np.ndarray, confidence: np.ndarray):
+        self.candidates = candidates      # cand_idx → candidate key
+        self.cand_idx = cand_idx          # int32
+        self.skill_names = skill_names    # skill_codes → skill label
+        self.skill_codes = skill_codes    # int32
+        self.confidence = confidence      # float32
+
+    def __len__(self) -> int:
+        return len(self.cand_idx)
+
+    @classmethod
+    def _build(cls, candidates: List[str], cand_idx: np.ndarray, skills: Sequence[str],
+               confidence: Sequence[float]) -> "SkillTable":
+        # factorize hashes in C; sort=True gives sorted skill names like pd.Categorical
+        codes, names = pd.factorize(np.asarray(skills, dtype=object), sort=True)
+        return cls(candidates, cand_idx.astype(np.int32, copy=False), list(names),
+                   codes.astype(np.int32), np.asarray(confidence, dtype=np.float32))
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, str, float]]) -> "SkillTable":
+        """Build from flat (candidate, skill, confidence) rows, e.g. the store's skills table."""
+        rows = rows if isinstance(rows, list) else list(rows)
+        n = len(rows)
+
+        def column(i: int, dtype) -> np.ndarray:
+            return np.fromiter(map(itemgetter(i), rows), dtype=dtype, count=n)
+
+        cand_idx, candidates = pd.factorize(column(0, object))  # first-seen order
+        return cls._build(list(candidates), cand_idx, column(1, object), column(2, np.float32))
+
+    @classmethod
+    def from_reports(cls, candidate_reports: Dict[str, Dict]) -> "SkillTable":
+        """Single pass over {key: CandidateProfiler report}."""
+        per_cand = [(key, sk) for key, rep in candidate_reports.items() if (sk := rep.get("skills"))]
+        pairs = [pair for _, sk in per_cand for pair in sk]
+        lengths = np.fromiter((len(sk) for _, sk in per_cand), dtype=np.int64, count=len(per_cand))
+        return cls._build([key for key, _ in per_cand], np.repeat(np.arange(len(per_cand)), lengths),
+                          np.fromiter(map(itemgetter(0), pairs), dtype=object, count=len(pairs)),
+                          np.fromiter(map(itemgetter(1), pairs), dtype=np.float32, count=len(pairs)))
+
+def skill_frequency(table: SkillTable, percentiles: Sequence[float] = (0.5, 0.9)) -> pd.DataFrame:
+    """
+    Per skill: number of distinct candidates, mean confidence and confidence
+    percentiles (columns p50, p90, ...), sorted by count desc.
+    """
+    cols = ["skill", "count", "avg_conf"] + [f"p{int(q * 100)}" for q in percentiles]
+    if len(table) == 0:
+        return pd.DataFrame(columns=cols)
+    n_skills = len(table.skill_names)
+    codes = table.skill_codes
+    conf = table.confidence.astype(np.float64)
+
+    # distinct candidates per skill: a (candidate × skill) bitmap when it is
+    # small enough, else unique (candidate, skill) pair codes (a sort)
+    pairs = table.cand_idx.astype(np.int64) * n_skills + codes
+    cells = len(table.candidates) * n_skills
+    if cells <= _BITMAP_MAX_CELLS:
+        seen = np.zeros(cells, dtype=bool)
+        seen[pairs] = True
+        count = seen.reshape(-1, n_skills).sum(axis=0)
+    else:
+        count = np.bincount(np.unique(pairs) % n_skills, minlength=n_skills)
+
+    rows = np.bincount(codes, minlength=n_skills)
+    avg = np.bincount(codes, weights=conf, minlength=n_skills) / np.maximum(rows, 1)
+
+    # percentiles: one sort of skill-offset confidences orders rows by
+    # (skill, confidence); interpolate inside each skill's slice
+    lo = conf.min()
+    span = conf.max() - lo + 1.0
+    sorted_conf = np.sort(codes * span + (conf - lo)) - np.repeat(np.arange(n_skills) * span, rows) + lo
+    starts = np.concatenate(([0], np.cumsum(rows)[:-1]))
+    out = {"skill": table.skill_names, "count": count, "avg_conf": avg}
+    for q in percentiles:
+        pos = starts + q * (rows - 1)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, starts + rows - 1)
+        frac = pos - lo
+        out[f"p{int(q * 100)}"] = sorted_conf[lo] * (1 - frac) + sorted_conf[hi] * frac
+
+    df = pd.DataFrame(out, columns=cols)
+    return df.sort_values(["count", "skill"], ascending=[False, True]).reset_index(drop=True)
+
+def cooccurrence(table: SkillTable, skills: Sequence[str] | None = None) -> pd.DataFrame:
+    """
+    Skill × skill matrix: number of candidates having both skills (diagonal =
+    candidates with that skill). Built as incidenceᵀ · incidence; uses a sparse
+    incidence matrix when SciPy is available.
+    """
+    names = list(table.skill_names)
+    if len(table) == 0:
+        return pd.DataFrame(index=names, columns=names, dtype=np.int64)
+    shape = (len(table.candidates), len(names))
+    try:
+        from scipy import sparse
+        inc = sparse.csr_matrix(
+            (np.ones(len(table), dtype=np.int32), (table.cand_idx, table.skill_codes)), shape=shape
+        )
+        inc.data[:] = 1  # duplicate (candidate, skill) rows count once
+        co = (inc.T @ inc).toarray()
+    except ImportError:
+        inc = np.zeros(shape, dtype=np.int32)
+        inc[table.cand_idx, table.skill_codes] = 1
+        co = inc.T @ inc
+    df = pd.DataFrame(co, index=names, columns=names)
+    if skills is not None:
+        keep = [s for s in skills if s in df.index]
+        df = df.loc[keep, keep]
+    return df
+
+SALARY_PERCENTILE_COLS = ["p10", "p25", "p50", "p75", "p90"]
+
+def salary_frame(market_reports: Dict[str, Dict]) -> pd.DataFrame:
+    """
+    role / avg_salary / demand_index per market report, plus postings and the
+    salary percentile columns (NaN for reports without a distribution); rows
+    with a non-numeric salary are dropped.
+    """
+    cols = ["role", "avg_salary", "demand_index", "postings"] + SALARY_PERCENTILE_COLS
+    if not market_reports:
+        return pd.DataFrame(columns=cols)
+    reports = list(market_reports.values())
+    df = pd.DataFrame.from_records(reports)
+    pct = pd.DataFrame.from_records([r.get("salary_percentiles") or {} for r in reports], index=df.index)
+    df = pd.concat([df.drop(columns=SALARY_PERCENTILE_COLS, errors="ignore"), pct], axis=1).reindex(columns=cols)
+    df["role"] = df["role"].fillna(pd.Series(list(market_reports), index=df.index))
+    df["avg_salary"] = pd.to_numeric(df["avg_salary"].fillna(0), errors="coerce")
+    df["demand_index"] = df["demand_index"].fillna(0)
+    df[SALARY_PERCENTILE_COLS] = df[SALARY_PERCENTILE_COLS].apply(pd.to_numeric, errors="coerce")
+    return df.dropna(subset=["avg_salary"]).reset_index(drop=True)
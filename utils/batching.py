@@ -0,0 +1,95 @@
+# utils/batching.py
+"""
+Asyncio micro-batcher: concurrent submit() calls are grouped and handed to one
+batch function, e.g. so N simultaneous profile requests share a single
+embedding call.
+
+    batcher = MicroBatcher(profiler.build_reports, max_batch=32, max_wait_ms=5)
+    await batcher.start()
+    report = await batcher.submit(candidate)
+"""
+from __future__ import annotations
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+class MicroBatcher:
+    """
+    A batch starts with the first queued item and closes after max_batch items
+    or max_wait_ms, whichever comes first. Batches run one at a time on a
+    worker thread (the model is not re-entrant), so requests arriving while a
+    batch is encoding simply form the next batch.
+    """
+    def __init__(self, fn: Callable[[List[Any]], List[Any]], max_batch: int = 32,
+                 max_wait_ms: float = 5.0):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue[Tuple[Any, asyncio.Future]] | None = None
+        self._task: asyncio.Task | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="microbatch")
+        self._batches = 0
+        self._items = 0
+
+    async def start(self):
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.shutdown(wait=True)
+
+    async def submit(self, item: Any) -> Any:
+        if self._task is None:
+            raise RuntimeError("MicroBatcher.start() has not been called")
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, fut))
+        return await fut
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            try:
+                if timeout <= 0:
+                    batch.append(self._queue.get_nowait())  # take what is already queued
+                else:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                break
+        return batch
+
+    async def _loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # drop requests whose client already went away
+            batch = [(item, fut) for item, fut in batch if not fut.done()]
+            if not batch:
+                continue
+            try:
+                results = await loop.run_in_executor(self._executor, self.fn, [item for item, _ in batch])
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            self._batches += 1
+            self._items += len(batch)
+            for (_, fut), res in zip(batch, results):
+                if not fut.done():
+                    fut.set_result(res)
+
+    def stats(self) -> Dict[str, float]:
+        return {"batches": self._batches, "items": self._items,
+                "avg_batch": round(self._items / self._batches, 2) if self._batches else 0.0,
+                "queued": self._queue.qsize() if self._queue is not None else 0}
@@ -0,0 +1,145 @@
+# utils/embedding_cache.py
+from __future__ import annotations
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+
+_WS = re.compile(r"\s+")
+
+def normalize(text: str) -> str:
+    return _WS.sub(" ", text).strip()
+
+class EmbeddingCache:
+    """
+    Content-addressed cache of sentence vectors.
+    Key = sha1(model id + normalized text). A bounded in-memory LRU sits in
+    front of an optional SQLite store, so reruns only encode changed texts.
+    The store keeps at most max_disk_items vectors (None = unbounded); past
+    that, the oldest-written ones are pruned.
+    """
+    def __init__(self, max_items: int = 10000, path: str | Path | None = None,
+                 max_disk_items: int | None = 200_000):
+        self.max_items = max_items
+        self.path = Path(path) if path else None
+        self.max_disk_items = max_disk_items
+        self._disk_items = 0  # upper bound: replaced keys are counted again until the next prune
+        self.hits = 0
+        self.misses = 0
+        self._mem: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid = os.getpid()
+
+    @staticmethod
+    def key(text: str, model_id: str) -> str:
+        return hashlib.sha1(f"{model_id}\0{normalize(text)}".encode("utf-8")).hexdigest()
+
+    def _conn(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        if self._pid != os.getpid():
+            # Forked worker: never reuse the parent's SQLite handle
+            self._db = None
+            self._pid = os.getpid()
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB NOT NULL)"
+            )
+            self._disk_items = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return self._db
+
+    def _prune(self, db: sqlite3.Connection):
+        # INSERT OR REPLACE gives a row a fresh rowid, so rowid order is write order.
+        # Prune to 90% of the bound so a full store isn't pruned on every put.
+        excess = self._disk_items - int(self.max_disk_items * 0.9)
+        db.execute("DELETE FROM embeddings WHERE rowid IN "
+                   "(SELECT rowid FROM embeddings ORDER BY rowid LIMIT ?)", (excess,))
+        self._disk_items = db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def _remember(self, key: str, vec: np.ndarray):
+        self._mem[key] = vec
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_items:
+            self._mem.popitem(last=False)
+
+    def get_many(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        with self._lock:
+            out: List[Optional[np.ndarray]] = []
+            cold = []
+            for i, k in enumerate(keys):
+                vec = self._mem.get(k)
+                if vec is not None:
+                    self._mem.move_to_end(k)
+                else:
+                    cold.append(i)
+                out.append(vec)
+            db = self._conn()
+            if cold and db is not None:
+                wanted = list({keys[i] for i in cold})
+                found: Dict[str, np.ndarray] = {}
+                for j in range(0, len(wanted), 500):  # stay under SQLite's variable limit
+                    chunk = wanted[j:j + 500]
+                    marks = ",".join("?" * len(chunk))
+                    for k, blob in db.execute(
+                        f"SELECT key, vec FROM embeddings WHERE key IN ({marks})", chunk
+                    ):
+                        found[k] = np.frombuffer(blob, dtype=np.float32)
+                for i in cold:
+                    vec = found.get(keys[i])
+                    if vec is not None:
+                        self._remember(keys[i], vec)
+                        out[i] = vec
+            n_hit = sum(v is not None for v in out)
+            self.hits += n_hit
+            self.misses += len(out) - n_hit
+            return out
+
+    def put_many(self, keys: List[str], vecs: np.ndarray):
+        vecs = np.asarray(vecs, dtype=np.float32)
+        with self._lock:
+            for k, v in zip(keys, vecs):
+                self._remember(k, v)
+            db = self._conn()
+            if db is not None:
+                with db:
+                    db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+                        [(k, v.tobytes()) for k, v in zip(keys, vecs)],
+                    )
+                    self._disk_items += len(keys)
+                    if self.max_disk_items is not None and self._disk_items > self.max_disk_items:
+                        self._prune(db)
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "memory_items": len(self._mem),
+            "disk_path": str(self.path) if self.path else None,
+        }
+
+    def clear(self, disk: bool = False):
+        with self._lock:
+            self._mem.clear()
+            self.hits = self.misses = 0
+            db = self._conn() if disk else None
+            if db is not None:
+                with db:
+                    db.execute("DELETE FROM embeddings")
+                self._disk_items = 0
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
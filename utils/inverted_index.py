@@ -0,0 +1,220 @@
+# utils/inverted_index.py
+"""
+Inverted skill index over CandidateProfiler output.
+
+    index = SkillInvertedIndex.load_or_build("outputs/reports")
+    index.search("PyTorch>=0.7 AND Docker AND NOT Java", k=20)
+    index.top_k("Python", 10)
+
+Postings per skill are kept sorted by confidence (desc), so thresholds and
+top-k are a bisect/slice instead of a scan over every report. Bulk builds
+append and sort each list once; single updates insert and delete by bisect.
+"""
+from __future__ import annotations
+import heapq
+import json
+import os
+import re
+from bisect import bisect_left, bisect_right, insort
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+DEFAULT_INDEX = Path("outputs/skill_index.json")
+
+# A clause is a list of (skill, min_conf) alternatives (OR); a query is
+# positive clauses (AND) plus excluded skills (AND NOT).
+Clause = List[Tuple[str, float]]
+
+_AND = re.compile(r"\s+AND\s+", re.IGNORECASE)
+_OR = re.compile(r"\s+OR\s+", re.IGNORECASE)
+_NOT = re.compile(r"^NOT\s+", re.IGNORECASE)
+_TERM = re.compile(r"^(.+?)\s*(?:>=\s*([0-9]*\.?[0-9]+))?$")
+
+def parse_query(expr: str) -> Tuple[List[Clause], List[str]]:
+    """
+    "PyTorch>=0.7 AND Docker OR Kubernetes AND NOT Java" →
+    ([[("PyTorch", 0.7)], [("Docker", 0.0), ("Kubernetes", 0.0)]], ["Java"])
+    AND binds looser than OR; skill names are matched case-sensitively.
+    """
+    clauses: List[Clause] = []
+    excluded: List[str] = []
+    for part in _AND.split(expr.strip()):
+        if not part:
+            continue
+        if _NOT.match(part):
+            excluded.append(_NOT.sub("", part).strip())
+            continue
+        clause = []
+        for term in _OR.split(part):
+            m = _TERM.match(term.strip())
+            if not m:
+                raise ValueError(f"bad skill term: {term!r}")
+            clause.append((m.group(1).strip(), float(m.group(2) or 0.0)))
+        clauses.append(clause)
+    return clauses, excluded
+
+class SkillInvertedIndex:
+    """skill → [(-confidence, candidate)] sorted, plus a forward map for updates."""
+    def __init__(self):
+        self.postings: Dict[str, List[Tuple[float, str]]] = {}
+        self.forward: Dict[str, Dict[str, float]] = {}
+        self.sources: Dict[str, Tuple[int, int]] = {}  # report file → (mtime_ns, size)
+
+    def __len__(self) -> int:
+        return len(self.forward)
+
+    # ---- updates ----
+    @staticmethod
+    def _forward(skills: Iterable[Tuple[str, float]]) -> Dict[str, float]:
+        """skill → best confidence (a report may list a skill twice)."""
+        fwd: Dict[str, float] = {}
+        for skill, conf in skills:
+            fwd[skill] = max(float(conf), fwd.get(skill, 0.0))
+        return fwd
+
+    def add(self, candidate: str, skills: Iterable[Tuple[str, float]]):
+        fwd = self._forward(skills)  # validate before touching the index
+        self.remove(candidate)
+        for skill, conf in fwd.items():
+            insort(self.postings.setdefault(skill, []), (-conf, candidate))
+        self.forward[candidate] = fwd
+
+    def add_report(self, report: Dict):
+        self.add(report["candidate"]["name"].replace(" ", "_"), report.get("skills", []))
+
+    def remove(self, candidate: str):
+        self.sources.pop(candidate, None)
+        for skill, conf in self.forward.pop(candidate, {}).items():
+            plist = self.postings[skill]
+            entry = (-conf, candidate)
+            i = bisect_left(plist, entry)  # the exact entry is known: no linear scan
+            if i < len(plist) and plist[i] == entry:
+                del plist[i]
+            if not plist:
+                del self.postings[skill]
+
+    def track(self, candidate: str, report_file: str | Path):
+        """Mark candidate as up to date with report_file, so refresh() won't re-read it."""
+        fs = Path(report_file).stat()
+        self.sources[candidate] = (fs.st_mtime_ns, fs.st_size)
+
+    def refresh(self, reports_dir: str | Path = "outputs/reports") -> Dict[str, int]:
+        """Re-read only report files that were added/changed since last time; drop deleted ones."""
+        seen = set()
+        stats = {"updated": 0, "removed": 0}
+        for f in Path(reports_dir).glob("*.json"):
+            fs = f.stat()
+            sig = (fs.st_mtime_ns, fs.st_size)
+            seen.add(f.stem)
+            if self.sources.get(f.stem) == sig:
+                continue
+            try:
+                rep = json.loads(f.read_text(encoding="utf-8"))
+                if not isinstance(rep, dict):
+                    continue  # valid JSON, but not a candidate report
+                self.add(f.stem, rep.get("skills") or [])
+            except (ValueError, KeyError, TypeError):
+                continue  # not a candidate report
+            self.sources[f.stem] = sig
+            stats["updated"] += 1
+        for stem in [s for s in self.sources if s not in seen]:
+            self.remove(stem)
+            stats["removed"] += 1
+        return stats
+
+    # ---- queries ----
+    def candidates_with(self, skill: str, min_conf: float = 0.0) -> List[str]:
+        plist = self.postings.get(skill, [])
+        # entries are (-conf, name): everything up to -min_conf has conf >= min_conf
+        cut = bisect_right(plist, (-min_conf, "￿"))
+        return [c for _, c in plist[:cut]]
+
+    def top_k(self, skill: str, k: int = 10) -> List[Tuple[str, float]]:
+        return [(c, -neg) for neg, c in self.postings.get(skill, [])[:k]]
+
+    def query(self, clauses: List[Clause], excluded: Iterable[str] = ()) -> set:
+        """Candidates satisfying every clause (each clause = any of its skills) and none of `excluded`."""
+        sets = []
+        for clause in clauses:
+            hit = set()
+            for skill, min_conf in clause:
+                hit.update(self.candidates_with(skill, min_conf))
+            sets.append(hit)
+        if not sets:
+            result = set(self.forward)
+        else:
+            sets.sort(key=len)  # intersect smallest first
+            result = sets[0].intersection(*sets[1:])
+        for skill in excluded:
+            result.difference_update(self.candidates_with(skill))
+        return result
+
+    def search(self, expr: str, k: int = 20) -> List[Tuple[str, float]]:
+        """Top-k candidates for a boolean expression, ranked by summed confidence of matched clauses."""
+        clauses, excluded = parse_query(expr)
+        matches = self.query(clauses, excluded)
+
+        def score(c: str) -> float:
+            fwd = self.forward[c]
+            return sum(max(fwd.get(s, 0.0) for s, _ in clause) for clause in clauses)
+
+        return heapq.nlargest(k, ((c, round(score(c), 4)) for c in matches), key=lambda x: (x[1], x[0]))
+
+    # ---- persistence ----
+    def save(self, path: str | Path = DEFAULT_INDEX):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        payload = {"forward": self.forward, "sources": self.sources}
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def _bulk(cls, forward: Dict[str, Dict[str, float]]) -> "SkillInvertedIndex":
+        """Index from a complete forward map: append every posting, then sort each list once."""
+        index = cls()
+        index.forward = forward
+        for cand, fwd in forward.items():
+            for skill, conf in fwd.items():
+                index.postings.setdefault(skill, []).append((-conf, cand))
+        for plist in index.postings.values():
+            plist.sort()
+        return index
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, str, float]]) -> "SkillInvertedIndex":
+        """Build from flat (candidate, skill, confidence) rows, e.g. ReportStore.skill_rows()."""
+        forward: Dict[str, Dict[str, float]] = {}
+        for cand, skill, conf in rows:
+            fwd = forward.setdefault(cand, {})
+            fwd[skill] = max(float(conf), fwd.get(skill, 0.0))
+        return cls._bulk(forward)
+
+    @classmethod
+    def load(cls, path: str | Path = DEFAULT_INDEX) -> "SkillInvertedIndex":
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        index = cls._bulk({cand: cls._forward(skills.items()) for cand, skills in payload["forward"].items()})
+        index.sources = {k: tuple(v) for k, v in payload.get("sources", {}).items()}
+        return index
+
+    @classmethod
+    def load_or_build(cls, reports_dir: str | Path = "outputs/reports",
+                      path: str | Path = DEFAULT_INDEX, save: bool = True) -> "SkillInvertedIndex":
+        """Load the persisted index, bring it up to date with reports_dir, save if anything changed."""
+        try:
+            index = cls.load(path)
+        except (OSError, ValueError, KeyError):
+            index = cls()
+        stats = index.refresh(reports_dir)
+        if save and (stats["updated"] or stats["removed"]):
+            index.save(path)
+        return index
+
+if __name__ == "__main__":
+    import sys
+    idx = SkillInvertedIndex.load_or_build()
+    if len(sys.argv) > 1:
+        for cand, score in idx.search(" ".join(sys.argv[1:])):
+            print(f"{score:6.2f}  {cand}")
+    else:
+        print(f"Indexed {len(idx)} candidates, {len(idx.postings)} skills → {DEFAULT_INDEX}")
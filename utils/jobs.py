@@ -0,0 +1,370 @@
+# utils/jobs.py
+"""
+Local job queue for long-running work (bulk profiling, regenerating outputs,
+PDF export). Jobs live in a SQLite file, so the dashboard, the API and any
+number of worker processes share them without a broker.
+
+    python -m utils.jobs worker [--processes 2] [--idle-exit 60]
+    python -m utils.jobs submit regenerate_outputs --param incremental=true
+    python -m utils.jobs status [JOB_ID]
+    python -m utils.jobs cancel JOB_ID
+"""
+from __future__ import annotations
+import json
+import multiprocessing
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Callable, Dict, List
+
+DEFAULT_JOBS = Path("outputs/jobs.db")
+WORKER_TTL = 15.0  # seconds without a heartbeat before a worker counts as dead
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, params TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued', done INTEGER NOT NULL DEFAULT 0, total INTEGER,
+    message TEXT, result TEXT, error TEXT, cancel_requested INTEGER NOT NULL DEFAULT 0,
+    worker INTEGER, created_at REAL NOT NULL, started_at REAL, finished_at REAL);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, id);
+CREATE TABLE IF NOT EXISTS workers (pid INTEGER PRIMARY KEY, heartbeat REAL NOT NULL);
+"""
+
+_COLS = ["id", "kind", "params", "status", "done", "total", "message", "result", "error",
+         "cancel_requested", "worker", "created_at", "started_at", "finished_at"]
+FINISHED = ("done", "failed", "cancelled")
+
+class JobCancelled(Exception):
+    """Raised inside a handler (from JobContext.progress) once cancellation is requested."""
+
+class JobQueue:
+    def __init__(self, path: str | Path = DEFAULT_JOBS):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _row(self, row) -> Dict | None:
+        if row is None:
+            return None
+        job = dict(zip(_COLS, row))
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+    # ---- clients ----
+    def submit(self, kind: str, params: Dict | None = None) -> int:
+        if kind not in HANDLERS:
+            raise ValueError(f"unknown job kind {kind!r}; known: {', '.join(sorted(HANDLERS))}")
+        cur = self._db.execute("INSERT INTO jobs (kind, params, created_at) VALUES (?, ?, ?)",
+                               (kind, json.dumps(params or {}), time.time()))
+        return cur.lastrowid
+
+    def get(self, job_id: int) -> Dict | None:
+        return self._row(self._db.execute(
+            f"SELECT {', '.join(_COLS)} FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def list(self, limit: int = 20, active_only: bool = False) -> List[Dict]:
+        where = "WHERE status IN ('queued', 'running')" if active_only else ""
+        rows = self._db.execute(f"SELECT {', '.join(_COLS)} FROM jobs {where} ORDER BY id DESC LIMIT ?",
+                                (limit,))
+        return [self._row(r) for r in rows]
+
+    def cancel(self, job_id: int) -> bool:
+        """Queued jobs are cancelled at once; running ones stop at their next progress update."""
+        now = time.time()
+        cur = self._db.execute(
+            "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+            (now, job_id))
+        if cur.rowcount:
+            return True
+        cur = self._db.execute(
+            "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (job_id,))
+        return bool(cur.rowcount)
+
+    def live_workers(self) -> List[int]:
+        rows = self._db.execute("SELECT pid FROM workers WHERE heartbeat > ?", (time.time() - WORKER_TTL,))
+        return [pid for (pid,) in rows]
+
+    # ---- workers ----
+    def claim(self, worker: int) -> Dict | None:
+        """Atomically move the oldest queued job to running for this worker."""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute(
+                f"SELECT {', '.join(_COLS)} FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1").fetchone()
+            if row is not None:
+                self._db.execute(
+                    "UPDATE jobs SET status = 'running', worker = ?, started_at = ? WHERE id = ?",
+                    (worker, time.time(), row[0]))
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+        job = self._row(row)
+        if job is not None:
+            job["status"] = "running"
+        return job
+
+    def progress(self, job_id: int, done: int, total: int | None = None, message: str | None = None) -> bool:
+        """Record progress; returns True when cancellation has been requested."""
+        self._db.execute(
+            "UPDATE jobs SET done = ?, total = COALESCE(?, total), message = COALESCE(?, message)"
+            " WHERE id = ?", (done, total, message, job_id))
+        row = self._db.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def finish(self, job_id: int, status: str, result: Dict | None = None, error: str | None = None):
+        self._db.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+            (status, json.dumps(result) if result is not None else None, error, time.time(), job_id))
+
+    def heartbeat(self, pid: int):
+        self._db.execute("INSERT OR REPLACE INTO workers VALUES (?, ?)", (pid, time.time()))
+
+    def unregister(self, pid: int):
+        self._db.execute("DELETE FROM workers WHERE pid = ?", (pid,))
+
+    def fail_orphans(self) -> int:
+        """Mark running jobs whose worker stopped heartbeating as failed."""
+        live = self.live_workers()
+        marks = ",".join("?" * len(live)) or "NULL"
+        cur = self._db.execute(
+            f"UPDATE jobs SET status = 'failed', error = 'worker exited', finished_at = ?"
+            f" WHERE status = 'running' AND (worker IS NULL OR worker NOT IN ({marks}))",
+            [time.time(), *live])
+        return cur.rowcount
+
+class JobContext:
+    """Handed to handlers: report progress, and stop when the job is cancelled."""
+    def __init__(self, queue: JobQueue, job: Dict, min_interval: float = 0.25):
+        self.queue, self.job, self.min_interval = queue, job, min_interval
+        self._last = 0.0
+
+    def progress(self, done: int, total: int | None = None, message: str | None = None):
+        """Throttled to one DB write per min_interval; raises JobCancelled when asked to stop."""
+        now = time.monotonic()
+        if now - self._last < self.min_interval and (total is None or done < total):
+            return
+        self._last = now
+        if self.queue.progress(self.job["id"], done, total, message):
+            raise JobCancelled()
+
+# ---- handlers: kind → fn(ctx, params) -> result dict ----
+HANDLERS: Dict[str, Callable[[JobContext, Dict], Dict]] = {}
+
+def handler(kind: str):
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+def _pool_context():
+    """
+    Start method for process pools opened by handlers. A forked child would
+    copy the worker's heartbeat thread and open SQLite connections mid-use,
+    so pools start from a forkserver (spawn where that is unavailable).
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+@handler("regenerate_outputs")
+def _regenerate_outputs(ctx: JobContext, params: Dict) -> Dict:
+    """Run the whole pipeline (app.main.run_pipeline); params are its keyword arguments."""
+    from app.main import run_pipeline
+    ctx.progress(0, message="Running pipeline…")
+    timings = run_pipeline(**params, on_progress=lambda n: ctx.progress(n, message=f"{n} candidates profiled"),
+                           mp_context=_pool_context())
+    n = int(timings["AssessmentDesigner"]["count"])
+    ctx.progress(n, n, "Pipeline finished")
+    return {stage: t["count"] for stage, t in timings.items()}
+
+@handler("profile_import")
+def _profile_import(ctx: JobContext, params: Dict) -> Dict:
+    """Profile a candidates file (JSON array or .jsonl): candidates_path plus CandidateProfiler.iter_run options."""
+    from agents.candidate_profiler import CandidateProfiler
+    params = dict(params)
+    profiler = CandidateProfiler(params.pop("candidates_path", "data/candidates.json"),
+                                 keyword_only=params.pop("keyword_only", False),
+                                 store_path=params.pop("store_path", None),
+                                 skill_index_path=params.pop("skill_index_path", None),
+                                 vector_index_path=params.pop("vector_index_path", None))
+    n = 0
+    for n, _ in enumerate(profiler.iter_run(**params, mp_context=_pool_context()), 1):
+        ctx.progress(n, message=f"{n} candidates profiled")
+    ctx.progress(n, n, f"Profiled {n} candidates")
+    return {"profiled": n}
+
+@handler("export_pdfs")
+def _export_pdfs(ctx: JobContext, params: Dict) -> Dict:
+    """
+    Render every candidate report in reports_dir (default outputs/reports) to
+    PDF in parallel: one file each into out_dir, or format="combined" / "zip"
+    for a single shortlist file at `target`. Optional keys limits the export;
+    workers / chunk_size size the render pool.
+    Cancellation is checked after every rendered PDF (files, zip) or laid-out
+    report (combined; the final layout pass itself runs to completion).
+    """
+    from utils.pdf_generator import bulk_report_pdfs, combined_report_pdf, zip_report_pdfs
+    reports_dir = Path(params.get("reports_dir", "outputs/reports"))
+    files = sorted(reports_dir.glob("*.json"))
+    if params.get("keys") is not None:
+        keep = set(params["keys"])
+        files = [f for f in files if f.stem in keep]
+    reports = (json.loads(f.read_text(encoding="utf-8")) for f in files)
+    fmt = params.get("format", "files")
+    pool = {"workers": params.get("workers"), "chunk_size": params.get("chunk_size", 16),
+            "mp_context": _pool_context()}
+    if fmt == "files":
+        out_dir = params.get("out_dir", "outputs/reports/pdfs")
+        for i, _ in enumerate(bulk_report_pdfs(reports, out_dir, **pool), 1):
+            ctx.progress(i, len(files), f"{i}/{len(files)} PDFs")
+        return {"pdfs": len(files), "out_dir": str(out_dir)}
+    target = Path(params.get("target", f"outputs/exports/shortlist.{'pdf' if fmt == 'combined' else 'zip'}"))
+    target.parent.mkdir(parents=True, exist_ok=True)
+    ctx.progress(0, len(files), f"Building {fmt} export of {len(files)} reports")
+    if fmt == "combined":
+        def laid_out():
+            for i, rep in enumerate(reports, 1):
+                yield rep
+                ctx.progress(i, len(files), f"{i}/{len(files)} reports laid out")
+        combined_report_pdf(laid_out(), target)
+    elif fmt == "zip":
+        zip_report_pdfs(reports, target, **pool,
+                        on_progress=lambda i: ctx.progress(i, len(files), f"{i}/{len(files)} PDFs"))
+    else:
+        raise ValueError(f"unknown export format {fmt!r}")
+    ctx.progress(len(files), len(files), f"Wrote {target}")
+    return {"pdfs": len(files), "target": str(target)}
+
+# ---- worker loop ----
+def run_worker(path: str | Path = DEFAULT_JOBS, poll: float = 0.5, idle_exit: float | None = None):
+    """Claim and run jobs until idle for idle_exit seconds (forever when None)."""
+    pid = os.getpid()
+    queue = JobQueue(path)
+    stop = threading.Event()
+
+    def beat():
+        with JobQueue(path) as q:  # own connection: the main one is busy inside handlers
+            while not stop.wait(WORKER_TTL / 3):
+                q.heartbeat(pid)
+
+    queue.heartbeat(pid)
+    threading.Thread(target=beat, daemon=True).start()
+    idle_since = time.monotonic()
+    try:
+        while True:
+            queue.fail_orphans()
+            job = queue.claim(pid)
+            if job is None:
+                if idle_exit is not None and time.monotonic() - idle_since > idle_exit:
+                    return
+                time.sleep(poll)
+                continue
+            try:
+                result = HANDLERS[job["kind"]](JobContext(queue, job), job["params"])
+            except JobCancelled:
+                queue.finish(job["id"], "cancelled")
+            except Exception:
+                queue.finish(job["id"], "failed", error=traceback.format_exc(limit=5))
+            else:
+                queue.finish(job["id"], "done", result=result)
+            idle_since = time.monotonic()
+    finally:
+        stop.set()
+        queue.unregister(pid)
+        queue.close()
+
+def spawn_worker(path: str | Path = DEFAULT_JOBS, idle_exit: float = 60.0) -> subprocess.Popen:
+    """Start a detached worker process (e.g. from the dashboard) that exits once idle."""
+    cmd = [sys.executable, "-m", "utils.jobs", "--db", str(path), "worker", "--idle-exit", str(idle_exit)]
+    # same cwd as the caller (output paths are relative), repo root importable
+    root = str(Path(__file__).resolve().parents[1])
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    return subprocess.Popen(cmd, env=env, start_new_session=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def ensure_worker(queue: JobQueue, idle_exit: float = 60.0):
+    """Spawn a worker unless one is alive already."""
+    if not queue.live_workers():
+        spawn_worker(queue.path, idle_exit)
+
+def _parse_params(pairs: List[str]) -> Dict:
+    params = {}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        try:
+            params[key] = json.loads(value)
+        except ValueError:
+            params[key] = value
+    return params
+
+def _format(job: Dict) -> str:
+    total = f"/{job['total']}" if job["total"] else ""
+    line = f"#{job['id']:<5} {job['kind']:20s} {job['status']:10s} {job['done']}{total}"
+    if job["message"]:
+        line += f"  {job['message']}"
+    return line
+
+if __name__ == "__main__":
+    import argparse
+    from multiprocessing import Process
+
+    ap = argparse.ArgumentParser(description="Local job queue for bulk work.")
+    ap.add_argument("--db", default=str(DEFAULT_JOBS))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    w = sub.add_parser("worker", help="run jobs")
+    w.add_argument("--processes", type=int, default=1)
+    w.add_argument("--idle-exit", type=float, default=None, help="exit after N idle seconds")
+    s = sub.add_parser("submit", help="queue a job")
+    s.add_argument("kind", choices=sorted(HANDLERS))
+    s.add_argument("--param", action="append", default=[], metavar="KEY=VALUE",
+                   help="JSON values are parsed, e.g. incremental=true")
+    stat = sub.add_parser("status", help="show one job or the most recent ones")
+    stat.add_argument("job_id", type=int, nargs="?")
+    c = sub.add_parser("cancel", help="cancel a queued or running job")
+    c.add_argument("job_id", type=int)
+    args = ap.parse_args()
+
+    if args.cmd == "worker":
+        if args.processes > 1:
+            procs = [Process(target=run_worker, args=(args.db,), kwargs={"idle_exit": args.idle_exit})
+                     for _ in range(args.processes)]
+            for p in procs:
+                p.start()
+            for p in procs:
+                p.join()
+        else:
+            run_worker(args.db, idle_exit=args.idle_exit)
+        sys.exit(0)
+
+    with JobQueue(args.db) as queue:
+        if args.cmd == "submit":
+            print(f"Queued job #{queue.submit(args.kind, _parse_params(args.param))}")
+        elif args.cmd == "status":
+            jobs = [queue.get(args.job_id)] if args.job_id else queue.list()
+            for job in jobs:
+                if job is None:
+                    sys.exit(f"No job #{args.job_id}")
+                print(_format(job))
+                if args.job_id:
+                    print(json.dumps({"result": job["result"], "error": job["error"]}, indent=2))
+        elif args.cmd == "cancel":
+            print("Cancellation requested" if queue.cancel(args.job_id) else "Job is not queued or running")
@@ -0,0 +1,90 @@
+# utils/manifest.py
+from __future__ import annotations
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+DEFAULT_MANIFEST = Path("outputs/manifest.db")
+
+def record_hash(record) -> str:
+    """Stable hash of an input record (dict key order does not matter)."""
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+class Manifest:
+    """
+    Which input (hash) and agent version produced each output file.
+    Stored in SQLite so agents running in parallel can share one manifest.
+    One row per (agent, key); key is the output stem, e.g. "Alyssa_Wang".
+    """
+    def __init__(self, path: str | Path = DEFAULT_MANIFEST):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=30)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS outputs ("
+            " agent TEXT NOT NULL, key TEXT NOT NULL, input_hash TEXT NOT NULL,"
+            " version TEXT NOT NULL, files TEXT NOT NULL, PRIMARY KEY (agent, key))"
+        )
+        self._entries: Dict[str, Dict[str, Tuple[str, str, List[str]]]] = {}
+        self._pending: List[Tuple[str, str, str, str, str]] = []
+
+    def entries(self, agent: str) -> Dict[str, Tuple[str, str, List[str]]]:
+        if agent not in self._entries:
+            rows = self._db.execute(
+                "SELECT key, input_hash, version, files FROM outputs WHERE agent = ?", (agent,)
+            )
+            self._entries[agent] = {k: (h, v, json.loads(f)) for k, h, v, f in rows}
+        return self._entries[agent]
+
+    def is_fresh(self, agent: str, key: str, input_hash: str, version: str) -> bool:
+        entry = self.entries(agent).get(key)
+        if entry is None or entry[0] != input_hash or entry[1] != version:
+            return False
+        return all(Path(f).exists() for f in entry[2])
+
+    def record(self, agent: str, key: str, input_hash: str, version: str, files: Iterable):
+        files = [str(f) for f in files]
+        self.entries(agent)[key] = (input_hash, version, files)
+        self._pending.append((agent, key, input_hash, version, json.dumps(files)))
+
+    def prune(self, agent: str, keep: Iterable[str]) -> List[str]:
+        """Delete outputs (and rows) for keys no longer in the input; returns those keys."""
+        keep = set(keep)
+        entries = self.entries(agent)
+        removed = []
+        for key in [k for k in entries if k not in keep]:
+            for f in entries.pop(key)[2]:
+                Path(f).unlink(missing_ok=True)
+            removed.append(key)
+            self._pending = [p for p in self._pending if (p[0], p[1]) != (agent, key)]
+            with self._db:
+                self._db.execute("DELETE FROM outputs WHERE agent = ? AND key = ?", (agent, key))
+        return removed
+
+    def flush(self):
+        if not self._pending:
+            return
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO outputs (agent, key, input_hash, version, files)"
+                " VALUES (?, ?, ?, ?, ?)",
+                self._pending,
+            )
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        # a failed run leaves its keys stale so they are redone; a consumer that
+        # stops an agent's iter_run early (GeneratorExit) keeps what was written
+        if exc[0] is not None and not issubclass(exc[0], GeneratorExit):
+            self._pending = []
+        self.close()
@@ -1,20 +1,31 @@
 # utils/nlp_utils.py
 from __future__ import annotations
+import hashlib
+import json
+import os
 import re
+import threading
+from pathlib import Path
 from typing import List, Dict, Tuple
 import numpy as np
 
-try:
-    import spacy
-    _NLP = spacy.load("en_core_web_sm")
-except Exception:
-    _NLP = None  # We won't hard-fail; functions check this.
+from utils.embedding_cache import EmbeddingCache
 
-# Free, lightweight sentence embedding model
-from sentence_transformers import SentenceTransformer
+# Free, lightweight sentence embedding model.
+# Models are loaded on first use (see get_model / get_nlp) so imports are cheap.
+_MODEL_NAME = "all-MiniLM-L6-v2"
+_EMB = None
+_NLP = None
+_NLP_TRIED = False
+_LOAD_LOCK = threading.Lock()
 
-# Cache the model so imports are cheap
-_EMB = SentenceTransformer("all-MiniLM-L6-v2")
+# Where precomputed skill-label vectors are persisted between runs
+SKILL_INDEX_DIR = Path("outputs/cache")
+
+# Text → vector cache in front of embed(): memory only unless a disk store is
+# configured (configure_embedding_cache(path=EMBED_CACHE_PATH)) to survive reruns
+EMBED_CACHE_PATH = SKILL_INDEX_DIR / "embeddings.sqlite"
+_EMB_CACHE: EmbeddingCache | None = EmbeddingCache(max_items=10000)
 
 # A tiny, extendable skills ontology. You can expand freely.
 SKILL_ONTOLOGY: Dict[str, List[str]] = {
@@ -32,67 +43,286 @@ SKILL_ONTOLOGY: Dict[str, List[str]] = {
     "Data Engineering": ["airflow", "etl", "spark", "hadoop"],
 }
 
+_WS = re.compile(r"\s+")
+
 def clean_text(s: str) -> str:
-    s = s.replace("\n", " ").strip()
-    s = re.sub(r"\s+", " ", s)
-    return s
+    return _WS.sub(" ", s.replace("\n", " ").strip())
+
+def model_name() -> str:
+    return _MODEL_NAME
+
+def get_model():
+    """The shared SentenceTransformer, loaded once (thread-safe) on first call."""
+    global _EMB
+    if _EMB is None:
+        with _LOAD_LOCK:
+            if _EMB is None:
+                from sentence_transformers import SentenceTransformer
+                _EMB = SentenceTransformer(_MODEL_NAME)
+    return _EMB
+
+def get_nlp():
+    """spaCy pipeline if installed, else None. We won't hard-fail; callers check this."""
+    global _NLP, _NLP_TRIED
+    if not _NLP_TRIED:
+        with _LOAD_LOCK:
+            if not _NLP_TRIED:
+                try:
+                    import spacy
+                    _NLP = spacy.load("en_core_web_sm")
+                except Exception:
+                    _NLP = None
+                _NLP_TRIED = True
+    return _NLP
+
+def warm_up(with_spacy: bool = False):
+    """Load the embedding model and skill index up front (e.g. before serving requests)."""
+    get_model()
+    get_skill_index()
+    if with_spacy:
+        get_nlp()
+
+def configure_embedding_cache(max_items: int = 10000, path: str | Path | None = None,
+                              enabled: bool = True, max_disk_items: int | None = 200_000) -> EmbeddingCache | None:
+    """Replace the embed() cache; path (e.g. EMBED_CACHE_PATH) adds a bounded SQLite store."""
+    global _EMB_CACHE
+    if _EMB_CACHE is not None:
+        _EMB_CACHE.close()
+    _EMB_CACHE = EmbeddingCache(max_items=max_items, path=path, max_disk_items=max_disk_items) if enabled else None
+    return _EMB_CACHE
+
+def embedding_cache_stats() -> Dict:
+    return _EMB_CACHE.stats() if _EMB_CACHE is not None else {}
 
 def embed(texts: List[str]) -> np.ndarray:
     if isinstance(texts, str):
         texts = [texts]
-    return _EMB.encode(texts, normalize_embeddings=True)
+    cache = _EMB_CACHE
+    if cache is None or not texts:
+        return get_model().encode(texts, normalize_embeddings=True)
+
+    keys = [cache.key(t, _MODEL_NAME) for t in texts]
+    vecs = cache.get_many(keys)
+    # Encode each distinct missing text once
+    missing: Dict[str, str] = {}
+    for k, t, v in zip(keys, texts, vecs):
+        if v is None:
+            missing.setdefault(k, t)
+    if missing:
+        new = get_model().encode(list(missing.values()), normalize_embeddings=True)
+        cache.put_many(list(missing), new)
+        fresh = dict(zip(missing, new))
+        vecs = [fresh[k] if v is None else v for k, v in zip(keys, vecs)]
+    return np.vstack(vecs).astype(np.float32, copy=False)
 
 def cosine(a: np.ndarray, b: np.ndarray) -> float:
     return float(np.dot(a, b))
 
-def extract_skills(text: str) -> List[Tuple[str, float]]:
+def _ontology_hash(include_synonyms: bool = False) -> str:
+    payload = json.dumps(
+        {"model": _MODEL_NAME, "ontology": SKILL_ONTOLOGY, "synonyms": include_synonyms},
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+def ontology_version() -> str:
+    """Short id of the current model + ontology (changes when either does)."""
+    return _ontology_hash()
+
+class SkillIndex:
+    """
+    Embeddings of the ontology labels, one contiguous float32 matrix.
+    Rows are grouped per skill (label first, then synonyms if enabled),
+    so per-skill scores are a max-reduce over each group.
+    """
+    def __init__(self, skills: List[str], offsets: np.ndarray, vectors: np.ndarray):
+        self.skills = skills
+        self.offsets = offsets
+        self.vectors = vectors
+
+    @classmethod
+    def build(cls, include_synonyms: bool = False) -> "SkillIndex":
+        skills, labels, offsets = [], [], []
+        for skill, synonyms in SKILL_ONTOLOGY.items():
+            skills.append(skill)
+            offsets.append(len(labels))
+            labels.append(skill)
+            if include_synonyms:
+                labels.extend(syn for syn in synonyms if syn.lower() != skill.lower())
+        vectors = np.ascontiguousarray(embed(labels), dtype=np.float32)
+        return cls(skills, np.asarray(offsets, dtype=np.int64), vectors)
+
+    def save(self, path: str | Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, self.vectors)
+        os.replace(tmp, path)
+        meta = {"skills": self.skills, "offsets": self.offsets.tolist()}
+        path.with_suffix(".json").write_text(json.dumps(meta), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SkillIndex":
+        path = Path(path)
+        meta = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+        vectors = np.load(path, mmap_mode="r")
+        return cls(meta["skills"], np.asarray(meta["offsets"], dtype=np.int64), vectors)
+
+    def similarities(self, text_vecs: np.ndarray) -> np.ndarray:
+        """
+        Best cosine similarity per skill, aligned with self.skills.
+        Accepts one vector (dim,) or a batch (n, dim) → (n, n_skills).
+        """
+        sims = np.asarray(text_vecs) @ self.vectors.T
+        return np.maximum.reduceat(sims, self.offsets, axis=-1)
+
+_SKILL_INDEX: Dict[Tuple, SkillIndex] = {}
+
+def get_skill_index(include_synonyms: bool = False) -> SkillIndex:
+    """
+    Return the skill-vector index for the current model + ontology.
+    Loaded (mmap) from SKILL_INDEX_DIR when present, built and saved otherwise.
+    Extending SKILL_ONTOLOGY changes the hash, so a fresh index is built.
+    """
+    memo_key = (_ontology_fingerprint(SKILL_ONTOLOGY), include_synonyms)
+    index = _SKILL_INDEX.get(memo_key)
+    if index is not None:
+        return index
+    key = _ontology_hash(include_synonyms)
+    path = SKILL_INDEX_DIR / f"skill_index_{_MODEL_NAME}_{key}.npy"
+    try:
+        index = SkillIndex.load(path)
+    except Exception:
+        index = SkillIndex.build(include_synonyms)
+        try:
+            index.save(path)
+        except OSError:
+            pass  # read-only checkout: keep the in-memory copy
+    _SKILL_INDEX[memo_key] = index
+    return index
+
+class _OntologyMatcher:
+    """
+    All ontology labels + synonyms compiled into one alternation regex.
+    A single scan of the text yields every hit, mapped back to its canonical
+    skill(s). The zero-width lookahead tries every offset, so terms starting
+    at different offsets all match; at one offset the regex reports only the
+    longest term, so each term also maps to the skills of the shorter terms
+    that match inside it there ("machine learning" → "machine" too).
+    """
+    def __init__(self, ontology: Dict[str, List[str]]):
+        self.fingerprint = _ontology_fingerprint(ontology)
+        self.order = {skill: i for i, skill in enumerate(ontology)}
+        self.term_skills: Dict[str, List[str]] = {}
+        for skill, synonyms in ontology.items():
+            for syn in synonyms + [skill]:
+                owners = self.term_skills.setdefault(syn.lower(), [])
+                if skill not in owners:
+                    owners.append(skill)
+        # Longest first so e.g. "reactjs" wins over "react" at the same offset
+        terms = sorted(self.term_skills, key=len, reverse=True)
+        alternation = "|".join(re.escape(t) for t in terms)
+        self.pattern = re.compile(rf"(?=\b({alternation})\b)") if terms else None
+        # A shorter term matches at the same offset iff it is a prefix of the
+        # longest one ending on a word boundary within it ("react" in "react native",
+        # not in "reactjs"): fold its skills in once here rather than per match.
+        self.match_skills: Dict[str, List[str]] = {}
+        for i, term in enumerate(terms):
+            owners = list(self.term_skills[term])
+            for short in terms[i + 1:]:
+                if len(short) < len(term) and re.match(rf"{re.escape(short)}\b", term):
+                    owners += [s for s in self.term_skills[short] if s not in owners]
+            self.match_skills[term] = owners
+
+    def skills_in(self, text_l: str) -> List[str]:
+        if self.pattern is None:
+            return []
+        found = set()
+        for m in self.pattern.finditer(text_l):
+            found.update(self.match_skills[m.group(1)])
+        # Ontology order, so ties in confidence keep their historical ordering
+        return sorted(found, key=self.order.__getitem__)
+
+def _ontology_fingerprint(ontology: Dict[str, List[str]]) -> Tuple[int, int, int]:
+    # Cheap O(skills) check: catches new skills and appended synonyms.
+    # Call refresh_ontology() after editing terms in place.
+    return (id(ontology), len(ontology), sum(len(v) for v in ontology.values()))
+
+_MATCHER: _OntologyMatcher | None = None
+
+def refresh_ontology():
+    """Force the keyword matcher and skill index to be rebuilt on next use."""
+    global _MATCHER
+    _MATCHER = None
+    _SKILL_INDEX.clear()
+
+def _ontology_matcher() -> _OntologyMatcher:
+    global _MATCHER
+    if _MATCHER is None or _MATCHER.fingerprint != _ontology_fingerprint(SKILL_ONTOLOGY):
+        _MATCHER = _OntologyMatcher(SKILL_ONTOLOGY)
+    return _MATCHER
+
+def _keyword_hits(text: str) -> Dict[str, float]:
+    # strong confidence for explicit match
+    return {skill: 0.8 for skill in _ontology_matcher().skills_in(text.lower())}
+
+def _apply_backoff(hits: Dict[str, float], skills: List[str], sims: List[float]):
+    for skill, sim in zip(skills, sims):
+        if skill in hits:
+            continue
+        if sim > 0.45:   # conservative threshold
+            # map sim ~ [0.45..0.8] → [0.4..0.7]
+            conf = 0.4 + (sim - 0.45) * (0.7 - 0.4) / (0.8 - 0.45)
+            conf = float(max(0.4, min(0.7, conf)))
+            hits[skill] = max(hits.get(skill, 0), conf)
+
+def _ranked(hits: Dict[str, float]) -> List[Tuple[str, float]]:
+    return sorted([(k, round(v, 2)) for k, v in hits.items()], key=lambda x: x[1], reverse=True)
+
+def extract_skills(text: str, keyword_only: bool = False) -> List[Tuple[str, float]]:
     """
     Heuristic extraction:
     1) Keyword match against ontology synonyms.
-    2) Back off to embedding similarity against skill labels.
+    2) Back off to embedding similarity against skill labels
+       (skipped when keyword_only=True; the model is then never loaded).
     Returns list[(skill, confidence 0..1)]
     """
-    text_l = text.lower()
     # 1) Keyword match
-    hits = {}
-    for skill, synonyms in SKILL_ONTOLOGY.items():
-        for syn in synonyms + [skill]:
-            syn_l = syn.lower()
-            if re.search(rf"\b{re.escape(syn_l)}\b", text_l):
-                hits[skill] = max(hits.get(skill, 0), 0.8)  # strong confidence for explicit match
+    hits = _keyword_hits(text)
 
     # 2) Embedding similarity against labels (for subtle mentions)
     # Only check skills not already hit
-    remaining = [s for s in SKILL_ONTOLOGY.keys() if s not in hits]
-    if remaining:
+    if not keyword_only and any(s not in hits for s in SKILL_ONTOLOGY):
+        index = get_skill_index()
         text_vec = embed([text])[0]
-        skill_vecs = embed(remaining)
-        sims = (skill_vecs @ text_vec).tolist()
-        for skill, sim in zip(remaining, sims):
-            if sim > 0.45:   # conservative threshold
-                # map sim ~ [0.45..0.8] → [0.4..0.7]
-                conf = 0.4 + (sim - 0.45) * (0.7 - 0.4) / (0.8 - 0.45)
-                conf = float(max(0.4, min(0.7, conf)))
-                hits[skill] = max(hits.get(skill, 0), conf)
+        _apply_backoff(hits, index.skills, index.similarities(text_vec).tolist())
 
     # Sort by confidence
-    return sorted([(k, round(v, 2)) for k, v in hits.items()], key=lambda x: x[1], reverse=True)
+    return _ranked(hits)
+
+def extract_skills_batch(texts: List[str], keyword_only: bool = False) -> List[List[Tuple[str, float]]]:
+    """
+    Same as extract_skills() for many texts at once: every text that needs the
+    embedding back-off is encoded in a single call and scored against the
+    skill index with one matrix multiply.
+    """
+    all_hits = [_keyword_hits(t) for t in texts]
+    if keyword_only:
+        return [_ranked(hits) for hits in all_hits]
+    pending = [i for i, hits in enumerate(all_hits) if any(s not in hits for s in SKILL_ONTOLOGY)]
+    if pending:
+        index = get_skill_index()
+        text_vecs = embed([texts[i] for i in pending])
+        sims = index.similarities(text_vecs).tolist()
+        for i, row in zip(pending, sims):
+            _apply_backoff(all_hits[i], index.skills, row)
+    return [_ranked(hits) for hits in all_hits]
 
 def summarize_text(text: str, max_sentences: int = 3) -> str:
     """
     Super-light extractive summary: pick top sentences by length & uniqueness.
-    Replace with an LLM later if you like; keep free/local now.
+    See utils.summarizer for embedding-centrality scoring and batches.
     """
-    text = clean_text(text)
-    sents = re.split(r"(?<=[.!?])\s+", text)
-    sents = [s.strip() for s in sents if 20 <= len(s) <= 220]
-    if not sents:
-        return text[:240]
-    # Score by length (proxy) and uniqueness
-    scores = []
-    for s in sents:
-        tokens = set(re.findall(r"\b\w+\b", s.lower()))
-        scores.append((len(tokens) + len(s) * 0.01, s))
-    scores.sort(reverse=True)
-    chosen = [s for _, s in scores[:max_sentences]]
-    return " ".join(chosen)
+    from utils.summarizer import summarize
+    return summarize(text, max_sentences)
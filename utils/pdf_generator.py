@@ -1,79 +1,230 @@
 # utils/pdf_generator.py
+"""
+PDF export of Talent Intelligence Reports.
+
+    candidate_report_pdf(report)                       # one file
+    candidate_report_pdf_bytes(report)                 # in memory, memoized by report hash
+    bulk_report_pdfs(reports, workers=8)               # one file each, in parallel
+    combined_report_pdf(reports, "shortlist.pdf")      # one document with a table of contents
+    zip_report_pdfs(reports, "shortlist.zip")          # zip of per-candidate PDFs
+
+Styles and table styles are built once per process and shared by every document.
+"""
+from __future__ import annotations
+import io
+import os
+import threading
+import zipfile
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from multiprocessing.context import BaseContext
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import mm
-from reportlab.lib import colors
-from reportlab.pdfgen import canvas
-from reportlab.platypus import Table, TableStyle, Paragraph, SimpleDocTemplate, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from pathlib import Path
-from typing import Dict, List
+from reportlab.platypus import (BaseDocTemplate, Frame, PageBreak, PageTemplate, Paragraph,
+                                SimpleDocTemplate, Spacer, Table, TableStyle)
+from reportlab.platypus.tableofcontents import TableOfContents
+
+from utils.manifest import record_hash
+
+_MARGINS = dict(rightMargin=20*mm, leftMargin=20*mm, topMargin=20*mm, bottomMargin=20*mm)
+_SKILL_COL_WIDTHS = [120*mm, 30*mm]
+_SKILL_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#f0f0f0")),
+    ("GRID", (0,0), (-1,-1), 0.5, colors.grey),
+    ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
+    ("LEFTPADDING", (0,0), (-1,-1), 6),
+    ("RIGHTPADDING", (0,0), (-1,-1), 6),
+])
+_GAP_S, _GAP_M = Spacer(1, 6), Spacer(1, 8)
 
 def _ensure_dir(p):
     Path(p).mkdir(parents=True, exist_ok=True)
     return Path(p)
 
+@lru_cache(maxsize=1)
+def _styles() -> Dict[str, ParagraphStyle]:
+    sheet = getSampleStyleSheet()
+    return {"N": sheet["Normal"], "H1": sheet["Heading1"], "H2": sheet["Heading2"], "Title": sheet["Title"]}
+
+def pdf_filename(report: Dict) -> str:
+    return f"{report['candidate']['name'].replace(' ', '_')}.pdf"
+
+def _report_flowables(report: Dict) -> List:
+    """Flowables for one candidate (shared by single, bulk and combined output)."""
+    st = _styles()
+    c = report["candidate"]
+    elements = [
+        Paragraph(f"Talent Intelligence Report — {c['name']}", st["H1"]), _GAP_S,
+        Paragraph(f"<b>Role:</b> {c.get('role','-')} &nbsp;&nbsp; "
+                  f"<b>Experience:</b> {c.get('experience_years','-')} years", st["N"]), _GAP_M,
+        Paragraph("Career Summary", st["H2"]),
+        Paragraph(report.get("career_summary","-"), st["N"]), _GAP_M,
+        Paragraph("Detected Skills (with confidence)", st["H2"]),
+    ]
+    skills = report.get("skills", [])
+    if skills:
+        t = Table([["Skill", "Confidence"]] + [[s, str(conf)] for s, conf in skills],
+                  colWidths=_SKILL_COL_WIDTHS)
+        t.setStyle(_SKILL_TABLE_STYLE)
+        elements.append(t)
+    else:
+        elements.append(Paragraph("No skills detected.", st["N"]))
+    elements.append(_GAP_M)
+    elements.append(Paragraph("Highlights", st["H2"]))
+    elements.extend(Paragraph(f"- {h}", st["N"]) for h in report.get("highlights", []))
+    elements.append(_GAP_M)
+    elements.append(Paragraph("Notes", st["H2"]))
+    elements.append(Paragraph(report.get("notes",""), st["N"]))
+    return elements
+
+def _render(report: Dict, target) -> None:
+    """Build one report into a path or a binary file object."""
+    SimpleDocTemplate(target, pagesize=A4, **_MARGINS).build(_report_flowables(report))
+
 def candidate_report_pdf(report: Dict, out_dir="outputs/reports/pdfs"):
     """
     Generate a clean PDF for a Talent Intelligence Report.
     report: dict produced by CandidateProfiler.build_report()
     """
     _ensure_dir(out_dir)
-    name_safe = report["candidate"]["name"].replace(" ", "_")
-    fname = Path(out_dir) / f"{name_safe}.pdf"
-
-    doc = SimpleDocTemplate(str(fname), pagesize=A4,
-                            rightMargin=20*mm, leftMargin=20*mm,
-                            topMargin=20*mm, bottomMargin=20*mm)
-    styles = getSampleStyleSheet()
-    styleN = styles["Normal"]
-    styleH = styles["Heading1"]
-    styleH2 = styles["Heading2"]
-    elements = []
-
-    # Title
-    elements.append(Paragraph(f"Talent Intelligence Report — {report['candidate']['name']}", styleH))
-    elements.append(Spacer(1, 6))
-
-    # Candidate basic info
-    c = report["candidate"]
-    info = f"<b>Role:</b> {c.get('role','-')} &nbsp;&nbsp; <b>Experience:</b> {c.get('experience_years','-')} years"
-    elements.append(Paragraph(info, styleN))
-    elements.append(Spacer(1, 8))
+    fname = Path(out_dir) / pdf_filename(report)
+    _render(report, str(fname))
+    return str(fname)
 
-    # Career summary
-    elements.append(Paragraph("Career Summary", styleH2))
-    elements.append(Paragraph(report.get("career_summary","-"), styleN))
-    elements.append(Spacer(1, 8))
+# report hash → PDF bytes, most recently used last
+_PDF_CACHE: "OrderedDict[str, bytes]" = OrderedDict()
+_PDF_CACHE_MAX = 128
+_PDF_CACHE_LOCK = threading.Lock()
 
-    # Skills table
-    elements.append(Paragraph("Detected Skills (with confidence)", styleH2))
-    skills = report.get("skills", [])
-    if skills:
-        table_data = [["Skill", "Confidence"]]
-        for s, conf in skills:
-            table_data.append([s, str(conf)])
-        t = Table(table_data, colWidths=[120*mm, 30*mm])
-        t.setStyle(TableStyle([
-            ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#f0f0f0")),
-            ("GRID", (0,0), (-1,-1), 0.5, colors.grey),
-            ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
-            ("LEFTPADDING", (0,0), (-1,-1), 6),
-            ("RIGHTPADDING", (0,0), (-1,-1), 6),
-        ]))
-        elements.append(t)
-    else:
-        elements.append(Paragraph("No skills detected.", styleN))
-    elements.append(Spacer(1, 8))
+def candidate_report_pdf_bytes(report: Dict) -> bytes:
+    """
+    Render a report to PDF bytes in memory (no file written), e.g. for a
+    download button. Memoized on the report content: keys starting with "_"
+    (dashboard bookkeeping such as _source_file) are ignored.
+    """
+    key = record_hash({k: v for k, v in report.items() if not k.startswith("_")})
+    with _PDF_CACHE_LOCK:
+        data = _PDF_CACHE.get(key)
+        if data is not None:
+            _PDF_CACHE.move_to_end(key)
+            return data
+    buf = io.BytesIO()
+    _render(report, buf)
+    data = buf.getvalue()
+    with _PDF_CACHE_LOCK:
+        _PDF_CACHE[key] = data
+        while len(_PDF_CACHE) > _PDF_CACHE_MAX:
+            _PDF_CACHE.popitem(last=False)
+    return data
 
-    # Highlights
-    elements.append(Paragraph("Highlights", styleH2))
-    for h in report.get("highlights", []):
-        elements.append(Paragraph(f"- {h}", styleN))
-    elements.append(Spacer(1, 8))
+# ---- bulk ----
+def _render_chunk_files(reports: List[Dict], out_dir: str) -> List[str]:
+    return [candidate_report_pdf(r, out_dir) for r in reports]
 
-    # Notes
-    elements.append(Paragraph("Notes", styleH2))
-    elements.append(Paragraph(report.get("notes",""), styleN))
+def _render_chunk_bytes(reports: List[Dict]) -> List[Tuple[str, bytes]]:
+    out = []
+    for r in reports:
+        buf = io.BytesIO()
+        _render(r, buf)
+        out.append((pdf_filename(r), buf.getvalue()))
+    return out
 
-    doc.build(elements)
-    return str(fname)
+def _chunks(reports: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    chunk = []
+    for r in reports:
+        chunk.append(r)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _map_chunks(fn, reports: Iterable[Dict], workers: int | None, chunk_size: int, *args,
+                mp_context: BaseContext | None = None) -> Iterator:
+    """
+    fn(chunk, *args) over chunks, in a process pool when workers > 1. Results
+    come back in input order; at most 2 chunks per worker are in flight.
+    """
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    chunks = _chunks(reports, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield from fn(chunk, *args)
+        return
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(fn, chunk, *args))
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+def bulk_report_pdfs(reports: Iterable[Dict], out_dir="outputs/reports/pdfs",
+                     workers: int | None = None, chunk_size: int = 16,
+                     mp_context: BaseContext | None = None) -> Iterator[str]:
+    """
+    Render one PDF per report across `workers` processes (default: all CPUs),
+    chunk_size reports per task. Yields written paths in input order.
+    """
+    _ensure_dir(out_dir)
+    yield from _map_chunks(_render_chunk_files, reports, workers, chunk_size, str(out_dir),
+                           mp_context=mp_context)
+
+def zip_report_pdfs(reports: Iterable[Dict], dest: str | Path | IO[bytes],
+                    workers: int | None = None, chunk_size: int = 16,
+                    mp_context: BaseContext | None = None,
+                    on_progress: Callable[[int], None] | None = None) -> int:
+    """
+    Render in parallel and stream the PDFs into a zip (path or writable binary
+    file); returns count. on_progress(n) is called after each PDF is added.
+    """
+    n = 0
+    with zipfile.ZipFile(dest, "w", compression=zipfile.ZIP_STORED) as zf:  # PDFs are already compressed
+        for name, data in _map_chunks(_render_chunk_bytes, reports, workers, chunk_size,
+                                      mp_context=mp_context):
+            zf.writestr(name, data)
+            n += 1
+            if on_progress is not None:
+                on_progress(n)
+    return n
+
+class _ShortlistDoc(BaseDocTemplate):
+    """Registers each candidate title with the TOC and the PDF outline."""
+    def __init__(self, target, **kw):
+        super().__init__(target, pagesize=A4, **_MARGINS, **kw)
+        frame = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id="body")
+        self.addPageTemplates([PageTemplate("body", [frame])])
+
+    def afterFlowable(self, flowable):
+        if isinstance(flowable, Paragraph) and flowable.style is _styles()["H1"]:
+            text = flowable.getPlainText()
+            key = f"candidate-{self.seq.nextf('candidate')}"
+            self.canv.bookmarkPage(key)
+            self.canv.addOutlineEntry(text, key, level=0, closed=True)
+            self.notify("TOCEntry", (0, text, self.page, key))
+
+def combined_report_pdf(reports: Iterable[Dict], target, title: str = "Candidate Shortlist",
+                        toc: bool = True):
+    """All reports in one document, one candidate per page, with a linked table of contents."""
+    st = _styles()
+    story: List = [Paragraph(title, st["Title"])]
+    if toc:
+        contents = TableOfContents()
+        contents.levelStyles = [ParagraphStyle("TOC0", parent=st["N"], leftIndent=0, fontSize=10, leading=13)]
+        story += [contents]
+    for rep in reports:
+        story.append(PageBreak())
+        story.extend(_report_flowables(rep))
+    doc = _ShortlistDoc(str(target) if isinstance(target, Path) else target, title=title)
+    if toc:
+        doc.multiBuild(story)  # second pass fills in page numbers
+    else:
+        doc.build(story)
+    return target
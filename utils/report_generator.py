@@ -1,22 +1,54 @@
 # utils/report_generator.py
 from __future__ import annotations
 import json
+import os
+import queue
+import threading
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Set
 
 def ensure_dir(p: str | Path):
     p = Path(p)
     p.mkdir(parents=True, exist_ok=True)
     return p
 
+# Directories already created by this process: skip the mkdir syscall next time.
+# Keyed by absolute path, so a relative out_dir is re-checked after a chdir.
+_KNOWN_DIRS: Set[Path] = set()
+
+def _cached_dir(p: str | Path) -> Path:
+    p = Path(p)
+    key = p.absolute()
+    if key not in _KNOWN_DIRS:
+        ensure_dir(p)
+        _KNOWN_DIRS.add(key)
+    return p
+
+def _atomic_write(path: Path, text: str):
+    """Write to a temp file next to `path`, then rename: readers never see partial files."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+def render_json(report: Dict) -> str:
+    return json.dumps(report, indent=2, ensure_ascii=False)
+
 def save_json(report: Dict, out_dir: str | Path, filename: str):
-    out = ensure_dir(out_dir) / filename
-    with open(out, "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=2, ensure_ascii=False)
+    out = _cached_dir(out_dir) / filename
+    _atomic_write(out, render_json(report))
     return out
 
 def save_markdown(report: Dict, out_dir: str | Path, filename: str):
-    out = ensure_dir(out_dir) / filename
+    out = _cached_dir(out_dir) / filename
+    _atomic_write(out, render_markdown(report))
+    return out
+
+def render_markdown(report: Dict) -> str:
     lines = []
 
     if "career_summary" in report:   # Talent Intelligence Report
@@ -40,8 +72,11 @@ def save_markdown(report: Dict, out_dir: str | Path, filename: str):
         lines.append("## Notes")
         lines.append(report.get("notes", ""))
 
-    elif "challenges" in report:   # Assessment Report
-        lines.append(f"# Assessment Package — {report['candidate']['name']}")
+    elif "challenges" in report:   # Assessment Report (or a shared package)
+        if "candidate" in report:
+            lines.append(f"# Assessment Package — {report['candidate']['name']}")
+        else:
+            lines.append(f"# Shared Assessment Package — {report['package_id']}")
         lines.append("")
         lines.append("## Challenges")
         for ch in report.get("challenges", []):
@@ -57,6 +92,10 @@ def save_markdown(report: Dict, out_dir: str | Path, filename: str):
         lines.append("")
         lines.append("## Notes")
         lines.append(report.get("notes", ""))
+    elif "package_id" in report:   # Assessment referencing a shared package
+        lines.append(f"# Assessment Package — {report['candidate']['name']}")
+        lines.append("")
+        lines.append(f"- **Package**: [{report['package_id']}](packages/{report['package_id']}.md)")
     elif "themes" in report:   
         lines.append(f"# Behavioral & Cultural Fit Report — {report['candidate']}")
         lines.append("")
@@ -74,6 +113,17 @@ def save_markdown(report: Dict, out_dir: str | Path, filename: str):
         lines.append("")
         lines.append(f"- **Average Salary**: {report['avg_salary']}")
         lines.append(f"- **Demand Index**: {report['demand_index']}")
+        if "postings" in report:
+            lines.append(f"- **Postings**: {report['postings']}")
+            lines.append(f"- **Salary Std Dev**: {report.get('salary_std', 'N/A')}")
+            lines.append(f"- **Salary Range**: {report.get('salary_min', 'N/A')} – {report.get('salary_max', 'N/A')}")
+        pct = report.get("salary_percentiles")
+        if pct:
+            lines.append("")
+            lines.append("## Salary Percentiles")
+            lines.append("| " + " | ".join(pct) + " |")
+            lines.append("|" + "---|" * len(pct))
+            lines.append("| " + " | ".join(str(v) for v in pct.values()) + " |")
         lines.append("")
         lines.append("## Recommendations")
         for r in report.get("recommendations", []):
@@ -87,5 +137,70 @@ def save_markdown(report: Dict, out_dir: str | Path, filename: str):
         lines.append("# Unknown Report Type")
         lines.append(str(report))
 
-    out.write_text("\n".join(lines), encoding="utf-8")
-    return out
+    return "\n".join(lines)
+
+class ReportWriter:
+    """
+    Queues rendered reports and writes them from a background thread, so the
+    agents never block on filesystem round-trips. Directory creation is cached
+    and every file is written atomically (temp file + rename).
+    Call flush() to wait for pending writes, close() (or use `with`) when done;
+    write errors are re-raised from flush()/close().
+    """
+    def __init__(self, max_pending: int = 1024):
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._error: BaseException | None = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name="ReportWriter", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                path, text = item
+                if self._error is None:
+                    _atomic_write(path, text)
+            except BaseException as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _submit(self, out_dir: str | Path, filename: str, text: str) -> Path:
+        if self._closed:
+            raise RuntimeError("ReportWriter is closed")
+        self._raise_pending_error()
+        out = _cached_dir(out_dir) / filename
+        self._queue.put((out, text))
+        return out
+
+    def save_json(self, report: Dict, out_dir: str | Path, filename: str) -> Path:
+        return self._submit(out_dir, filename, render_json(report))
+
+    def save_markdown(self, report: Dict, out_dir: str | Path, filename: str) -> Path:
+        return self._submit(out_dir, filename, render_markdown(report))
+
+    def _raise_pending_error(self):
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise err
+
+    def flush(self):
+        self._queue.join()
+        self._raise_pending_error()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_pending_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,289 @@
+# utils/report_store.py
+from __future__ import annotations
+import copy
+import json
+import sqlite3
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+DEFAULT_STORE = Path("outputs/reports.db")
+
+# Keys match the per-file output stems, so store loaders are drop-in
+# replacements for globbing outputs/*/*.json.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    key TEXT PRIMARY KEY, name TEXT, role TEXT, experience_years REAL,
+    career_summary TEXT, report TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS candidates_by_role ON candidates (role);
+CREATE TABLE IF NOT EXISTS skills (
+    candidate TEXT NOT NULL, skill TEXT NOT NULL, confidence REAL NOT NULL,
+    PRIMARY KEY (candidate, skill));
+CREATE INDEX IF NOT EXISTS skills_by_skill ON skills (skill, confidence);
+CREATE TABLE IF NOT EXISTS assessments (
+    key TEXT PRIMARY KEY, candidate TEXT NOT NULL, report TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS assessment_packages (
+    key TEXT PRIMARY KEY, report TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS behavioral (
+    key TEXT PRIMARY KEY, candidate TEXT NOT NULL, summary TEXT, report TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS behavioral_themes (
+    key TEXT NOT NULL, theme TEXT NOT NULL, score REAL NOT NULL,
+    PRIMARY KEY (key, theme));
+CREATE TABLE IF NOT EXISTS market (
+    key TEXT PRIMARY KEY, role TEXT NOT NULL, avg_salary REAL, demand_index REAL,
+    report TEXT NOT NULL);
+"""
+
+# kind → (table, child tables keyed by the same key column)
+_KINDS = {
+    "candidates": ("candidates", [("skills", "candidate")]),
+    "assessments": ("assessments", []),
+    "assessment_packages": ("assessment_packages", []),
+    "behavioral": ("behavioral", [("behavioral_themes", "key")]),
+    "market": ("market", []),
+}
+
+def _stem(s: str) -> str:
+    return s.replace(" ", "_")
+
+def expand_assessment(assessment: Dict, packages: Mapping[str, Dict]) -> Dict:
+    """
+    Per-candidate assessments reference a shared package by package_id
+    (AssessmentDesigner); merge it in so readers see the full package.
+    Self-contained assessments and unknown ids are returned unchanged.
+    Package lists/dicts are copied, so editing one result leaves the package
+    and every other assessment sharing it intact.
+    """
+    pkg = packages.get(assessment.get("package_id")) if "challenges" not in assessment else None
+    if pkg is None:
+        return assessment
+    return {**assessment, **{k: copy.copy(v) for k, v in pkg.items() if k not in assessment and k != "signature"}}
+
+class ReportStore:
+    """
+    Consolidated SQLite store for every agent's output: candidate reports,
+    skills exploded to one row per (candidate, skill), assessments, behavioral
+    themes and market entries. Per-file JSON/Markdown stays as an export format.
+    Writes are batched and committed every `commit_every` rows and on close().
+    Agents streaming reports to a consumer commit before each yield: the
+    consumer may write through its own connection (e.g. AssessmentDesigner
+    after CandidateProfiler in one thread) and would otherwise wait on our
+    open transaction forever.
+    """
+    def __init__(self, path: str | Path = DEFAULT_STORE, commit_every: int = 500):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.commit_every = commit_every
+        self._db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")  # WAL: durable at checkpoints, cheap commits
+        self._db.executescript(_SCHEMA)
+        self._dirty = 0
+        self._packages: Dict[str, Dict] = {}  # package_id → shared assessment package
+
+    # ---- writes ----
+    def _wrote(self):
+        self._dirty += 1
+        if self._dirty >= self.commit_every:
+            self.commit()
+
+    def put_candidate(self, report: Dict):
+        c = report["candidate"]
+        key = _stem(c.get("name", "Unknown"))
+        self._db.execute(
+            "INSERT OR REPLACE INTO candidates VALUES (?, ?, ?, ?, ?, ?)",
+            (key, c.get("name"), c.get("role"), c.get("experience_years"),
+             report.get("career_summary"), json.dumps(report, ensure_ascii=False)),
+        )
+        self._db.execute("DELETE FROM skills WHERE candidate = ?", (key,))
+        self._db.executemany(
+            "INSERT OR REPLACE INTO skills VALUES (?, ?, ?)",
+            [(key, skill, float(conf)) for skill, conf in report.get("skills", [])],
+        )
+        self._wrote()
+
+    def put_assessment(self, assessment: Dict):
+        key = _stem(assessment["candidate"]["name"])
+        self._db.execute(
+            "INSERT OR REPLACE INTO assessments VALUES (?, ?, ?)",
+            (f"{key}_assessment", key, json.dumps(assessment, ensure_ascii=False)),
+        )
+        self._wrote()
+
+    def put_assessment_package(self, package: Dict):
+        self._db.execute(
+            "INSERT OR REPLACE INTO assessment_packages VALUES (?, ?)",
+            (package["package_id"], json.dumps(package, ensure_ascii=False)),
+        )
+        self._packages[package["package_id"]] = package
+        self._wrote()
+
+    def put_behavioral(self, report: Dict):
+        key = f"{_stem(report['candidate'])}_behavior"
+        self._db.execute(
+            "INSERT OR REPLACE INTO behavioral VALUES (?, ?, ?, ?)",
+            (key, report["candidate"], report.get("summary"), json.dumps(report, ensure_ascii=False)),
+        )
+        self._db.execute("DELETE FROM behavioral_themes WHERE key = ?", (key,))
+        self._db.executemany(
+            "INSERT INTO behavioral_themes VALUES (?, ?, ?)",
+            [(key, theme, float(score)) for theme, score in report.get("themes", {}).items()],
+        )
+        self._wrote()
+
+    def put_market(self, report: Dict):
+        self._db.execute(
+            "INSERT OR REPLACE INTO market VALUES (?, ?, ?, ?, ?)",
+            (f"{_stem(report['role'])}_market", report["role"], report.get("avg_salary"),
+             report.get("demand_index"), json.dumps(report, ensure_ascii=False)),
+        )
+        self._wrote()
+
+    def delete(self, kind: str, keys: Iterable[str]):
+        """Remove records (and their exploded rows) by output stem."""
+        table, children = _KINDS[kind]
+        rows = [(k,) for k in keys]
+        self._db.executemany(f"DELETE FROM {table} WHERE key = ?", rows)
+        for child, col in children:
+            self._db.executemany(f"DELETE FROM {child} WHERE {col} = ?", rows)
+        self.commit()
+
+    def commit(self):
+        self._db.commit()
+        self._dirty = 0
+
+    def close(self):
+        self.commit()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---- reads ----
+    def _package_map(self, needed: str | None) -> Dict[str, Dict]:
+        """Shared assessment packages (a few dozen rows), re-read only when one is missing."""
+        if needed is not None and needed not in self._packages:
+            rows = self._db.execute("SELECT key, report FROM assessment_packages")
+            self._packages = {k: json.loads(r) for k, r in rows}
+        return self._packages
+
+    def _expand(self, kind: str, rep: Dict) -> Dict:
+        if kind != "assessments":
+            return rep
+        return expand_assessment(rep, self._package_map(rep.get("package_id")))
+
+    def load(self, kind: str) -> Dict[str, Dict]:
+        """All reports of one kind, keyed like the per-file outputs (file stem)."""
+        table, _ = _KINDS[kind]
+        rows = self._db.execute(f"SELECT key, report FROM {table} ORDER BY key")
+        return {k: self._expand(kind, json.loads(r)) for k, r in rows}
+
+    def keys(self, kind: str) -> List[str]:
+        table, _ = _KINDS[kind]
+        return [k for (k,) in self._db.execute(f"SELECT key FROM {table} ORDER BY key")]
+
+    def get(self, kind: str, key: str) -> Dict | None:
+        table, _ = _KINDS[kind]
+        row = self._db.execute(f"SELECT report FROM {table} WHERE key = ?", (key,)).fetchone()
+        return self._expand(kind, json.loads(row[0])) if row else None
+
+    def count(self, kind: str) -> int:
+        table, _ = _KINDS[kind]
+        return self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def skill_frequency(self) -> List[Dict]:
+        rows = self._db.execute(
+            "SELECT skill, COUNT(DISTINCT candidate) AS n, AVG(confidence) FROM skills"
+            " GROUP BY skill ORDER BY n DESC, skill"
+        )
+        return [{"skill": s, "count": n, "avg_conf": avg} for s, n, avg in rows]
+
+    def skill_rows(self) -> List[Tuple[str, str, float]]:
+        """Flat (candidate, skill, confidence) rows, e.g. for aggregation.SkillTable."""
+        return self._db.execute("SELECT candidate, skill, confidence FROM skills").fetchall()
+
+    # ---- candidate search (indexed; only the requested page is read) ----
+    def search_candidates(self, text: str = "", role: str | None = None,
+                          experience: Tuple[float, float] | None = None,
+                          skills: Iterable[str] = (), min_confidence: float = 0.0,
+                          limit: int = 25, offset: int = 0) -> Tuple[int, List[Dict]]:
+        """
+        Filter candidates by name substring, role, experience range and required
+        skills (each at >= min_confidence). Returns (total matches, one page of
+        rows with key/name/role/experience_years/top_skills).
+        """
+        where, args = [], []
+        if text:
+            where.append("c.name LIKE ?")
+            args.append(f"%{text}%")
+        if role:
+            where.append("c.role = ?")
+            args.append(role)
+        if experience is not None:
+            where.append("c.experience_years BETWEEN ? AND ?")
+            args.extend(experience)
+        for skill in skills:
+            where.append("c.key IN (SELECT candidate FROM skills WHERE skill = ? AND confidence >= ?)")
+            args.extend([skill, min_confidence])
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        total = self._db.execute(f"SELECT COUNT(*) FROM candidates c {clause}", args).fetchone()[0]
+        rows = self._db.execute(
+            "SELECT c.key, c.name, c.role, c.experience_years,"
+            " (SELECT group_concat(skill, ', ') FROM"
+            "   (SELECT skill FROM skills WHERE candidate = c.key ORDER BY confidence DESC LIMIT 3))"
+            f" FROM candidates c {clause} ORDER BY c.name, c.key LIMIT ? OFFSET ?",
+            args + [limit, offset],
+        )
+        cols = ["key", "name", "role", "experience_years", "top_skills"]
+        return total, [dict(zip(cols, r)) for r in rows]
+
+    def roles(self) -> List[str]:
+        return [r for (r,) in self._db.execute(
+            "SELECT DISTINCT role FROM candidates WHERE role IS NOT NULL ORDER BY role")]
+
+    def skill_names(self) -> List[str]:
+        return [s for (s,) in self._db.execute("SELECT DISTINCT skill FROM skills ORDER BY skill")]
+
+    def experience_range(self) -> Tuple[float, float]:
+        lo, hi = self._db.execute(
+            "SELECT MIN(experience_years), MAX(experience_years) FROM candidates").fetchone()
+        return (lo or 0, hi or 0)
+
+    def market_rows(self) -> List[Dict]:
+        rows = self._db.execute("SELECT role, avg_salary, demand_index FROM market ORDER BY key")
+        return [{"role": r, "avg_salary": s, "demand_index": d} for r, s, d in rows]
+
+    def import_outputs(self, root: str | Path = "outputs") -> Dict[str, int]:
+        """Load existing per-file JSON outputs (e.g. from older runs) into the store."""
+        root = Path(root)
+        sources = [
+            ("candidates", root / "reports", self.put_candidate),
+            ("assessment_packages", root / "assessments" / "packages", self.put_assessment_package),
+            ("assessments", root / "assessments", self.put_assessment),
+            ("behavioral", root / "reports" / "behavioral", self.put_behavioral),
+            ("market", root / "reports" / "market", self.put_market),
+        ]
+        counts = {}
+        for kind, directory, put in sources:
+            counts[kind] = 0
+            for f in sorted(directory.glob("*.json")):
+                try:
+                    put(json.loads(f.read_text(encoding="utf-8")))
+                except (ValueError, KeyError, TypeError):
+                    continue  # ignore bad files, like the dashboards do
+                counts[kind] += 1
+        self.commit()
+        return counts
+
+def open_store(path: str | Path | None):
+    """ReportStore context for `path`, or a no-op context yielding None."""
+    return ReportStore(path) if path else nullcontext(None)
+
+if __name__ == "__main__":
+    import sys
+    store_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_STORE
+    with ReportStore(store_path) as store:
+        print(f"Imported {store.import_outputs()} into {store_path}")
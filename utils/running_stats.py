@@ -0,0 +1,173 @@
+# utils/running_stats.py
+"""
+Constant-memory statistics over streams of numbers.
+
+    RunningStats      count / mean / variance (Welford), min, max
+    FixedHistogram    approximate quantiles from fixed-width bins
+    RoleMarketStats   both of the above for salaries, plus demand and sources,
+                      i.e. everything MarketIntelligence needs for one role
+
+Every class has merge(), so shards of a feed can be aggregated separately
+(e.g. one per process) and combined afterwards.
+"""
+from __future__ import annotations
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence
+
+class RunningStats:
+    """Welford's online mean/variance: numerically stable, O(1) memory."""
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Chan et al. parallel combination; other is left untouched."""
+        if other.count == 0:
+            return self
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / n
+        self.mean += delta * other.count / n
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (n - 1); 0 for fewer than two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+class FixedHistogram:
+    """
+    `bins` equal-width bins over [lo, hi); values outside land in the edge
+    bins. Quantiles interpolate linearly inside a bin and are clamped to the
+    observed min/max, so the error is at most one bin width for in-range data.
+    Up to `exact` values are also kept verbatim, so small samples get exact
+    quantiles instead of bin edges.
+    """
+    def __init__(self, lo: float, hi: float, bins: int = 512, exact: int = 64):
+        if hi <= lo or bins < 1:
+            raise ValueError("FixedHistogram needs hi > lo and bins >= 1")
+        self.lo, self.hi, self.bins = lo, hi, bins
+        self.width = (hi - lo) / bins
+        self.counts: List[int] = [0] * bins
+        self.stats = RunningStats()
+        self.exact = exact
+        self._values: List[float] | None = []  # None once more than `exact` values were seen
+
+    def add(self, x: float):
+        i = int((x - self.lo) / self.width)
+        self.counts[min(max(i, 0), self.bins - 1)] += 1
+        self.stats.add(x)
+        if self._values is not None:
+            self._values.append(x)
+            if len(self._values) > self.exact:
+                self._values = None
+
+    def merge(self, other: "FixedHistogram") -> "FixedHistogram":
+        if (other.lo, other.hi, other.bins) != (self.lo, self.hi, self.bins):
+            raise ValueError("can only merge histograms with the same bins")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.stats.merge(other.stats)
+        if self._values is not None and other._values is not None \
+                and len(self._values) + len(other._values) <= self.exact:
+            self._values = self._values + other._values
+        else:
+            self._values = None
+        return self
+
+    def quantile(self, q: float) -> float | None:
+        n = self.stats.count
+        if n == 0:
+            return None
+        q = min(max(q, 0.0), 1.0)
+        if self._values is not None:
+            # exact, linear interpolation between closest ranks (numpy's default)
+            xs = sorted(self._values)
+            pos = q * (n - 1)
+            i = int(pos)
+            j = min(i + 1, n - 1)
+            return xs[i] + (xs[j] - xs[i]) * (pos - i)
+        target = q * n
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c and seen + c >= target:
+                x = self.lo + (i + (target - seen) / c) * self.width
+                return min(max(x, self.stats.min), self.stats.max)
+            seen += c
+        return self.stats.max
+
+    def quantiles(self, qs: Sequence[float]) -> List[float | None]:
+        return [self.quantile(q) for q in qs]
+
+# Salary histogram: 1k-wide bins up to 500k covers the feeds we see
+SALARY_RANGE = (0.0, 500_000.0)
+SALARY_BINS = 500
+PERCENTILES = (10, 25, 50, 75, 90)
+
+class RoleMarketStats:
+    """Running salary / demand statistics and source counts for one role."""
+    def __init__(self, role: str):
+        self.role = role
+        self.salary = FixedHistogram(*SALARY_RANGE, bins=SALARY_BINS)
+        self.demand = RunningStats()
+        self.sources: Counter = Counter()
+
+    def add(self, entry: Dict):
+        self.salary.add(float(entry["avg_salary"]))
+        self.demand.add(float(entry["demand_index"]))
+        self.sources.update(entry.get("top_sources", []))
+
+    def merge(self, other: "RoleMarketStats") -> "RoleMarketStats":
+        self.salary.merge(other.salary)
+        self.demand.merge(other.demand)
+        self.sources.update(other.sources)
+        return self
+
+    def summary(self) -> Dict:
+        """Consolidated market entry: analyze_market() input plus the distribution."""
+        s = self.salary.stats
+        pct = self.salary.quantiles([p / 100 for p in PERCENTILES])
+        return {
+            "role": self.role,
+            "postings": s.count,
+            "avg_salary": round(s.mean),
+            "salary_std": round(s.std),
+            "salary_min": round(s.min),
+            "salary_max": round(s.max),
+            "salary_percentiles": {f"p{p}": round(v) for p, v in zip(PERCENTILES, pct)},
+            "demand_index": round(self.demand.mean, 1),
+            "top_sources": [src for src, _ in self.sources.most_common(5)],
+        }
+
+def aggregate_market(entries: Iterable[Dict]) -> Dict[str, RoleMarketStats]:
+    """One pass over market entries → per-role running statistics (first-seen role order)."""
+    roles: Dict[str, RoleMarketStats] = {}
+    for entry in entries:
+        role = entry["role"]
+        stats = roles.get(role)
+        if stats is None:
+            stats = roles[role] = RoleMarketStats(role)
+        stats.add(entry)
+    return roles
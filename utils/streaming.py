@@ -0,0 +1,117 @@
+# utils/streaming.py
+from __future__ import annotations
+import json
+import re
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+JSONL_SUFFIXES = {".jsonl", ".ndjson"}
+_CHUNK = 1 << 16
+_TAIL = 2  # longest partial-number suffix raw_decode can stop before ("e+")
+_DECODER = json.JSONDecoder()
+_VALUE = '"-0123456789[{tfn'  # characters a JSON value can start with
+_WS = re.compile(r"[ \t\r\n]*")
+
+def iter_records(path: str | Path) -> Iterator[Dict]:
+    """
+    Yield records one at a time from either
+    - JSON Lines (.jsonl / .ndjson): one object per line, or
+    - a top-level JSON array, parsed incrementally in fixed-size chunks,
+    so memory stays flat regardless of file size.
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix.lower() in JSONL_SUFFIXES:
+            for lineno, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f"{path}:{lineno}: invalid JSON line ({e.msg})") from e
+        else:
+            yield from _iter_json_array(f, path)
+
+def _iter_json_array(f, path: Path) -> Iterator[Dict]:
+    """
+    Elements of a top-level JSON array, separated by exactly one comma.
+    Malformed input raises json.JSONDecodeError with file-relative positions.
+    """
+    buf = ""
+    pos = 0
+    eof = False
+    base = line = line_start = 0  # file offset of buf[0]; newlines before it; start of its line
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof, base, line, line_start
+        nl = buf.rfind("\n", 0, pos)
+        if nl >= 0:
+            line += buf.count("\n", 0, pos)
+            line_start = base + nl + 1
+        base += pos
+        chunk = f.read(_CHUNK)
+        buf = buf[pos:] + chunk
+        pos = 0
+        eof = not chunk
+        return bool(chunk)
+
+    def skip_ws():
+        nonlocal pos
+        while True:
+            pos = _WS.match(buf, pos).end()
+            if pos < len(buf) or not fill():
+                return
+
+    def error(msg: str, at: int) -> json.JSONDecodeError:
+        nl = buf.rfind("\n", 0, at)
+        err = json.JSONDecodeError(f"{path}: {msg}", buf, at)
+        err.pos = base + at
+        err.lineno = line + buf.count("\n", 0, at) + 1
+        err.colno = at - nl if nl >= 0 else base + at - line_start + 1
+        err.args = (f"{err.msg}: line {err.lineno} column {err.colno} (char {err.pos})",)
+        return err
+
+    skip_ws()
+    if pos >= len(buf) or buf[pos] != "[":
+        raise error("expected a top-level JSON array or a .jsonl file", pos)
+    pos += 1
+    skip_ws()
+    if pos < len(buf) and buf[pos] == "]":
+        return
+    while True:
+        skip_ws()
+        if pos >= len(buf):
+            raise error("unterminated JSON array", pos)
+        if buf[pos] not in _VALUE:
+            raise error("invalid JSON: expected a value", pos)
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(buf, pos)
+                # A number cut at the buffer edge still parses as a shorter one
+                # ("1." | "5", "2e+" | "3"): accept a value only when more than
+                # the longest such tail (2 chars) follows it, or at end of file.
+                if len(buf) - end > _TAIL or eof:
+                    break
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise error(f"invalid JSON ({e.msg})", e.pos) from None
+            fill()
+        pos = end
+        yield obj
+        skip_ws()
+        if pos >= len(buf):
+            raise error("unterminated JSON array", pos)
+        if buf[pos] == "]":
+            return
+        if buf[pos] != ",":
+            raise error("invalid JSON: expected ',' or ']'", pos)
+        pos += 1
+
+def batched(items: Iterable, n: int) -> Iterator[List]:
+    """Split an iterable into lists of at most n items."""
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, n))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,95 @@
+# utils/summarizer.py
+"""
+Extractive summaries for profile text (LinkedIn summaries and exports).
+
+    summarize(text, 3)                          # lexical: length & vocabulary
+    summarize(text, 3, method="centrality")     # TextRank over sentence embeddings
+    summarize_batch(texts, 2, method=...)       # many documents, one embed() call
+
+Patterns are compiled once, the top sentences come from a bounded heap
+instead of a full sort, and centrality scoring accepts sentence vectors the
+caller already has.
+"""
+from __future__ import annotations
+import heapq
+import re
+from typing import List, Sequence
+
+import numpy as np
+
+from utils.nlp_utils import clean_text, embed
+
+_SENT_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"\b\w+\b")
+MIN_SENT_LEN, MAX_SENT_LEN = 20, 220
+FALLBACK_CHARS = 240  # no usable sentence: the start of the text instead
+DAMPING, ITERATIONS, TOLERANCE = 0.85, 50, 1e-6
+
+def split_sentences(text: str) -> List[str]:
+    """Candidate sentences of a cleaned text (MIN_SENT_LEN..MAX_SENT_LEN chars)."""
+    return [s for s in (p.strip() for p in _SENT_SPLIT.split(text)) if MIN_SENT_LEN <= len(s) <= MAX_SENT_LEN]
+
+def lexical_scores(sents: Sequence[str]) -> List[float]:
+    """Distinct words plus a small length bonus per sentence."""
+    return [len(set(_WORD.findall(s.lower()))) + len(s) * 0.01 for s in sents]
+
+def centrality_scores(vectors: np.ndarray) -> np.ndarray:
+    """
+    TextRank: PageRank over the cosine-similarity graph of the sentences
+    (rows of `vectors`, L2-normalized as embed() returns them).
+    """
+    n = len(vectors)
+    if n <= 2:
+        return np.ones(n, dtype=np.float32)
+    sim = np.clip(vectors @ vectors.T, 0.0, None)
+    np.fill_diagonal(sim, 0.0)
+    out = sim.sum(axis=1, keepdims=True)
+    trans = np.divide(sim, out, out=np.full_like(sim, 1.0 / n), where=out > 0)
+    rank = np.full(n, 1.0 / n, dtype=sim.dtype)
+    for _ in range(ITERATIONS):
+        nxt = (1 - DAMPING) / n + DAMPING * (rank @ trans)
+        if np.abs(nxt - rank).sum() < TOLERANCE:
+            return nxt
+        rank = nxt
+    return rank
+
+def _top(sents: Sequence[str], scores: Sequence[float], k: int) -> str:
+    """Best k sentences, best first: same order as sorting (score, sentence) descending."""
+    return " ".join(s for _, s in heapq.nlargest(k, zip(scores, sents)))
+
+def _summarize_split(text: str, sents: List[str], k: int, method: str, vectors: np.ndarray | None) -> str:
+    if not sents:
+        return text[:FALLBACK_CHARS]
+    if method == "lexical":
+        return _top(sents, lexical_scores(sents), k)
+    if method != "centrality":
+        raise ValueError(f"unknown summary method {method!r}")
+    if vectors is None:
+        vectors = embed(sents)
+    return _top(sents, centrality_scores(np.asarray(vectors)).tolist(), k)
+
+def summarize(text: str, max_sentences: int = 3, method: str = "lexical",
+              vectors: np.ndarray | None = None, clean: bool = True) -> str:
+    """
+    method="lexical" (no model) or "centrality" (embeds the sentences unless
+    `vectors`, one row per split_sentences() sentence, is given).
+    clean=False skips clean_text() for text that is already cleaned.
+    """
+    if clean:
+        text = clean_text(text)
+    return _summarize_split(text, split_sentences(text), max_sentences, method, vectors)
+
+def summarize_batch(texts: Sequence[str], max_sentences: int = 3, method: str = "lexical",
+                    clean: bool = True) -> List[str]:
+    """Summaries for many documents; centrality embeds every sentence in one embed() call."""
+    cleaned = [clean_text(t) for t in texts] if clean else list(texts)
+    split = [split_sentences(t) for t in cleaned]
+    vecs = None
+    if method == "centrality" and any(split):
+        vecs = embed([s for sents in split for s in sents])
+    out, start = [], 0
+    for text, sents in zip(cleaned, split):
+        rows = vecs[start:start + len(sents)] if vecs is not None else None
+        out.append(_summarize_split(text, sents, max_sentences, method, rows))
+        start += len(sents)
+    return out
@@ -0,0 +1,163 @@
+# utils/themes.py
+"""
+Theme scoring for conversation transcripts.
+
+ThemeScorer (keywords): each transcript is tokenized once and every distinct
+token is looked up in a precompiled keyword → themes map, so the cost is one
+pass over the text however many keywords the lexicon holds. Counts are real
+occurrences of the keywords as whole words: "helpless" does not count as "help".
+
+EmbeddingThemeClassifier (paraphrases): every utterance of a batch of
+conversations is embedded in length-sorted chunks and compared with one
+prototype vector per theme in a single matrix multiply.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Example utterances per theme; a theme's prototype is their mean embedding.
+THEME_PROTOTYPES: Dict[str, List[str]] = {
+    "Collaboration": [
+        "I enjoy working together with my team.",
+        "I like collaborating with colleagues and helping teammates.",
+        "We supported each other to deliver the project as a group.",
+    ],
+    "Problem-Solving": [
+        "I break complex problems down and solve them step by step.",
+        "I debugged the issue, found the root cause and fixed it.",
+        "I analyzed the data to find a better solution and improve results.",
+    ],
+    "Communication": [
+        "I explain technical ideas clearly to non-technical people.",
+        "I presented our results to stakeholders.",
+        "I share knowledge and keep everyone informed.",
+    ],
+}
+
+_TOKEN = re.compile(r"[a-z]+")
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+class ThemeScorer:
+    """theme → keyword list, compiled into keyword → theme indices."""
+    def __init__(self, lexicon: Dict[str, Iterable[str]]):
+        self.themes: List[str] = list(lexicon)
+        keywords: Dict[str, List[int]] = {}
+        for i, kws in enumerate(lexicon.values()):
+            for kw in kws:
+                idx = keywords.setdefault(kw.lower(), [])
+                if i not in idx:
+                    idx.append(i)
+        self._keywords: Dict[str, Tuple[int, ...]] = {k: tuple(ix) for k, ix in keywords.items()}
+
+    def counts(self, utterances: Sequence[str]) -> List[int]:
+        """Occurrences per theme (aligned with self.themes) across all utterances."""
+        tokens = Counter()
+        for line in utterances:
+            tokens.update(_TOKEN.findall(line.lower()))
+        out = [0] * len(self.themes)
+        for token, n in tokens.items():
+            for i in self._keywords.get(token, ()):
+                out[i] += n
+        return out
+
+    def score(self, utterances: Sequence[str]) -> Dict[str, int]:
+        return dict(zip(self.themes, self.counts(utterances)))
+
+    def score_batch(self, conversations: Iterable[Sequence[str]]):
+        """
+        Conversation × theme count matrix: scipy.sparse CSR when SciPy is
+        available (most cells are zero), else a dense NumPy array.
+        """
+        import numpy as np
+        indptr, indices, data = [0], [], []
+        for utterances in conversations:
+            for i, n in enumerate(self.counts(utterances)):
+                if n:
+                    indices.append(i)
+                    data.append(n)
+            indptr.append(len(indices))
+        shape = (len(indptr) - 1, len(self.themes))
+        try:
+            from scipy import sparse
+            return sparse.csr_matrix((np.asarray(data, dtype=np.int32), np.asarray(indices, dtype=np.int32),
+                                      np.asarray(indptr, dtype=np.int64)), shape=shape)
+        except ImportError:
+            dense = np.zeros(shape, dtype=np.int32)
+            rows = np.repeat(np.arange(shape[0]), np.diff(indptr))
+            dense[rows, indices] = data
+            return dense
+
+class EmbeddingThemeClassifier:
+    """
+    Counts, per conversation, the utterances whose cosine similarity to a
+    theme prototype is >= threshold. Prototype vectors are computed once per
+    classifier; utterance vectors go through nlp_utils.embed (and its cache).
+    """
+    def __init__(self, prototypes: Dict[str, Sequence[str]] | None = None,
+                 threshold: float = 0.35, chunk_size: int = 1024):
+        self.prototypes = prototypes or THEME_PROTOTYPES
+        self.themes: List[str] = list(self.prototypes)
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+        self._proto_vecs = None
+
+    def version(self) -> str:
+        """Changes with the prototypes, threshold or embedding model (for incremental runs)."""
+        from utils.nlp_utils import model_name
+        payload = json.dumps([model_name(), self.prototypes, self.threshold], sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+    def prototype_vectors(self):
+        """(n_themes, dim) unit vectors, built on first use."""
+        if self._proto_vecs is None:
+            import numpy as np
+            from utils.nlp_utils import embed
+            rows = []
+            for examples in self.prototypes.values():
+                v = embed(list(examples)).mean(axis=0)
+                rows.append(v / (np.linalg.norm(v) or 1.0))
+            self._proto_vecs = np.vstack(rows).astype(np.float32)
+        return self._proto_vecs
+
+    def _embed_sorted(self, utterances: List[str]):
+        """Embed in chunks of similar length (less padding per batch); rows come back in input order."""
+        import numpy as np
+        from utils.nlp_utils import embed
+        order = np.argsort([len(u) for u in utterances], kind="stable")
+        vecs = None
+        for start in range(0, len(order), self.chunk_size):
+            idx = order[start:start + self.chunk_size]
+            chunk = embed([utterances[i] for i in idx])
+            if vecs is None:
+                vecs = np.empty((len(utterances), chunk.shape[1]), dtype=np.float32)
+            vecs[idx] = chunk
+        return vecs
+
+    def similarities(self, conversations: Sequence[Sequence[str]]):
+        """(utterance × theme similarities, owning conversation index per utterance)."""
+        import numpy as np
+        utterances = [u for conv in conversations for u in conv]
+        conv_idx = np.repeat(np.arange(len(conversations)), [len(conv) for conv in conversations])
+        protos = self.prototype_vectors()
+        if not utterances:
+            return np.zeros((0, len(self.themes)), dtype=np.float32), conv_idx
+        return self._embed_sorted(utterances) @ protos.T, conv_idx
+
+    def score_batch(self, conversations: Sequence[Sequence[str]]):
+        """Conversation × theme matrix of matching-utterance counts (dense int array)."""
+        import numpy as np
+        sims, conv_idx = self.similarities(conversations)
+        n_themes = len(self.themes)
+        hits = sims >= self.threshold
+        # one bincount over flattened (conversation, theme) cells
+        cells = (conv_idx[:, None] * n_themes + np.arange(n_themes)).ravel()
+        counts = np.bincount(cells, weights=hits.ravel(), minlength=len(conversations) * n_themes)
+        return counts.reshape(len(conversations), n_themes).astype(np.int64)
+
+    def score_many(self, conversations: Sequence[Sequence[str]]) -> List[Dict[str, int]]:
+        return [dict(zip(self.themes, row)) for row in self.score_batch(conversations).tolist()]
@@ -0,0 +1,256 @@
+# utils/vector_index.py
+"""
+Candidate profile embeddings for semantic candidate ↔ role matching.
+
+    index = CandidateVectorIndex.load()
+    index.search(embed(["Senior data scientist, PyTorch, MLOps"])[0], k=10)
+    match_candidates("Data Scientist", k=10)   # embeds the query for you
+
+Vectors are one contiguous float32 matrix of L2-normalised rows, so cosine
+similarity is a dot product. Queries use an HNSW graph when hnswlib is
+installed (it is in requirements.txt) and the index is large, else an exact
+NumPy scan (argpartition). The scan is O(N) per query (~45 ms at 250k
+384-d profiles, so ~0.2 s at 1M): install hnswlib for millisecond top-k on
+large indexes.
+"""
+from __future__ import annotations
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import hnswlib  # optional: approximate search for large indexes
+except ImportError:
+    hnswlib = None
+
+DEFAULT_VECTOR_INDEX = Path("outputs/cache/candidate_vectors.npy")
+HNSW_MIN_SIZE = 50_000   # below this an exact scan already answers in a few ms
+_SCAN_CHUNK = 262_144    # rows per matmul in the exact scan (bounds temp memory)
+
+def _sidecar(path: Path, suffix: str) -> Path:
+    """candidate_vectors.npy → candidate_vectors<suffix>"""
+    return path.with_name(path.stem + suffix)
+
+def _graph_labels_path(graph_path: Path) -> Path:
+    return graph_path.with_name(graph_path.name + ".labels.npy")
+
+def _atomic_save(path: Path, array: np.ndarray):
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+class CandidateVectorIndex:
+    """
+    key → profile vector. Every upsert gets a fresh integer label (labels are
+    never reused), so a persisted HNSW graph can be brought up to date by
+    adding new labels and marking dropped ones deleted, without a rebuild.
+    """
+    def __init__(self, dim: int | None = None, keys: List[str] | None = None,
+                 vectors: np.ndarray | None = None, labels: np.ndarray | None = None,
+                 next_label: int = 0):
+        self.dim = dim
+        self.keys: List[str] = list(keys or [])
+        self._row: Dict[str, int] = {k: i for i, k in enumerate(self.keys)}
+        self._vecs = vectors if vectors is not None else np.zeros((0, dim or 0), dtype=np.float32)
+        self._labels = labels if labels is not None else np.zeros(0, dtype=np.int64)
+        self.next_label = next_label
+        self._graph = None            # hnswlib.Index, loaded/built lazily
+        self._graph_labels = None     # labels alive in the graph
+        self._graph_path: Path | None = None
+        self._key_of_label: Dict[int, str] | None = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._row
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vecs[:len(self.keys)]
+
+    # ---- updates ----
+    def _reserve(self, extra: int):
+        n = len(self.keys)
+        if n + extra <= len(self._vecs) and self._vecs.flags.writeable:
+            return
+        cap = max(n + extra, 2 * len(self._vecs), 1024)
+        vecs = np.zeros((cap, self.dim), dtype=np.float32)
+        vecs[:n] = self._vecs[:n]
+        labels = np.zeros(cap, dtype=np.int64)
+        labels[:n] = self._labels[:n]
+        self._vecs, self._labels = vecs, labels
+
+    def upsert(self, keys: Sequence[str], vectors: np.ndarray):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            self._vecs = np.zeros((0, self.dim), dtype=np.float32)
+        self._reserve(len(keys))
+        for key, vec in zip(keys, vectors):
+            row = self._row.get(key)
+            if row is None:
+                row = self._row[key] = len(self.keys)
+                self.keys.append(key)
+            self._vecs[row] = vec
+            self._labels[row] = self.next_label
+            self.next_label += 1
+        self._key_of_label = None
+
+    def remove(self, keys: Iterable[str]):
+        """Drop keys; the last row is moved into each hole so rows stay contiguous."""
+        keys = [k for k in keys if k in self._row]
+        if not keys:
+            return
+        self._reserve(0)
+        for key in keys:
+            row = self._row.pop(key)
+            last = len(self.keys) - 1
+            if row != last:
+                moved = self.keys[last]
+                self.keys[row] = moved
+                self._row[moved] = row
+                self._vecs[row] = self._vecs[last]
+                self._labels[row] = self._labels[last]
+            self.keys.pop()
+        self._key_of_label = None
+
+    # ---- search ----
+    def _scan(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact top-k rows per query: (rows, scores), each (m, k), best first."""
+        vecs = self.vectors
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        best_scores = np.zeros((len(queries), 0), dtype=np.float32)
+        for start in range(0, len(vecs), _SCAN_CHUNK):
+            scores = queries @ vecs[start:start + _SCAN_CHUNK].T          # (m, chunk)
+            kk = min(k, scores.shape[1])
+            top = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+            best_rows = np.hstack([best_rows, top + start])
+            best_scores = np.hstack([best_scores, np.take_along_axis(scores, top, axis=1)])
+            if best_rows.shape[1] > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        return np.take_along_axis(best_rows, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+    def _sync_graph(self):
+        """Load or build the HNSW graph and apply upserts/removals since it was saved."""
+        alive = self._labels[:len(self.keys)]
+        if self._graph is None and self._graph_path is not None and self._graph_path.exists():
+            graph = hnswlib.Index(space="ip", dim=self.dim)
+            graph.load_index(str(self._graph_path), max_elements=0)
+            self._graph = graph
+            self._graph_labels = np.load(_graph_labels_path(self._graph_path))
+        if self._graph is not None and self._graph.get_current_count() > 2 * max(len(alive), 1):
+            self._graph = None  # mostly deleted entries: cheaper to rebuild
+        if self._graph is None:
+            graph = hnswlib.Index(space="ip", dim=self.dim)
+            graph.init_index(max_elements=max(len(alive), 1), ef_construction=200, M=16)
+            graph.add_items(self.vectors, alive)
+            self._graph, self._graph_labels = graph, alive.copy()
+            return
+        added = np.setdiff1d(alive, self._graph_labels, assume_unique=True)
+        dropped = np.setdiff1d(self._graph_labels, alive, assume_unique=True)
+        for label in dropped.tolist():
+            self._graph.mark_deleted(label)
+        if len(added):
+            need = self._graph.get_current_count() + len(added)
+            if need > self._graph.get_max_elements():
+                self._graph.resize_index(max(need, 2 * self._graph.get_max_elements()))
+            rows = np.flatnonzero(np.isin(alive, added))
+            self._graph.add_items(self.vectors[rows], alive[rows])
+        self._graph_labels = alive.copy()
+
+    def _use_graph(self) -> bool:
+        return hnswlib is not None and len(self.keys) >= HNSW_MIN_SIZE
+
+    def search_batch(self, queries: np.ndarray, k: int = 10) -> List[List[Tuple[str, float]]]:
+        """Top-k (key, cosine score) per query vector, best first."""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        k = min(k, len(self.keys))
+        if k <= 0:
+            return [[] for _ in queries]
+        if self._use_graph():
+            if self._graph_labels is None or not np.array_equal(self._graph_labels, self._labels[:len(self.keys)]):
+                self._sync_graph()
+            if self._key_of_label is None:
+                self._key_of_label = dict(zip(self._labels[:len(self.keys)].tolist(), self.keys))
+            self._graph.set_ef(max(64, 2 * k))
+            labels, dists = self._graph.knn_query(queries, k=k)
+            return [[(self._key_of_label[int(l)], round(float(1 - d), 4)) for l, d in zip(ls, ds)]
+                    for ls, ds in zip(labels, dists)]
+        rows, scores = self._scan(queries, k)
+        return [[(self.keys[r], round(float(s), 4)) for r, s in zip(rs, ss)]
+                for rs, ss in zip(rows.tolist(), scores.tolist())]
+
+    def search(self, query: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
+        return self.search_batch(np.asarray(query)[None, :], k)[0]
+
+    # ---- persistence ----
+    def save(self, path: str | Path = DEFAULT_VECTOR_INDEX):
+        """vectors .npy + labels + json meta; the HNSW graph too when it is in use."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_save(path, np.ascontiguousarray(self.vectors))
+        _atomic_save(_sidecar(path, ".labels.npy"), self._labels[:len(self.keys)])
+        meta = {"dim": self.dim, "next_label": self.next_label, "keys": self.keys}
+        tmp = _sidecar(path, ".json.tmp")
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, _sidecar(path, ".json"))
+        graph_path = _sidecar(path, ".hnsw")
+        if self._use_graph():
+            self._graph_path = self._graph_path or graph_path
+            self._sync_graph()
+            self._graph.save_index(str(graph_path))
+            _atomic_save(_graph_labels_path(graph_path), self._graph_labels)
+            self._graph_path = graph_path
+
+    @classmethod
+    def load(cls, path: str | Path = DEFAULT_VECTOR_INDEX, mmap: bool = True) -> "CandidateVectorIndex":
+        """Vectors are memory-mapped; the first update copies them into RAM."""
+        path = Path(path)
+        meta = json.loads(_sidecar(path, ".json").read_text(encoding="utf-8"))
+        vectors = np.load(path, mmap_mode="r" if mmap else None)
+        labels = np.load(_sidecar(path, ".labels.npy"))
+        index = cls(meta["dim"], meta["keys"], vectors, labels, meta["next_label"])
+        index._graph_path = _sidecar(path, ".hnsw")
+        return index
+
+    @classmethod
+    def load_or_create(cls, path: str | Path = DEFAULT_VECTOR_INDEX) -> "CandidateVectorIndex":
+        try:
+            return cls.load(path)
+        except (OSError, ValueError, KeyError):
+            return cls()
+
+_LOADED: Dict[Path, Tuple[int, CandidateVectorIndex]] = {}
+
+def match_candidates(query: str, k: int = 10,
+                     path: str | Path = DEFAULT_VECTOR_INDEX) -> List[Tuple[str, float]]:
+    """
+    Top-k candidates for a job description or role title, by cosine similarity
+    of the query embedding to each stored profile embedding. The index is
+    loaded once and reloaded only when the file changes.
+    """
+    from utils.nlp_utils import embed  # model loads on first query only
+
+    path = Path(path)
+    mtime = path.stat().st_mtime_ns
+    hit = _LOADED.get(path)
+    if hit is None or hit[0] != mtime:
+        hit = _LOADED[path] = (mtime, CandidateVectorIndex.load(path))
+    return hit[1].search(embed([query])[0], k)
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2:
+        sys.exit('usage: python -m utils.vector_index "job description or role" [k]\n'
+                 '(approximate HNSW search needs hnswlib; without it every query scans all profiles)')
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    for key, score in match_candidates(sys.argv[1], k):
+        print(f"{score:6.3f}  {key}")